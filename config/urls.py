@@ -22,11 +22,14 @@ from home import strategy_views  # Import pour les vues de stratégies
 urlpatterns = [
     path('', views.simulator_view, name='home'),
     path('api/get-presets/', views.get_presets, name='get_presets'),
+    path('api/kelly/', views.kelly_optimizer, name='kelly_optimizer'),
     path('api/start-session/', views.start_session, name='start_session'),
     path('api/execute-trade/', views.execute_trade, name='execute_trade'),
     path('api/execute-batch-trades/', views.execute_batch_trades, name='execute_batch_trades'),
     path('api/execute-strategy-batch/', strategy_views.execute_strategy_batch, name='execute_strategy_batch'),  # Nouveau endpoint
+    path('api/fast-forward/', views.fast_forward, name='fast_forward'),
     path('api/get-stats/', views.get_stats, name='get_stats'),
+    path('api/export-trades/', views.export_trades, name='export_trades'),
     path('money-management/', include('money_management.urls')),
     path('admin/', admin.site.urls),
 ]
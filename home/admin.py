@@ -1,11 +1,11 @@
 from django.contrib import admin
-from .models import TradingSession, Trade
+from .models import ReplayCheckpoint, TradingSession, Trade, TradeChunk
 
 
 @admin.register(TradingSession)
 class TradingSessionAdmin(admin.ModelAdmin):
-    list_display = ['session_key', 'current_capital', 'total_trades', 'created_at']
-    list_filter = ['created_at']
+    list_display = ['session_key', 'current_capital', 'total_trades', 'storage_mode', 'created_at']
+    list_filter = ['storage_mode', 'created_at']
     search_fields = ['session_key']
     readonly_fields = ['created_at', 'updated_at']
 
@@ -16,3 +16,17 @@ class TradeAdmin(admin.ModelAdmin):
     list_filter = ['is_win', 'timestamp']
     search_fields = ['session__session_key']
     readonly_fields = ['timestamp']
+
+
+@admin.register(TradeChunk)
+class TradeChunkAdmin(admin.ModelAdmin):
+    list_display = ['chunk_index', 'session', 'trade_count']
+    search_fields = ['session__session_key']
+    exclude = ['data']
+
+
+@admin.register(ReplayCheckpoint)
+class ReplayCheckpointAdmin(admin.ModelAdmin):
+    list_display = ['trade_index', 'session', 'capital']
+    search_fields = ['session__session_key']
+    exclude = ['rng_state']
@@ -0,0 +1,33 @@
+# Generated by Django 6.0 on 2026-10-19 09:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('home', '0002_tradingsession_outcomes_config'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='tradingsession',
+            name='risk_log',
+            field=models.JSONField(blank=True, default=list),
+        ),
+        migrations.AddField(
+            model_name='tradingsession',
+            name='rng_seed',
+            field=models.BigIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='tradingsession',
+            name='rng_state',
+            field=models.JSONField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='tradingsession',
+            name='storage_mode',
+            field=models.CharField(choices=[('rows', 'Une ligne par trade'), ('replay', 'Rejeu (graine + risques)')], default='rows', max_length=10),
+        ),
+    ]
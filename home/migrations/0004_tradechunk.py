@@ -0,0 +1,33 @@
+# Generated by Django 6.0 on 2026-10-19 10:03
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('home', '0003_tradingsession_replay_storage'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='tradingsession',
+            name='storage_mode',
+            field=models.CharField(choices=[('rows', 'Une ligne par trade'), ('replay', 'Rejeu (graine + risques)'), ('packed', 'Journal binaire par blocs')], default='rows', max_length=10),
+        ),
+        migrations.CreateModel(
+            name='TradeChunk',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('chunk_index', models.IntegerField()),
+                ('trade_count', models.IntegerField(default=0)),
+                ('data', models.BinaryField()),
+                ('session', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='trade_chunks', to='home.tradingsession')),
+            ],
+            options={
+                'ordering': ['chunk_index'],
+                'constraints': [models.UniqueConstraint(fields=('session', 'chunk_index'), name='unique_trade_chunk')],
+            },
+        ),
+    ]
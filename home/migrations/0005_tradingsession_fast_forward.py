@@ -0,0 +1,23 @@
+# Generated by Django 6.0 on 2026-10-19 10:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('home', '0004_tradechunk'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='tradingsession',
+            name='fast_forward_stats',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+        migrations.AddField(
+            model_name='tradingsession',
+            name='sampled_history',
+            field=models.JSONField(blank=True, default=list),
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 6.0 on 2026-10-19 16:12
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('home', '0005_tradingsession_fast_forward'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='tradingsession',
+            name='trade_aggregates',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+        migrations.AddField(
+            model_name='tradingsession',
+            name='sampled_segments',
+            field=models.JSONField(blank=True, default=list),
+        ),
+        migrations.CreateModel(
+            name='ReplayCheckpoint',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('trade_index', models.IntegerField()),
+                ('capital', models.CharField(max_length=40)),
+                ('rng_state', models.JSONField()),
+                ('session', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='replay_checkpoints', to='home.tradingsession')),
+            ],
+            options={
+                'ordering': ['trade_index'],
+                'constraints': [models.UniqueConstraint(fields=('session', 'trade_index'), name='unique_replay_checkpoint')],
+            },
+        ),
+    ]
@@ -4,6 +4,17 @@ from django.contrib.sessions.models import Session
 
 class TradingSession(models.Model):
     """Session de trading pour suivre l'historique d'un utilisateur"""
+
+    # Modes de stockage des trades
+    STORAGE_ROWS = 'rows'
+    STORAGE_REPLAY = 'replay'
+    STORAGE_PACKED = 'packed'
+    STORAGE_MODES = [
+        (STORAGE_ROWS, 'Une ligne par trade'),
+        (STORAGE_REPLAY, 'Rejeu (graine + risques)'),
+        (STORAGE_PACKED, 'Journal binaire par blocs'),
+    ]
+
     session_key = models.CharField(max_length=40, unique=True, db_index=True)
     initial_capital = models.DecimalField(max_digits=12, decimal_places=2, default=1000.00)
     current_capital = models.DecimalField(max_digits=12, decimal_places=2, default=1000.00)
@@ -19,6 +30,21 @@ class TradingSession(models.Model):
     # Configuration des probabilités (JSON string)
     outcomes_config = models.JSONField(default=dict, blank=True)
     
+    # Stockage des trades : lignes Trade, rejeu déterministe ou journal binaire
+    storage_mode = models.CharField(max_length=10, choices=STORAGE_MODES, default=STORAGE_ROWS)
+    rng_seed = models.BigIntegerField(null=True, blank=True)  # Graine du générateur (mode rejeu)
+    rng_state = models.JSONField(null=True, blank=True)  # État courant du générateur (mode rejeu)
+    risk_log = models.JSONField(default=list, blank=True)  # Séquence des risques [[risk, count], ...]
+    
+    # Agrégats courants des trades stockés, mis à jour à chaque trade (vide : à recalculer)
+    trade_aggregates = models.JSONField(default=dict, blank=True)
+    
+    # Avance rapide : agrégats des trades non stockés et courbe échantillonnée
+    fast_forward_stats = models.JSONField(default=dict, blank=True)
+    sampled_history = models.JSONField(default=list, blank=True)
+    # Position des points échantillonnés : [[trades stockés avant l'avance rapide, nombre de points], ...]
+    sampled_segments = models.JSONField(default=list, blank=True)
+    
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -44,3 +70,49 @@ class Trade(models.Model):
 
     def __str__(self):
         return f"Trade #{self.trade_number} - {'Win' if self.is_win else 'Loss'}: {self.profit_loss}€"
+
+
+class TradeChunk(models.Model):
+    """
+    Bloc du journal binaire des trades d'une session (mode 'packed')
+    
+    Chaque bloc contient jusqu'à CHUNK_SIZE enregistrements de taille fixe
+    (voir home.trade_storage.PackedTradeStore). Le journal est en ajout seul :
+    seul le dernier bloc, tant qu'il n'est pas plein, est complété.
+    """
+    session = models.ForeignKey(TradingSession, on_delete=models.CASCADE, related_name='trade_chunks')
+    chunk_index = models.IntegerField()
+    trade_count = models.IntegerField(default=0)
+    data = models.BinaryField()
+
+    class Meta:
+        ordering = ['chunk_index']
+        constraints = [
+            models.UniqueConstraint(fields=['session', 'chunk_index'], name='unique_trade_chunk'),
+        ]
+
+    def __str__(self):
+        return f"Chunk #{self.chunk_index} - {self.trade_count} trades"
+
+
+class ReplayCheckpoint(models.Model):
+    """
+    Point de reprise du rejeu d'une session (mode 'replay')
+    
+    État du générateur et capital après trade_index trades stockés : une
+    fenêtre de l'historique est rejouée depuis le point de reprise qui la
+    précède au lieu de l'être depuis le premier trade.
+    """
+    session = models.ForeignKey(TradingSession, on_delete=models.CASCADE, related_name='replay_checkpoints')
+    trade_index = models.IntegerField()
+    capital = models.CharField(max_length=40)
+    rng_state = models.JSONField()
+
+    class Meta:
+        ordering = ['trade_index']
+        constraints = [
+            models.UniqueConstraint(fields=['session', 'trade_index'], name='unique_replay_checkpoint'),
+        ]
+
+    def __str__(self):
+        return f"Checkpoint après {self.trade_index} trades - Capital: {self.capital}€"
@@ -8,8 +8,9 @@ from django.views.decorators.csrf import csrf_exempt
 import json
 
 from money_management.strategies import STRATEGIES
-from home.models import TradingSession, Trade
+from home.models import TradingSession
 from home.trading_logic import TradingSimulator
+from home.trade_storage import get_trade_store, session_aggregates, session_history_page
 
 
 def get_or_create_session(request):
@@ -34,11 +35,11 @@ def execute_strategy_batch(request):
     
     Cette vue :
     1. Récupère la session en cours via session_key (comme les autres endpoints)
-    2. Pour chaque trade :
-       - Récupère l'historique des trades précédents
+    2. Charge une seule fois l'historique des trades précédents
+    3. Pour chaque trade :
        - Calcule le risque avec la stratégie
        - Exécute le trade normalement (comme execute_batch_trades)
-    3. Retourne les stats mises à jour
+    4. Retourne les stats mises à jour
     
     POST params:
         - strategy_key: clé de la stratégie (ex: "strategy_1")
@@ -79,9 +80,28 @@ def execute_strategy_batch(request):
     strategy_info = STRATEGIES[strategy_key]
     strategy_function = strategy_info['function']
     
+    # Stockage des trades de la session (lignes ou rejeu)
+    store = get_trade_store(session)
+    
+    # Récupérer l'historique des trades pour la stratégie (une seule fois)
+    # On convertit les trades en dict pour la stratégie
+    history = []
+    for trade in store.iter_trades():
+        history.append({
+            'trade_number': trade['trade_number'],
+            'capital_before': float(trade['capital_before']),
+            'capital_after': float(trade['capital_after']),
+            'risk_percent': float(trade['risk_percent']),
+            'risk_amount': float(trade['risk_amount']),
+            'outcome_multiplier': float(trade['outcome_multiplier']),
+            'profit_loss': float(trade['profit_loss']),
+            'is_win': trade['is_win']
+        })
+    
     # Compteur de trades exécutés
     trades_executed = 0
     account_crashed = False
+    capital_limit_reached = False
     
     # Exécuter les trades un par un
     for i in range(count):
@@ -90,22 +110,6 @@ def execute_strategy_batch(request):
             account_crashed = True
             break
         
-        # Récupérer l'historique des trades pour la stratégie
-        # On convertit les trades Django en dict pour la stratégie
-        all_trades = Trade.objects.filter(session=session).order_by('trade_number')
-        history = []
-        for trade in all_trades:
-            history.append({
-                'trade_number': trade.trade_number,
-                'capital_before': float(trade.capital_before),
-                'capital_after': float(trade.capital_after),
-                'risk_percent': float(trade.risk_percent),
-                'risk_amount': float(trade.risk_amount),
-                'outcome_multiplier': float(trade.outcome_multiplier),
-                'profit_loss': float(trade.profit_loss),
-                'is_win': trade.is_win
-            })
-        
         # Calculer le risque avec la stratégie
         # La stratégie retourne un risque en % (ex: 1.0 pour 1%)
         risk_percent = strategy_function(history, float(session.current_capital), **strategy_params)
@@ -113,9 +117,16 @@ def execute_strategy_batch(request):
         # Limiter le risque entre 0.1% et 20%
         risk_percent = max(0.1, min(20.0, risk_percent))
         
-        # Exécuter le trade avec ce risque (méthode statique)
-        result = TradingSimulator.execute_trade(
-            current_capital=float(session.current_capital),
+        # Arrêter avant de dépasser ce que la session peut stocker
+        if TradingSimulator.exceeds_capital_limit(
+            session.current_capital, session.initial_capital, risk_percent, session.outcomes_config
+        ):
+            capital_limit_reached = True
+            break
+        
+        # Exécuter le trade avec ce risque
+        result = store.execute_trade(
+            current_capital=session.current_capital,
             risk_percent=risk_percent,
             outcomes_config=session.outcomes_config
         )
@@ -151,40 +162,44 @@ def execute_strategy_batch(request):
         if current_performance > session.max_performance_percent:
             session.max_performance_percent = current_performance
         
-        # Sauvegarder la session
-        session.save()
+        # Enregistrer le trade
+        trade = {
+            'trade_number': session.total_trades,
+            'capital_before': capital_before,
+            'capital_after': session.current_capital,
+            'risk_percent': risk_percent,
+            'risk_amount': result['risk_amount'],
+            'outcome_multiplier': result['multiplier'],  # Utiliser 'multiplier' pas 'outcome'
+            'profit_loss': result['profit_loss'],
+            'is_win': result['is_win']
+        }
+        store.append(trade)
         
-        # Créer le trade dans la base de données
-        Trade.objects.create(
-            session=session,
-            trade_number=session.total_trades,
-            capital_before=capital_before,
-            capital_after=session.current_capital,
-            risk_percent=risk_percent,
-            risk_amount=result['risk_amount'],
-            outcome_multiplier=result['multiplier'],  # Utiliser 'multiplier' pas 'outcome'
-            profit_loss=result['profit_loss'],
-            is_win=result['is_win']
-        )
+        # Ajouter le trade à l'historique de la stratégie
+        history.append({key: (value if key in ('trade_number', 'is_win') else float(value))
+                        for key, value in trade.items()})
         
         trades_executed += 1
     
+    # Sauvegarder la session et les trades
+    session.save()
+    store.flush()
+    
     # Calculer les statistiques finales (méthode statique)
-    stats = TradingSimulator.calculate_statistics(
-        Trade.objects.filter(session=session),
+    stats = TradingSimulator.calculate_statistics_from_aggregates(
+        session_aggregates(store),
         session
     )
     
-    # Récupérer TOUS les trades pour l'equity curve et le graphique de risque
-    # Utiliser values() pour être cohérent avec les autres endpoints
-    history = list(Trade.objects.filter(session=session).values(
-        'trade_number', 'capital_after', 'risk_percent', 'outcome_multiplier', 'profit_loss'
-    ).order_by('trade_number'))
+    # Récupérer les trades les plus récents pour l'equity curve et le graphique de risque
+    history, history_total = session_history_page(store)
     
     return JsonResponse({
         'success': True,
         'trades_executed': trades_executed,
         'account_crashed': account_crashed,
+        'capital_limit_reached': capital_limit_reached,
         'stats': stats,
-        'history': history
+        'history': history,
+        'history_total': history_total
     })
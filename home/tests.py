@@ -1,3 +1,232 @@
+import json
+from unittest import mock
+
 from django.test import TestCase
 
-# Create your tests here.
+from . import trade_storage
+from .models import ReplayCheckpoint, TradingSession
+from .trade_storage import get_trade_store, reset_trade_storage, session_history
+from .trading_logic import TradingSimulator
+
+
+BALANCED = TradingSimulator.PRESETS['balanced']['outcomes']
+
+
+def play(store, count, risk_percent=1):
+    """Joue count trades sur le stockage comme execute_batch_trades et renvoie les trades ajoutés"""
+    session = store.session
+    trades = []
+    for _ in range(count):
+        result = store.execute_trade(session.current_capital, risk_percent, session.outcomes_config)
+        session.total_trades += 1
+        trade = dict(
+            trade_number=session.total_trades,
+            capital_before=session.current_capital,
+            capital_after=result['new_capital'],
+            risk_percent=risk_percent,
+            risk_amount=result['risk_amount'],
+            outcome_multiplier=result['multiplier'],
+            profit_loss=result['profit_loss'],
+            is_win=result['is_win'],
+        )
+        store.append(trade)
+        trades.append(trade)
+        session.current_capital = result['new_capital']
+    session.save()
+    store.flush()
+    return trades
+
+
+def new_store(storage_mode):
+    session = TradingSession.objects.create(
+        session_key=f'test-{storage_mode}', initial_capital=1000, current_capital=1000,
+        max_capital=1000, outcomes_config=BALANCED
+    )
+    store = reset_trade_storage(session, storage_mode)
+    session.save()
+    return store
+
+
+def as_floats(history):
+    return [{key: float(value) for key, value in trade.items()} for trade in history]
+
+
+class TradeStorageTests(TestCase):
+    """Rejeu et journal binaire : mêmes trades, agrégats et fenêtres que le mode lignes"""
+
+    def setUp(self):
+        # Points de reprise rapprochés : plusieurs par test
+        patcher = mock.patch.object(trade_storage, 'REPLAY_CHECKPOINT_INTERVAL', 7)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def build_stores(self):
+        """Trois sessions avec les mêmes trades, joués par le générateur du mode rejeu"""
+        replay = new_store(TradingSession.STORAGE_REPLAY)
+        trades = []
+        for count, risk in ((30, 1), (1, 2), (25, 1.5)):
+            trades += play(replay, count, risk)
+
+        stores = [replay]
+        for storage_mode in (TradingSession.STORAGE_ROWS, TradingSession.STORAGE_PACKED):
+            store = new_store(storage_mode)
+            for trade in trades:
+                store.append(trade)
+            store.session.save()
+            store.flush()
+            stores.append(store)
+        return trades, stores
+
+    def test_round_trip_matches_rows(self):
+        trades, stores = self.build_stores()
+        expected = as_floats({field: trade[field] for field in trade_storage.HISTORY_FIELDS} for trade in trades)
+
+        for store in stores:
+            reloaded = get_trade_store(TradingSession.objects.get(pk=store.session.pk))
+            self.assertEqual(reloaded.count(), len(trades))
+            self.assertEqual(as_floats(reloaded.history()), expected)
+            self.assertEqual(as_floats(reloaded.history(-10)), expected[-10:])
+
+    def test_running_aggregates_match_scan(self):
+        _, stores = self.build_stores()
+
+        for store in stores:
+            running = TradingSimulator.merge_aggregates(store.aggregates())
+            scanned = TradingSimulator.merge_aggregates(store.scan_aggregates())
+            self.assertEqual(running['total_trades'], scanned['total_trades'])
+            self.assertEqual(running['wins'], scanned['wins'])
+            self.assertEqual(running['outcome_distribution'], scanned['outcome_distribution'])
+            self.assertAlmostEqual(running['sum_profit_loss'], scanned['sum_profit_loss'], places=6)
+
+    def test_missing_running_aggregates_are_rebuilt(self):
+        _, stores = self.build_stores()
+        session = stores[0].session
+        expected = TradingSimulator.merge_aggregates(stores[0].aggregates())
+        TradingSession.objects.filter(pk=session.pk).update(trade_aggregates={})
+
+        store = get_trade_store(TradingSession.objects.get(pk=session.pk))
+        self.assertEqual(TradingSimulator.merge_aggregates(store.aggregates())['wins'], expected['wins'])
+        self.assertEqual(TradingSession.objects.get(pk=session.pk).trade_aggregates['total_trades'], 56)
+
+    def test_checkpoint_windows_continuous(self):
+        trades, stores = self.build_stores()
+        replay = get_trade_store(TradingSession.objects.get(pk=stores[0].session.pk))
+        self.assertEqual(
+            list(ReplayCheckpoint.objects.filter(session=replay.session).values_list('trade_index', flat=True)),
+            [7, 14, 21, 28, 35, 42, 49, 56]
+        )
+
+        full = replay.history()
+        for start in range(0, len(trades) + 1):
+            self.assertEqual(replay.history(start, start + 9), full[start:start + 9])
+
+    def test_windows_across_fast_forward(self):
+        store = new_store(TradingSession.STORAGE_REPLAY)
+        session = store.session
+        play(store, 10)
+        # Avance rapide de 100 trades non stockés (3 points échantillonnés)
+        session.sampled_segments = [[store.count(), 3]]
+        session.sampled_history = [
+            {'trade_number': session.total_trades + step, 'capital_after': 1500.0, 'risk_percent': 1.0}
+            for step in (1, 50, 100)
+        ]
+        session.total_trades += 100
+        session.current_capital = 1500
+        store.record_checkpoint(100, session.current_capital)
+        session.save()
+        store.flush()
+        play(store, 12)
+
+        store = get_trade_store(TradingSession.objects.get(pk=session.pk))
+        full = store.history() + store.session.sampled_history
+        full.sort(key=lambda trade: trade['trade_number'])
+        self.assertEqual(len(full), 25)
+        for start in range(0, 26):
+            for stop in (start, start + 4, None):
+                self.assertEqual(session_history(store, start, stop), full[start:stop])
+        self.assertEqual(session_history(store, -5), full[-5:])
+
+
+class SessionEndpointsTests(TestCase):
+    """Historique renvoyé aux écrans"""
+
+    def post(self, url, payload):
+        return self.client.post(url, json.dumps(payload), content_type='application/json').json()
+
+    def test_default_history_is_tail_window(self):
+        self.post('/api/start-session/', {'initial_capital': 1000, 'outcomes_config': BALANCED, 'storage_mode': 'replay'})
+        with mock.patch.object(trade_storage, 'CHART_HISTORY_LIMIT', 20):
+            response = self.post('/api/execute-batch-trades/', {'risk_percent': 1, 'count': 50})
+            self.assertEqual(response['history_total'], 50)
+            self.assertEqual([trade['trade_number'] for trade in response['history']], list(range(31, 51)))
+
+            page = self.client.get('/api/get-stats/', {'start': 0, 'stop': 5}).json()
+            self.assertEqual([trade['trade_number'] for trade in page['history']], [1, 2, 3, 4, 5])
+
+
+class CapitalLimitTests(TestCase):
+    """Une session au capital maximum reste utilisable"""
+
+    def post(self, url, payload):
+        return self.client.post(url, json.dumps(payload), content_type='application/json')
+
+    def start(self):
+        conservative = TradingSimulator.PRESETS['conservative']['outcomes']
+        response = self.post('/api/start-session/', {
+            'initial_capital': 1000, 'outcomes_config': conservative, 'storage_mode': 'rows'
+        })
+        self.assertEqual(response.status_code, 200)
+
+    def test_trades_after_fast_forward_to_limit(self):
+        self.start()
+        response = self.post('/api/fast-forward/', {
+            'risk_percent': 10, 'max_trades': 1000000, 'target_multiple': None
+        }).json()
+        self.assertEqual(response['stop_reason'], 'capital_limit')
+        self.assertLessEqual(response['stats']['current_capital'], TradingSimulator.MAX_SESSION_CAPITAL)
+
+        # Les trades suivants s'arrêtent au plafond au lieu de déborder des colonnes
+        response = self.post('/api/execute-batch-trades/', {'risk_percent': 10, 'count': 100}).json()
+        self.assertTrue(response['success'])
+        self.assertTrue(response['capital_limit_reached'])
+        response = self.post('/api/execute-trade/', {'risk_percent': 10})
+        self.assertEqual(response.status_code, 400)
+        response = self.post('/api/execute-strategy-batch/', {'strategy_key': 'strategy_1', 'count': 10}).json()
+        self.assertTrue(response['success'])
+
+        # La session se relit et se réinitialise
+        self.assertTrue(self.client.get('/api/get-stats/').json()['success'])
+        self.start()
+        response = self.post('/api/execute-batch-trades/', {'risk_percent': 1, 'count': 10}).json()
+        self.assertEqual(response['trades_executed'], 10)
+
+    def test_batch_stops_at_limit(self):
+        self.start()
+        response = self.post('/api/execute-batch-trades/', {'risk_percent': 5, 'count': 5000}).json()
+        self.assertTrue(response['capital_limit_reached'])
+        self.assertLess(response['trades_executed'], 5000)
+        self.assertTrue(self.client.get('/api/get-stats/').json()['success'])
+
+
+class ExportTradesTests(TestCase):
+    """Export streaming des trades stockés d'une session, dans chaque mode"""
+
+    def post(self, url, payload):
+        return self.client.post(url, json.dumps(payload), content_type='application/json').json()
+
+    def test_row_counts(self):
+        for storage_mode in ('rows', 'replay', 'packed'):
+            with self.subTest(storage_mode=storage_mode):
+                self.post('/api/start-session/', {
+                    'initial_capital': 1000, 'outcomes_config': BALANCED, 'storage_mode': storage_mode
+                })
+                self.post('/api/execute-batch-trades/', {'risk_percent': 1, 'count': 37})
+                self.post('/api/execute-trade/', {'risk_percent': 2})
+
+                response = self.client.get('/api/export-trades/')
+                lines = b''.join(response.streaming_content).decode().splitlines()
+                self.assertEqual(len(lines), 1 + 38)
+
+                response = self.client.get('/api/export-trades/', {'format': 'ndjson'})
+                rows = [json.loads(line) for line in b''.join(response.streaming_content).decode().splitlines()]
+                self.assertEqual([row['trade_number'] for row in rows], list(range(1, 39)))
@@ -0,0 +1,586 @@
+"""
+Stockage des trades d'une session de trading
+
+Trois modes de stockage sont disponibles :
+- 'rows'   : une ligne Trade par trade (mode historique, compatible)
+- 'replay' : la graine du générateur + la séquence des risques compressée
+             (run-length encoding). Chaque trade est entièrement déterminé par
+             la configuration des issues, l'état du générateur et le risque
+             choisi : capital, P&L et issues sont reconstruits à la demande
+             par rejeu déterministe.
+- 'packed' : un journal binaire en ajout seul d'enregistrements de taille fixe,
+             découpé en blocs (TradeChunk). Les lectures renvoient des
+             memoryview / array sans construire d'objets ORM.
+
+Tous les stockages exposent la même interface : execute_trade, append, flush,
+iter_trades, history, count, aggregates et clear.
+
+Les agrégats des trades stockés (compteurs, sommes, distribution des issues)
+sont tenus à jour trade par trade sur la session (TradingSession.trade_aggregates) :
+les statistiques ne relisent jamais l'historique. history(start, stop) ne lit
+que la fenêtre demandée ; en mode rejeu, elle est rejouée depuis le point de
+reprise (ReplayCheckpoint) qui la précède.
+
+Les trades joués en avance rapide ne sont stockés dans aucun mode : seuls leurs
+agrégats (TradingSession.fast_forward_stats) et une courbe échantillonnée
+(TradingSession.sampled_history) sont conservés. session_aggregates et
+session_history fusionnent ces données avec celles du stockage.
+"""
+
+import random
+import struct
+from array import array
+from bisect import bisect_left
+from decimal import Decimal
+from itertools import islice
+
+from .models import ReplayCheckpoint, Trade, TradeChunk, TradingSession
+from .trading_logic import TradingSimulator
+
+
+# Précision des montants stockés (identique aux DecimalField de Trade)
+CENT = Decimal('0.01')
+
+# Colonnes renvoyées pour le graphique de l'historique
+HISTORY_FIELDS = ('trade_number', 'capital_after', 'risk_percent', 'outcome_multiplier', 'profit_loss')
+
+# Colonnes complètes d'un trade
+TRADE_FIELDS = (
+    'trade_number', 'capital_before', 'capital_after', 'risk_percent', 'risk_amount',
+    'outcome_multiplier', 'profit_loss', 'is_win'
+)
+
+# Entrées de l'historique renvoyées par défaut aux écrans (les plus récentes)
+CHART_HISTORY_LIMIT = 5000
+
+# Mode rejeu : un point de reprise tous les REPLAY_CHECKPOINT_INTERVAL trades stockés
+REPLAY_CHECKPOINT_INTERVAL = 5000
+
+
+class BaseTradeStore:
+    """Agrégats courants communs aux trois modes de stockage"""
+
+    def __init__(self, session):
+        self.session = session
+
+    def scan_aggregates(self):
+        """Agrégats recalculés sur tous les trades stockés (sessions antérieures aux agrégats courants)"""
+        raise NotImplementedError
+
+    def _running_aggregates(self):
+        """Agrégats courants de la session, recalculés une seule fois s'ils manquent"""
+        if not self.session.trade_aggregates:
+            scanned = self.scan_aggregates()
+            scanned['outcome_distribution'] = {
+                str(multiplier): count for multiplier, count in scanned['outcome_distribution'].items()
+            }
+            self.session.trade_aggregates = scanned
+            if self.session.pk:
+                self.session.save(update_fields=['trade_aggregates'])
+        return self.session.trade_aggregates
+
+    def _accumulate(self, trade):
+        """Ajoute un trade aux agrégats courants"""
+        aggregates = self._running_aggregates()
+        multiplier = int(trade['outcome_multiplier'])
+        aggregates['total_trades'] += 1
+        if trade['is_win']:
+            aggregates['wins'] += 1
+        else:
+            aggregates['losses'] += 1
+        aggregates['sum_risk_percent'] += float(trade['risk_percent'])
+        aggregates['sum_risk_amount'] += float(trade['risk_amount'])
+        aggregates['sum_profit_loss'] += float(trade['profit_loss'])
+        aggregates['r_counter'] += multiplier
+        outcome_counts = aggregates['outcome_distribution']
+        outcome_counts[str(multiplier)] = outcome_counts.get(str(multiplier), 0) + 1
+
+    def aggregates(self):
+        """Agrégats pour TradingSimulator.calculate_statistics_from_aggregates"""
+        return self._running_aggregates()
+
+    def count(self):
+        """Nombre de trades stockés"""
+        return self._running_aggregates()['total_trades']
+
+    def _window(self, start, stop):
+        """Bornes positives d'une fenêtre (indices négatifs comptés depuis la fin)"""
+        start, stop, _ = slice(start, stop).indices(self.count())
+        return start, max(start, stop)
+
+
+class RowTradeStore(BaseTradeStore):
+    """Mode historique : une ligne Trade par trade"""
+
+    def __init__(self, session):
+        super().__init__(session)
+        self.rng = None  # Générateur global du module random
+        self._pending = []
+
+    def execute_trade(self, current_capital, risk_percent, outcomes_config=None):
+        """Exécute un trade (voir TradingSimulator.execute_trade)"""
+        return TradingSimulator.execute_trade(current_capital, risk_percent, outcomes_config, rng=self.rng)
+
+    def append(self, trade):
+        """Ajoute un trade (dict avec les colonnes de TRADE_FIELDS)"""
+        self._accumulate(trade)
+        self._pending.append(Trade(session=self.session, **trade))
+
+    def record_checkpoint(self, count, capital):
+        """Avance rapide : rien à stocker, les agrégats sont sur la session"""
+
+    def flush(self):
+        """Écrit les trades en attente en base"""
+        if self._pending:
+            Trade.objects.bulk_create(self._pending, batch_size=1000)
+            self._pending = []
+
+    def iter_trades(self):
+        """Itère sur tous les trades de la session (dicts), par numéro croissant"""
+        queryset = Trade.objects.filter(session=self.session).order_by('trade_number')
+        return queryset.values(*TRADE_FIELDS).iterator(chunk_size=2000)
+
+    def history(self, start=0, stop=None):
+        """Historique pour le graphique (trades d'indice start à stop exclu)"""
+        start, stop = self._window(start, stop)
+        queryset = Trade.objects.filter(session=self.session).values(*HISTORY_FIELDS).order_by('trade_number')
+        return list(queryset[start:stop])
+
+    def scan_aggregates(self):
+        """Agrégats calculés en SQL"""
+        return TradingSimulator.aggregate_trades(Trade.objects.filter(session=self.session))
+
+    def clear(self):
+        """Supprime tous les trades de la session"""
+        Trade.objects.filter(session=self.session).delete()
+        self._pending = []
+
+
+class ReplayTradeStore(BaseTradeStore):
+    """
+    Mode rejeu : stocke la graine du générateur et la séquence des risques
+
+    risk_log est une liste [[risk_percent, count], ...] : count trades
+    consécutifs exécutés avec le même risque. Pour rester déterministe, le
+    capital est arrondi au centime après chaque trade, en direct comme au rejeu.
+
+    Une avance rapide est notée ['ff', count, capital] : count trades non
+    rejoués, après lesquels le capital repart de la valeur indiquée.
+
+    Tous les REPLAY_CHECKPOINT_INTERVAL trades stockés, l'état du générateur et
+    le capital sont enregistrés (ReplayCheckpoint) : une fenêtre de
+    l'historique coûte au plus REPLAY_CHECKPOINT_INTERVAL trades rejoués de plus
+    que sa longueur, quelle que soit la taille de la session.
+    """
+
+    def __init__(self, session):
+        super().__init__(session)
+        self.rng = self._restore_rng(session.rng_state)
+        self._checkpoints = []
+
+    def _restore_rng(self, state):
+        rng = random.Random(self.session.rng_seed)
+        if state:
+            version, internal_state, gauss_next = state
+            rng.setstate((version, tuple(internal_state), gauss_next))
+        return rng
+
+    @staticmethod
+    def _dump_rng(rng):
+        version, internal_state, gauss_next = rng.getstate()
+        return [version, list(internal_state), gauss_next]
+
+    @staticmethod
+    def _execute(current_capital, risk_percent, outcomes_config, rng):
+        result = TradingSimulator.execute_trade(current_capital, risk_percent, outcomes_config, rng=rng)
+        result['risk_amount'] = result['risk_amount'].quantize(CENT)
+        result['profit_loss'] = result['profit_loss'].quantize(CENT)
+        result['new_capital'] = result['new_capital'].quantize(CENT)
+        return result
+
+    def execute_trade(self, current_capital, risk_percent, outcomes_config=None):
+        """Exécute un trade avec le générateur de la session"""
+        return self._execute(current_capital, risk_percent, outcomes_config, self.rng)
+
+    def append(self, trade):
+        """Ajoute le risque du trade à la séquence compressée"""
+        self._accumulate(trade)
+        risk = str(trade['risk_percent'])
+        risk_log = self.session.risk_log
+        if risk_log and risk_log[-1][0] == risk:
+            risk_log[-1][1] += 1
+        else:
+            risk_log.append([risk, 1])
+
+        # Point de reprise : le générateur vient de tirer l'issue de ce trade
+        stored = self.session.trade_aggregates['total_trades']
+        if stored % REPLAY_CHECKPOINT_INTERVAL == 0:
+            self._checkpoints.append(ReplayCheckpoint(
+                session=self.session,
+                trade_index=stored,
+                capital=str(trade['capital_after']),
+                rng_state=self._dump_rng(self.rng),
+            ))
+
+    def record_checkpoint(self, count, capital):
+        """Note une avance rapide de count trades terminée au capital donné"""
+        self.session.risk_log.append(['ff', count, str(capital)])
+
+    def flush(self):
+        """Sauvegarde l'état du générateur, la séquence des risques et les points de reprise"""
+        self.session.rng_state = self._dump_rng(self.rng)
+        self.session.save(update_fields=['rng_state', 'risk_log', 'trade_aggregates', 'updated_at'])
+        if self._checkpoints:
+            ReplayCheckpoint.objects.bulk_create(self._checkpoints)
+            self._checkpoints = []
+
+    def iter_trades(self, start=0):
+        """
+        Reconstruit les trades de la session par rejeu déterministe
+
+        Args:
+            start: Indice du premier trade stocké renvoyé ; le rejeu part du
+                point de reprise qui le précède
+        """
+        checkpoint = None
+        if start:
+            checkpoint = (
+                ReplayCheckpoint.objects.filter(session=self.session, trade_index__lte=start)
+                .order_by('-trade_index').first()
+            )
+        if checkpoint is not None:
+            rng = self._restore_rng(checkpoint.rng_state)
+            capital = Decimal(checkpoint.capital)
+            skip = checkpoint.trade_index  # Trades déjà joués au point de reprise
+            position = checkpoint.trade_index
+        else:
+            rng = random.Random(self.session.rng_seed)
+            capital = Decimal(str(self.session.initial_capital)).quantize(CENT)
+            skip = 0
+            position = 0
+        outcomes_config = self.session.outcomes_config
+        trade_number = 0
+
+        for entry in self.session.risk_log:
+            if entry[0] == 'ff':
+                # Avance rapide : reprendre au point de contrôle (sauf si le point
+                # de reprise, postérieur, fixe déjà le capital)
+                trade_number += entry[1]
+                if not skip:
+                    capital = Decimal(entry[2])
+                continue
+            
+            risk, count = entry
+            if skip >= count:
+                skip -= count
+                trade_number += count
+                continue
+            trade_number += skip
+            count -= skip
+            skip = 0
+            
+            risk_percent = Decimal(risk)
+            for _ in range(count):
+                trade_number += 1
+                result = self._execute(capital, risk_percent, outcomes_config, rng)
+                position += 1
+                if position <= start:
+                    capital = result['new_capital']
+                    continue
+                yield {
+                    'trade_number': trade_number,
+                    'capital_before': capital,
+                    'capital_after': result['new_capital'],
+                    'risk_percent': risk_percent,
+                    'risk_amount': result['risk_amount'],
+                    'outcome_multiplier': Decimal(result['multiplier']),
+                    'profit_loss': result['profit_loss'],
+                    'is_win': result['is_win'],
+                }
+                capital = result['new_capital']
+
+    def history(self, start=0, stop=None):
+        """Historique pour le graphique, rejoué depuis le point de reprise précédant start"""
+        start, stop = self._window(start, stop)
+        trades = islice(self.iter_trades(start), stop - start)
+        return [{field: trade[field] for field in HISTORY_FIELDS} for trade in trades]
+
+    def scan_aggregates(self):
+        """Agrégats calculés en un seul passage de rejeu"""
+        aggregates = {
+            'total_trades': 0,
+            'wins': 0,
+            'losses': 0,
+            'sum_risk_percent': 0.0,
+            'sum_risk_amount': 0.0,
+            'sum_profit_loss': 0.0,
+            'r_counter': 0.0,
+            'outcome_distribution': {},
+        }
+        outcome_counts = aggregates['outcome_distribution']
+
+        for trade in self.iter_trades():
+            multiplier = int(trade['outcome_multiplier'])
+            aggregates['total_trades'] += 1
+            if trade['is_win']:
+                aggregates['wins'] += 1
+            else:
+                aggregates['losses'] += 1
+            aggregates['sum_risk_percent'] += float(trade['risk_percent'])
+            aggregates['sum_risk_amount'] += float(trade['risk_amount'])
+            aggregates['sum_profit_loss'] += float(trade['profit_loss'])
+            aggregates['r_counter'] += multiplier
+            outcome_counts[multiplier] = outcome_counts.get(multiplier, 0) + 1
+
+        return aggregates
+
+    def clear(self):
+        """Repart d'une nouvelle graine et d'une séquence vide"""
+        ReplayCheckpoint.objects.filter(session=self.session).delete()
+        self.session.rng_seed = random.getrandbits(62)
+        self.session.rng_state = None
+        self.session.risk_log = []
+        self.rng = random.Random(self.session.rng_seed)
+        self._checkpoints = []
+
+
+class PackedTradeStore(BaseTradeStore):
+    """
+    Mode journal binaire : enregistrements de taille fixe regroupés en blocs
+
+    Un enregistrement contient trade_number (uint32), les montants en float64
+    (capital_before, capital_after, risk_percent, risk_amount,
+    outcome_multiplier, profit_loss) et is_win (bool), soit RECORD.size octets.
+    """
+
+    RECORD = struct.Struct('<I6d?')
+    CHUNK_SIZE = 4096  # Nombre de trades par bloc
+
+    def __init__(self, session):
+        super().__init__(session)
+        self.rng = None  # Générateur global du module random
+        self._pending = bytearray()
+
+    def execute_trade(self, current_capital, risk_percent, outcomes_config=None):
+        """Exécute un trade (voir TradingSimulator.execute_trade)"""
+        return TradingSimulator.execute_trade(current_capital, risk_percent, outcomes_config, rng=self.rng)
+
+    def append(self, trade):
+        """Encode le trade à la fin du tampon d'écriture"""
+        self._accumulate(trade)
+        self._pending += self.RECORD.pack(
+            trade['trade_number'],
+            float(trade['capital_before']),
+            float(trade['capital_after']),
+            float(trade['risk_percent']),
+            float(trade['risk_amount']),
+            float(trade['outcome_multiplier']),
+            float(trade['profit_loss']),
+            trade['is_win'],
+        )
+
+    def record_checkpoint(self, count, capital):
+        """Avance rapide : rien à stocker, les agrégats sont sur la session"""
+
+    def flush(self):
+        """Complète le dernier bloc puis crée les blocs suivants"""
+        if not self._pending:
+            return
+
+        record_size = self.RECORD.size
+        pending = memoryview(self._pending)
+        last_chunk = TradeChunk.objects.filter(session=self.session).order_by('-chunk_index').first()
+
+        if last_chunk is not None and last_chunk.trade_count < self.CHUNK_SIZE:
+            free = (self.CHUNK_SIZE - last_chunk.trade_count) * record_size
+            head, pending = pending[:free], pending[free:]
+            last_chunk.data = bytes(last_chunk.data) + head
+            last_chunk.trade_count += len(head) // record_size
+            last_chunk.save(update_fields=['data', 'trade_count'])
+
+        next_index = last_chunk.chunk_index + 1 if last_chunk is not None else 0
+        chunk_bytes = self.CHUNK_SIZE * record_size
+        new_chunks = []
+        for offset in range(0, len(pending), chunk_bytes):
+            data = bytes(pending[offset:offset + chunk_bytes])
+            new_chunks.append(TradeChunk(
+                session=self.session,
+                chunk_index=next_index,
+                trade_count=len(data) // record_size,
+                data=data,
+            ))
+            next_index += 1
+        TradeChunk.objects.bulk_create(new_chunks)
+
+        self._pending = bytearray()
+
+    def read_range(self, start=0, stop=None):
+        """
+        Lit les enregistrements d'indice start à stop exclu
+
+        Seuls les blocs couvrant l'intervalle sont chargés.
+
+        Returns:
+            memoryview: Octets des enregistrements, RECORD.size octets chacun
+        """
+        first_chunk = start // self.CHUNK_SIZE
+        chunks = TradeChunk.objects.filter(session=self.session, chunk_index__gte=first_chunk)
+        if stop is not None:
+            if stop <= start:
+                return memoryview(b'')
+            chunks = chunks.filter(chunk_index__lte=(stop - 1) // self.CHUNK_SIZE)
+
+        blobs = list(chunks.order_by('chunk_index').values_list('data', flat=True))
+        buffer = memoryview(blobs[0] if len(blobs) == 1 else b''.join(blobs))
+
+        record_size = self.RECORD.size
+        offset = (start - first_chunk * self.CHUNK_SIZE) * record_size
+        end = None if stop is None else offset + (stop - start) * record_size
+        return buffer[offset:end]
+
+    def columns(self, start=0, stop=None):
+        """
+        Lit les enregistrements d'un intervalle sous forme de colonnes
+
+        Returns:
+            dict: {champ: array} avec un array('d') par montant,
+                  array('l') pour trade_number et array('b') pour is_win
+        """
+        columns = {field: array('d') for field in TRADE_FIELDS}
+        columns['trade_number'] = array('l')
+        columns['is_win'] = array('b')
+
+        records = self.RECORD.iter_unpack(self.read_range(start, stop))
+        for field, values in zip(TRADE_FIELDS, zip(*records)):
+            columns[field].extend(values)
+        return columns
+
+    def iter_trades(self):
+        """Itère sur tous les trades de la session (dicts), par numéro croissant"""
+        for chunk_data in TradeChunk.objects.filter(session=self.session).order_by('chunk_index').values_list('data', flat=True).iterator():
+            for record in self.RECORD.iter_unpack(chunk_data):
+                yield dict(zip(TRADE_FIELDS, record))
+
+    def history(self, start=0, stop=None):
+        """Historique pour le graphique, lu directement dans le journal"""
+        columns = self.columns(*self._window(start, stop))
+        return [
+            dict(zip(HISTORY_FIELDS, values))
+            for values in zip(*(columns[field] for field in HISTORY_FIELDS))
+        ]
+
+    def scan_aggregates(self):
+        """Agrégats calculés sur les colonnes du journal"""
+        columns = self.columns()
+        outcome_counts = {}
+        for multiplier in columns['outcome_multiplier']:
+            multiplier = int(multiplier)
+            outcome_counts[multiplier] = outcome_counts.get(multiplier, 0) + 1
+
+        total_trades = len(columns['trade_number'])
+        wins = sum(columns['is_win'])
+        return {
+            'total_trades': total_trades,
+            'wins': wins,
+            'losses': total_trades - wins,
+            'sum_risk_percent': sum(columns['risk_percent']),
+            'sum_risk_amount': sum(columns['risk_amount']),
+            'sum_profit_loss': sum(columns['profit_loss']),
+            'r_counter': sum(columns['outcome_multiplier']),
+            'outcome_distribution': outcome_counts,
+        }
+
+    def clear(self):
+        """Supprime le journal de la session"""
+        TradeChunk.objects.filter(session=self.session).delete()
+        self._pending = bytearray()
+
+
+TRADE_STORES = {
+    TradingSession.STORAGE_ROWS: RowTradeStore,
+    TradingSession.STORAGE_REPLAY: ReplayTradeStore,
+    TradingSession.STORAGE_PACKED: PackedTradeStore,
+}
+
+
+def get_trade_store(session):
+    """Retourne le stockage des trades correspondant au mode de la session"""
+    return TRADE_STORES[session.storage_mode](session)
+
+
+def reset_trade_storage(session, storage_mode=None):
+    """
+    Supprime les trades de la session, quel que soit leur mode de stockage,
+    et prépare le stockage pour le mode demandé
+
+    La session n'est pas sauvegardée : c'est à l'appelant de le faire.
+    """
+    Trade.objects.filter(session=session).delete()
+    TradeChunk.objects.filter(session=session).delete()
+    ReplayCheckpoint.objects.filter(session=session).delete()
+    session.rng_seed = None
+    session.rng_state = None
+    session.risk_log = []
+    session.trade_aggregates = TradingSimulator.merge_aggregates()
+    session.fast_forward_stats = {}
+    session.sampled_history = []
+    session.sampled_segments = []
+
+    if storage_mode is not None:
+        session.storage_mode = storage_mode
+
+    store = get_trade_store(session)
+    store.clear()
+    return store
+
+
+def session_aggregates(store):
+    """Agrégats du stockage fusionnés avec ceux des avances rapides"""
+    return TradingSimulator.merge_aggregates(store.aggregates(), store.session.fast_forward_stats)
+
+
+def session_history(store, start=0, stop=None):
+    """
+    Historique du stockage fusionné avec la courbe échantillonnée des avances
+    rapides, trié par numéro de trade (entrées d'indice start à stop exclu,
+    indices négatifs comptés depuis la fin)
+
+    Seule la fenêtre demandée est lue dans le stockage : la position de chaque
+    point échantillonné est connue par TradingSession.sampled_segments.
+    """
+    session = store.session
+    sampled_history = session.sampled_history
+    if not sampled_history:
+        return store.history(start, stop)
+
+    positions = []
+    for stored_before, count in session.sampled_segments:
+        first_position = stored_before + len(positions)
+        positions.extend(range(first_position, first_position + count))
+    if len(positions) != len(sampled_history):
+        # Session antérieure à sampled_segments : fusion complète
+        history = store.history() + sampled_history
+        history.sort(key=lambda trade: trade['trade_number'])
+        return history[start:stop]
+
+    start, stop, _ = slice(start, stop).indices(store.count() + len(sampled_history))
+    if stop <= start:
+        return []
+    first, last = bisect_left(positions, start), bisect_left(positions, stop)
+    history = store.history(start - first, stop - last) + sampled_history[first:last]
+    history.sort(key=lambda trade: trade['trade_number'])
+    return history
+
+
+def session_history_page(store, start=None, stop=None):
+    """
+    Historique renvoyé aux écrans : par défaut les CHART_HISTORY_LIMIT entrées
+    les plus récentes
+
+    Returns:
+        tuple: (historique, nombre total d'entrées)
+    """
+    total = store.count() + len(store.session.sampled_history)
+    if start is None and stop is None:
+        start = -CHART_HISTORY_LIMIT
+    return session_history(store, start or 0, stop), total
@@ -41,6 +41,27 @@ class TradingSimulator:
         [9] * 1      # 1 issue de gain 9R
     )
     
+    # Plafonds d'une session, loin des DecimalField de TradingSession
+    # (capital : max_digits=12, soit < 10^10 ; performance : max_digits=10, soit < 10^8 %)
+    MAX_SESSION_CAPITAL = 100000000
+    MAX_SESSION_PERFORMANCE = 1000000
+    
+    @classmethod
+    def capital_limit(cls, initial_capital):
+        """Capital maximum d'une session (montant et performance plafonnés)"""
+        return min(
+            cls.MAX_SESSION_CAPITAL,
+            float(initial_capital) * (1 + cls.MAX_SESSION_PERFORMANCE / 100)
+        )
+    
+    @classmethod
+    def exceeds_capital_limit(cls, current_capital, initial_capital, risk_percent, outcomes_config=None):
+        """Vrai si la meilleure issue du prochain trade dépasserait le capital maximum de la session"""
+        best_multiplier = max(max(cls.build_outcomes_list(outcomes_config)), 0)
+        capital = float(current_capital)
+        best_capital = capital + capital * float(risk_percent) / 100 * best_multiplier
+        return best_capital > cls.capital_limit(initial_capital)
+    
     @classmethod
     def build_outcomes_list(cls, outcomes_config):
         """Construit la liste des issues à partir de la configuration"""
@@ -62,13 +83,13 @@ class TradingSimulator:
         return expectation
     
     @classmethod
-    def get_random_outcome(cls, outcomes_config=None):
+    def get_random_outcome(cls, outcomes_config=None, rng=None):
         """Tire aléatoirement une issue parmi les possibles"""
         outcomes = cls.build_outcomes_list(outcomes_config) if outcomes_config else cls.DEFAULT_OUTCOMES
-        return random.choice(outcomes)
+        return (rng or random).choice(outcomes)
     
     @classmethod
-    def execute_trade(cls, current_capital, risk_percent, outcomes_config=None):
+    def execute_trade(cls, current_capital, risk_percent, outcomes_config=None, rng=None):
         """
         Exécute un trade avec le capital et le pourcentage de risque donnés
         
@@ -76,6 +97,7 @@ class TradingSimulator:
             current_capital (Decimal): Capital actuel
             risk_percent (Decimal): Pourcentage du capital risqué
             outcomes_config (dict): Configuration personnalisée des issues
+            rng (random.Random): Générateur dédié (défaut: module random)
             
         Returns:
             dict: Résultat du trade avec toutes les informations
@@ -88,7 +110,7 @@ class TradingSimulator:
         risk_amount = (current_capital * risk_percent) / Decimal('100')
         
         # Tirage aléatoire de l'issue
-        multiplier = cls.get_random_outcome(outcomes_config)
+        multiplier = cls.get_random_outcome(outcomes_config, rng)
         
         # Calcul du profit/perte
         profit_loss = risk_amount * Decimal(str(multiplier))
@@ -107,6 +129,217 @@ class TradingSimulator:
             'is_win': is_win
         }
     
+    @classmethod
+    def fast_forward(cls, state, risk_percent, outcomes_config=None, max_trades=1000000,
+                     target_capital=None, capital_limit=None, sample_points=1000, rng=None):
+        """
+        Avance une session de nombreux trades à risque fixe, sans stocker les trades
+        
+        Le moteur est incrémental et travaille en float : seules les statistiques
+        cumulées et une courbe échantillonnée (pas adaptatif, au plus
+        2 × sample_points points) sont conservées.
+        
+        Args:
+            state (dict): État de départ (current_capital, initial_capital, max_capital,
+                total_trades, consecutive_wins, consecutive_losses, max_consecutive_wins,
+                max_consecutive_losses, max_drawdown_percent, max_performance_percent)
+            risk_percent (float): Pourcentage du capital risqué à chaque trade
+            outcomes_config (dict): Configuration personnalisée des issues
+            max_trades (int): Nombre maximum de trades
+            target_capital (float): Arrêt dès que le capital atteint cette valeur
+            capital_limit (float): Arrêt avant que le capital ne dépasse cette valeur
+            sample_points (int): Nombre de points visés pour la courbe
+            rng (random.Random): Générateur dédié (défaut: module random)
+            
+        Returns:
+            dict: {'state', 'aggregates', 'samples', 'trades_executed', 'stop_reason'}
+        """
+        outcomes = cls.build_outcomes_list(outcomes_config) if outcomes_config else cls.DEFAULT_OUTCOMES
+        draw = (rng or random).choices
+        risk_fraction = float(risk_percent) / 100
+        
+        capital = float(state['current_capital'])
+        initial_capital = float(state['initial_capital'])
+        max_capital = float(state['max_capital'])
+        trade_number = state['total_trades']
+        consecutive_wins = state['consecutive_wins']
+        consecutive_losses = state['consecutive_losses']
+        max_consecutive_wins = state['max_consecutive_wins']
+        max_consecutive_losses = state['max_consecutive_losses']
+        max_drawdown = float(state['max_drawdown_percent'])
+        max_performance = float(state['max_performance_percent'])
+        
+        wins = 0
+        sum_risk_amount = 0.0
+        sum_profit_loss = 0.0
+        r_counter = 0
+        outcome_counts = {}
+        
+        samples = []
+        stride = 1
+        trades_executed = 0
+        stop_reason = 'max_trades'
+        last_trade = None
+        
+        while trades_executed < max_trades and stop_reason == 'max_trades':
+            # Tirage des issues par blocs
+            block = draw(outcomes, k=min(10000, max_trades - trades_executed))
+            
+            for multiplier in block:
+                if capital < 1:
+                    stop_reason = 'account_crashed'
+                    break
+                if target_capital is not None and capital >= target_capital:
+                    stop_reason = 'target_reached'
+                    break
+                
+                risk_amount = capital * risk_fraction
+                profit_loss = risk_amount * multiplier
+                
+                if capital_limit is not None and capital + profit_loss > capital_limit:
+                    stop_reason = 'capital_limit'
+                    break
+                
+                capital += profit_loss
+                trade_number += 1
+                trades_executed += 1
+                
+                # Statistiques cumulées
+                sum_risk_amount += risk_amount
+                sum_profit_loss += profit_loss
+                r_counter += multiplier
+                outcome_counts[multiplier] = outcome_counts.get(multiplier, 0) + 1
+                
+                if multiplier > 0:
+                    wins += 1
+                    consecutive_wins += 1
+                    consecutive_losses = 0
+                    if consecutive_wins > max_consecutive_wins:
+                        max_consecutive_wins = consecutive_wins
+                else:
+                    consecutive_losses += 1
+                    consecutive_wins = 0
+                    if consecutive_losses > max_consecutive_losses:
+                        max_consecutive_losses = consecutive_losses
+                
+                if capital > max_capital:
+                    max_capital = capital
+                    performance = (capital - initial_capital) / initial_capital * 100
+                    if performance > max_performance:
+                        max_performance = performance
+                else:
+                    drawdown = (capital - max_capital) / max_capital * 100
+                    if drawdown < max_drawdown:
+                        max_drawdown = drawdown
+                
+                # Courbe échantillonnée à pas adaptatif
+                last_trade = (trade_number, capital, multiplier, profit_loss)
+                if trades_executed % stride == 0:
+                    samples.append(last_trade)
+                    if len(samples) >= 2 * sample_points:
+                        samples = samples[1::2]
+                        stride *= 2
+        
+        # Toujours inclure le dernier trade
+        if last_trade is not None and (not samples or samples[-1] is not last_trade):
+            samples.append(last_trade)
+        
+        return {
+            'state': {
+                'current_capital': capital,
+                'max_capital': max_capital,
+                'total_trades': trade_number,
+                'consecutive_wins': consecutive_wins,
+                'consecutive_losses': consecutive_losses,
+                'max_consecutive_wins': max_consecutive_wins,
+                'max_consecutive_losses': max_consecutive_losses,
+                'max_drawdown_percent': max_drawdown,
+                'max_performance_percent': max_performance,
+            },
+            'aggregates': {
+                'total_trades': trades_executed,
+                'wins': wins,
+                'losses': trades_executed - wins,
+                'sum_risk_percent': float(risk_percent) * trades_executed,
+                'sum_risk_amount': sum_risk_amount,
+                'sum_profit_loss': sum_profit_loss,
+                'r_counter': r_counter,
+                'outcome_distribution': outcome_counts,
+            },
+            'samples': [
+                {
+                    'trade_number': number,
+                    'capital_after': round(capital_after, 2),
+                    'risk_percent': float(risk_percent),
+                    'outcome_multiplier': multiplier,
+                    'profit_loss': round(profit_loss, 2),
+                }
+                for number, capital_after, multiplier, profit_loss in samples
+            ],
+            'trades_executed': trades_executed,
+            'stop_reason': stop_reason,
+        }
+    
+    @staticmethod
+    def merge_aggregates(*aggregates_list):
+        """Additionne plusieurs dicts d'agrégats (voir aggregate_trades)"""
+        merged = {
+            'total_trades': 0,
+            'wins': 0,
+            'losses': 0,
+            'sum_risk_percent': 0.0,
+            'sum_risk_amount': 0.0,
+            'sum_profit_loss': 0.0,
+            'r_counter': 0.0,
+            'outcome_distribution': {},
+        }
+        for aggregates in aggregates_list:
+            if not aggregates:
+                continue
+            for key in ('total_trades', 'wins', 'losses', 'sum_risk_percent',
+                        'sum_risk_amount', 'sum_profit_loss', 'r_counter'):
+                merged[key] += aggregates[key]
+            # Les clés JSON sont des chaînes : normaliser en entiers
+            for multiplier, count in aggregates['outcome_distribution'].items():
+                multiplier = int(float(multiplier))
+                merged['outcome_distribution'][multiplier] = merged['outcome_distribution'].get(multiplier, 0) + count
+        return merged
+    
+    @classmethod
+    def aggregate_trades(cls, trades_queryset):
+        """
+        Agrège un QuerySet de trades en SQL
+        
+        Returns:
+            dict: Agrégats (compteurs, sommes, distribution des issues)
+        """
+        from django.db.models import Count, Q, Sum
+        
+        totals = trades_queryset.aggregate(
+            total_trades=Count('id'),
+            wins=Count('id', filter=Q(is_win=True)),
+            sum_risk_percent=Sum('risk_percent'),
+            sum_risk_amount=Sum('risk_amount'),
+            sum_profit_loss=Sum('profit_loss'),
+            r_counter=Sum('outcome_multiplier'),
+        )
+        
+        outcome_counts = {}
+        for row in trades_queryset.order_by().values('outcome_multiplier').annotate(n=Count('id')):
+            multiplier = int(row['outcome_multiplier'])
+            outcome_counts[multiplier] = outcome_counts.get(multiplier, 0) + row['n']
+        
+        return {
+            'total_trades': totals['total_trades'],
+            'wins': totals['wins'],
+            'losses': totals['total_trades'] - totals['wins'],
+            'sum_risk_percent': float(totals['sum_risk_percent'] or 0),
+            'sum_risk_amount': float(totals['sum_risk_amount'] or 0),
+            'sum_profit_loss': float(totals['sum_profit_loss'] or 0),
+            'r_counter': float(totals['r_counter'] or 0),
+            'outcome_distribution': outcome_counts,
+        }
+    
     @classmethod
     def calculate_statistics(cls, trades_queryset, session):
         """
@@ -119,7 +352,21 @@ class TradingSimulator:
         Returns:
             dict: Statistiques calculées
         """
-        total_trades = trades_queryset.count()
+        return cls.calculate_statistics_from_aggregates(cls.aggregate_trades(trades_queryset), session)
+    
+    @classmethod
+    def calculate_statistics_from_aggregates(cls, aggregates, session):
+        """
+        Calcule les statistiques pour une session à partir d'agrégats
+        
+        Args:
+            aggregates (dict): Agrégats des trades (voir aggregate_trades)
+            session: TradingSession instance
+            
+        Returns:
+            dict: Statistiques calculées
+        """
+        total_trades = aggregates['total_trades']
         
         if total_trades == 0:
             return {
@@ -135,8 +382,8 @@ class TradingSimulator:
                 'max_drawdown': 0,
             }
         
-        wins = trades_queryset.filter(is_win=True).count()
-        losses = trades_queryset.filter(is_win=False).count()
+        wins = aggregates['wins']
+        losses = aggregates['losses']
         success_rate = (wins / total_trades * 100) if total_trades > 0 else 0
         
         # Performance actuelle
@@ -145,22 +392,10 @@ class TradingSimulator:
         # Drawdown actuel
         drawdown = ((session.current_capital - session.max_capital) / session.max_capital * 100) if session.max_capital > 0 else 0
         
-        # Compter les occurrences de chaque issue
-        from django.db.models import Count, Avg
-        outcome_counts = {}
-        for trade in trades_queryset:
-            multiplier = int(trade.outcome_multiplier)
-            outcome_counts[multiplier] = outcome_counts.get(multiplier, 0) + 1
-        
         # Calculer les moyennes
-        avg_risk_percent = trades_queryset.aggregate(Avg('risk_percent'))['risk_percent__avg'] or 0
-        avg_risk_amount = trades_queryset.aggregate(Avg('risk_amount'))['risk_amount__avg'] or 0
-        avg_profit_loss = trades_queryset.aggregate(Avg('profit_loss'))['profit_loss__avg'] or 0
-        
-        # Calculer le compteur R cumulatif
-        r_counter = 0
-        for trade in trades_queryset:
-            r_counter += float(trade.outcome_multiplier)
+        avg_risk_percent = aggregates['sum_risk_percent'] / total_trades
+        avg_risk_amount = aggregates['sum_risk_amount'] / total_trades
+        avg_profit_loss = aggregates['sum_profit_loss'] / total_trades
         
         return {
             'total_trades': total_trades,
@@ -181,6 +416,6 @@ class TradingSimulator:
             'avg_risk_percent': round(float(avg_risk_percent), 2),
             'avg_risk_amount': round(float(avg_risk_amount), 2),
             'avg_profit_loss': round(float(avg_profit_loss), 2),
-            'outcome_distribution': outcome_counts,
-            'r_counter': round(r_counter, 2),
+            'outcome_distribution': aggregates['outcome_distribution'],
+            'r_counter': round(aggregates['r_counter'], 2),
         }
@@ -4,8 +4,13 @@ from django.views.decorators.csrf import csrf_exempt
 from decimal import Decimal
 import json
 
-from .models import TradingSession, Trade
+from .models import TradingSession
 from .trading_logic import TradingSimulator
+from .trade_storage import (
+    TRADE_FIELDS, get_trade_store, reset_trade_storage, session_aggregates, session_history_page
+)
+from money_management.export import EXPORT_FORMATS, streaming_export
+from money_management.risk_analysis import kelly_profile
 
 
 def simulator_view(request):
@@ -21,6 +26,73 @@ def get_presets(request):
     })
 
 
+@csrf_exempt
+def kelly_optimizer(request):
+    """
+    Risque fixe optimal (Kelly) et courbe croissance / drawdown d'une distribution d'issues
+    
+    Calcul analytique, sans simulation : optimum par bissection sur la dérivée
+    de la croissance logarithmique, probabilités de drawdown et de crash par
+    programmation dynamique (voir money_management.risk_analysis).
+    
+    POST params:
+        - preset: nom d'un preset de TradingSimulator.PRESETS (défaut: balanced)
+        - outcomes_config: distribution personnalisée (prioritaire sur preset)
+        - fractions: fractions du risque de Kelly évaluées (défaut: 0.25 à 2)
+        - risks: risques (%) de la courbe (défaut: ceux des fractions)
+        - n_trades: horizon des probabilités de drawdown (défaut: 1000)
+        - thresholds: seuils de drawdown en % (défaut: 20 et 50)
+        - drawdown: false pour la croissance seule (réponse immédiate)
+    """
+    if request.method == 'POST':
+        try:
+            data = json.loads(request.body) if request.body else {}
+            outcomes_config = data.get('outcomes_config')
+            if outcomes_config is None:
+                preset = data.get('preset', 'balanced')
+                if preset not in TradingSimulator.PRESETS:
+                    return JsonResponse({
+                        'success': False,
+                        'error': f'Preset "{preset}" inconnu',
+                        'available_presets': list(TradingSimulator.PRESETS)
+                    }, status=400)
+                outcomes_config = TradingSimulator.PRESETS[preset]['outcomes']
+            
+            if not outcomes_config or not all(int(count) > 0 for count in outcomes_config.values()):
+                return JsonResponse({'success': False, 'error': 'outcomes_config invalide'}, status=400)
+            
+            n_trades = min(max(int(data.get('n_trades', 1000)), 1), 5000)
+            risks = data.get('risks')
+            if risks is not None:
+                risks = [min(max(float(risk), 0.1), 20) for risk in risks][:20]
+            thresholds = data.get('thresholds')
+            if thresholds is not None:
+                thresholds = [float(threshold) for threshold in thresholds if 0 < float(threshold) < 100][:20]
+            
+            profile = kelly_profile(
+                {outcome: int(count) for outcome, count in outcomes_config.items()},
+                fractions=[float(fraction) for fraction in data['fractions']][:20] if 'fractions' in data else None,
+                risks=risks,
+                n=n_trades,
+                thresholds=thresholds,
+                initial_capital=float(data.get('initial_capital', 1000)),
+                drawdown=bool(data.get('drawdown', True))
+            )
+            
+            return JsonResponse({
+                'success': True,
+                'outcomes_config': outcomes_config,
+                'mathematical_expectation': TradingSimulator.calculate_mathematical_expectation(outcomes_config),
+                'n_trades': n_trades,
+                **profile
+            })
+            
+        except Exception as e:
+            return JsonResponse({'success': False, 'error': str(e)}, status=400)
+    
+    return JsonResponse({'success': False, 'error': 'Method not allowed'}, status=405)
+
+
 def get_or_create_session(request):
     """Récupère ou crée une session de trading"""
     if not request.session.session_key:
@@ -41,6 +113,19 @@ def start_session(request):
             data = json.loads(request.body)
             initial_capital = Decimal(str(data.get('initial_capital', 1000)))
             outcomes_config = data.get('outcomes_config', {})
+            storage_mode = data.get('storage_mode', TradingSession.STORAGE_ROWS)
+            
+            if not 0 < initial_capital <= TradingSimulator.MAX_SESSION_CAPITAL:
+                return JsonResponse({
+                    'success': False,
+                    'error': f'Le capital initial doit être compris entre 0 et {TradingSimulator.MAX_SESSION_CAPITAL}€'
+                }, status=400)
+            
+            if storage_mode not in dict(TradingSession.STORAGE_MODES):
+                return JsonResponse({
+                    'success': False,
+                    'error': f'Mode de stockage "{storage_mode}" inconnu'
+                }, status=400)
             
             # Récupérer ou créer la session
             trading_session = get_or_create_session(request)
@@ -57,15 +142,16 @@ def start_session(request):
             trading_session.max_drawdown_percent = 0
             trading_session.max_performance_percent = 0
             trading_session.outcomes_config = outcomes_config
-            trading_session.save()
             
-            # Supprimer tous les anciens trades
-            Trade.objects.filter(session=trading_session).delete()
+            # Supprimer tous les anciens trades et préparer le stockage
+            reset_trade_storage(trading_session, storage_mode)
+            trading_session.save()
             
             return JsonResponse({
                 'success': True,
                 'initial_capital': float(initial_capital),
                 'current_capital': float(initial_capital),
+                'storage_mode': trading_session.storage_mode,
             })
         except Exception as e:
             return JsonResponse({'success': False, 'error': str(e)}, status=400)
@@ -80,12 +166,28 @@ def execute_trade(request):
         try:
             data = json.loads(request.body)
             risk_percent = Decimal(str(data.get('risk_percent')))
+            if not 0 < risk_percent <= 100:
+                return JsonResponse({'success': False, 'error': 'Le risque doit être compris entre 0 et 100%'}, status=400)
             
             # Récupérer la session
             trading_session = get_or_create_session(request)
+            store = get_trade_store(trading_session)
+            
+            # Ne pas dépasser ce que la session peut stocker
+            if TradingSimulator.exceeds_capital_limit(
+                trading_session.current_capital,
+                trading_session.initial_capital,
+                risk_percent,
+                trading_session.outcomes_config
+            ):
+                return JsonResponse({
+                    'success': False,
+                    'error': 'Capital maximum de la session atteint',
+                    'capital_limit': TradingSimulator.capital_limit(trading_session.initial_capital)
+                }, status=400)
             
             # Exécuter le trade
-            result = TradingSimulator.execute_trade(
+            result = store.execute_trade(
                 trading_session.current_capital,
                 risk_percent,
                 trading_session.outcomes_config
@@ -93,8 +195,7 @@ def execute_trade(request):
             
             # Créer l'enregistrement du trade
             trade_number = trading_session.total_trades + 1
-            trade = Trade.objects.create(
-                session=trading_session,
+            store.append(dict(
                 trade_number=trade_number,
                 capital_before=trading_session.current_capital,
                 capital_after=result['new_capital'],
@@ -103,7 +204,7 @@ def execute_trade(request):
                 outcome_multiplier=result['multiplier'],
                 profit_loss=result['profit_loss'],
                 is_win=result['is_win']
-            )
+            ))
             
             # Mettre à jour la session
             trading_session.current_capital = result['new_capital']
@@ -138,17 +239,16 @@ def execute_trade(request):
                 trading_session.max_drawdown_percent = current_drawdown
             
             trading_session.save()
+            store.flush()
             
             # Calculer les statistiques
-            stats = TradingSimulator.calculate_statistics(
-                trading_session.trades.all(),
+            stats = TradingSimulator.calculate_statistics_from_aggregates(
+                session_aggregates(store),
                 trading_session
             )
             
-            # Récupérer l'historique pour le graphique
-            trades_history = list(trading_session.trades.values(
-                'trade_number', 'capital_after', 'risk_percent', 'outcome_multiplier', 'profit_loss'
-            ).order_by('trade_number'))
+            # Récupérer l'historique pour le graphique (entrées les plus récentes)
+            trades_history, history_total = session_history_page(store)
             
             return JsonResponse({
                 'success': True,
@@ -161,7 +261,8 @@ def execute_trade(request):
                     'new_capital': float(result['new_capital'])
                 },
                 'stats': stats,
-                'history': trades_history
+                'history': trades_history,
+                'history_total': history_total
             })
             
         except Exception as e:
@@ -181,8 +282,11 @@ def execute_batch_trades(request):
             data = json.loads(request.body)
             risk_percent = Decimal(str(data.get('risk_percent', 1)))
             count = int(data.get('count', 1000))
+            if not 0 < risk_percent <= 100:
+                return JsonResponse({'success': False, 'error': 'Le risque doit être compris entre 0 et 100%'}, status=400)
             
             trading_session = get_or_create_session(request)
+            store = get_trade_store(trading_session)
             
             if trading_session.current_capital <= 0:
                 return JsonResponse({
@@ -198,15 +302,21 @@ def execute_batch_trades(request):
             
             # Exécuter tous les trades en boucle
             trades_executed = 0
+            capital_limit_reached = False
             for i in range(count):
                 if trading_session.current_capital < 1:
                     break  # Arrêter si le capital est en dessous de 1€
+                if TradingSimulator.exceeds_capital_limit(
+                    trading_session.current_capital, trading_session.initial_capital, risk_percent, outcomes_config
+                ):
+                    capital_limit_reached = True
+                    break  # Arrêter avant de dépasser ce que la session peut stocker
                 
                 # Sauvegarder le capital avant le trade
                 capital_before = trading_session.current_capital
                 
                 # Exécuter le trade
-                result = TradingSimulator.execute_trade(
+                result = store.execute_trade(
                     current_capital=trading_session.current_capital,
                     risk_percent=risk_percent,
                     outcomes_config=outcomes_config
@@ -214,8 +324,7 @@ def execute_batch_trades(request):
                 
                 # Créer l'enregistrement du trade
                 trade_number = trading_session.total_trades + 1
-                Trade.objects.create(
-                    session=trading_session,
+                store.append(dict(
                     trade_number=trade_number,
                     capital_before=capital_before,
                     capital_after=result['new_capital'],
@@ -224,7 +333,7 @@ def execute_batch_trades(request):
                     outcome_multiplier=result['multiplier'],
                     profit_loss=result['profit_loss'],
                     is_win=result['is_win']
-                )
+                ))
                 
                 # Mettre à jour la session
                 trading_session.current_capital = result['new_capital']
@@ -264,24 +373,25 @@ def execute_batch_trades(request):
                     trading_session.max_drawdown_percent = current_drawdown
             
             trading_session.save()
+            store.flush()
             
             # Calculer les statistiques finales
-            stats = TradingSimulator.calculate_statistics(
-                trading_session.trades.all(),
+            stats = TradingSimulator.calculate_statistics_from_aggregates(
+                session_aggregates(store),
                 trading_session
             )
             
-            # Récupérer l'historique pour le graphique
-            trades_history = list(trading_session.trades.values(
-                'trade_number', 'capital_after', 'risk_percent', 'outcome_multiplier', 'profit_loss'
-            ).order_by('trade_number'))
+            # Récupérer l'historique pour le graphique (entrées les plus récentes)
+            trades_history, history_total = session_history_page(store)
             
             return JsonResponse({
                 'success': True,
                 'trades_executed': trades_executed,
                 'account_crashed': trading_session.current_capital < 1,
+                'capital_limit_reached': capital_limit_reached,
                 'stats': stats,
-                'history': trades_history
+                'history': trades_history,
+                'history_total': history_total
             })
             
         except Exception as e:
@@ -293,25 +403,166 @@ def execute_batch_trades(request):
     return JsonResponse({'success': False, 'error': 'Method not allowed'}, status=405)
 
 
+@csrf_exempt
+def fast_forward(request):
+    """
+    Avance la session de nombreux trades à risque fixe sans stocker chaque trade
+    
+    Seules les statistiques cumulées et une courbe échantillonnée sont
+    conservées sur la session (point de contrôle) : les trades suivants
+    reprennent normalement à partir du capital atteint.
+    
+    POST params:
+        - risk_percent: risque par trade en % (défaut: 1)
+        - max_trades: nombre maximum de trades (défaut et plafond: 1 000 000)
+        - target_multiple: arrêt quand le capital atteint ce multiple du capital
+          de départ (défaut: 2, null pour désactiver)
+        - sample_points: nombre de points visés pour la courbe (défaut: 1000)
+    """
+    if request.method == 'POST':
+        try:
+            data = json.loads(request.body)
+            risk_percent = Decimal(str(data.get('risk_percent', 1)))
+            if not 0 < risk_percent <= 100:
+                return JsonResponse({'success': False, 'error': 'Le risque doit être compris entre 0 et 100%'}, status=400)
+            max_trades = min(int(data.get('max_trades', 1000000)), 1000000)
+            target_multiple = data.get('target_multiple', 2)
+            sample_points = max(10, int(data.get('sample_points', 1000)))
+            
+            trading_session = get_or_create_session(request)
+            store = get_trade_store(trading_session)
+            
+            if trading_session.current_capital < 1:
+                return JsonResponse({
+                    'success': False,
+                    'error': 'Capital insuffisant pour trader'
+                }, status=400)
+            
+            # Ne pas dépasser ce que la session peut stocker
+            capital_limit = TradingSimulator.capital_limit(trading_session.initial_capital)
+            
+            target_capital = None
+            if target_multiple is not None:
+                target_capital = float(trading_session.current_capital) * float(target_multiple)
+            
+            result = TradingSimulator.fast_forward(
+                state={
+                    'current_capital': trading_session.current_capital,
+                    'initial_capital': trading_session.initial_capital,
+                    'max_capital': trading_session.max_capital,
+                    'total_trades': trading_session.total_trades,
+                    'consecutive_wins': trading_session.consecutive_wins,
+                    'consecutive_losses': trading_session.consecutive_losses,
+                    'max_consecutive_wins': trading_session.max_consecutive_wins,
+                    'max_consecutive_losses': trading_session.max_consecutive_losses,
+                    'max_drawdown_percent': trading_session.max_drawdown_percent,
+                    'max_performance_percent': trading_session.max_performance_percent,
+                },
+                risk_percent=risk_percent,
+                outcomes_config=trading_session.outcomes_config,
+                max_trades=max_trades,
+                target_capital=target_capital,
+                capital_limit=capital_limit,
+                sample_points=sample_points
+            )
+            
+            # Point de contrôle : état de la session après l'avance rapide
+            state = result['state']
+            for field in ('current_capital', 'max_capital', 'max_drawdown_percent', 'max_performance_percent'):
+                setattr(trading_session, field, Decimal(str(round(state[field], 2))))
+            for field in ('total_trades', 'consecutive_wins', 'consecutive_losses',
+                          'max_consecutive_wins', 'max_consecutive_losses'):
+                setattr(trading_session, field, state[field])
+            
+            trading_session.fast_forward_stats = TradingSimulator.merge_aggregates(
+                trading_session.fast_forward_stats,
+                result['aggregates']
+            )
+            trading_session.sampled_segments = trading_session.sampled_segments + [
+                [store.count(), len(result['samples'])]
+            ]
+            trading_session.sampled_history = trading_session.sampled_history + result['samples']
+            
+            store.record_checkpoint(result['trades_executed'], trading_session.current_capital)
+            trading_session.save()
+            store.flush()
+            
+            stats = TradingSimulator.calculate_statistics_from_aggregates(
+                session_aggregates(store),
+                trading_session
+            )
+            
+            trades_history, history_total = session_history_page(store)
+            
+            return JsonResponse({
+                'success': True,
+                'trades_executed': result['trades_executed'],
+                'stop_reason': result['stop_reason'],
+                'account_crashed': result['stop_reason'] == 'account_crashed',
+                'stats': stats,
+                'history': trades_history,
+                'history_total': history_total
+            })
+            
+        except Exception as e:
+            return JsonResponse({'success': False, 'error': str(e)}, status=400)
+    
+    return JsonResponse({'success': False, 'error': 'Method not allowed'}, status=405)
+
+
 @csrf_exempt
 def get_stats(request):
-    """Récupère les statistiques de la session actuelle"""
+    """
+    Récupère les statistiques de la session actuelle
+    
+    GET params (optionnels):
+        - start, stop: intervalle d'indices de l'historique renvoyé (défaut :
+          les CHART_HISTORY_LIMIT entrées les plus récentes ; history_total
+          donne le nombre total d'entrées)
+    """
     try:
         trading_session = get_or_create_session(request)
-        stats = TradingSimulator.calculate_statistics(
-            trading_session.trades.all(),
+        store = get_trade_store(trading_session)
+        stats = TradingSimulator.calculate_statistics_from_aggregates(
+            session_aggregates(store),
             trading_session
         )
         
         # Récupérer l'historique pour le graphique
-        trades_history = list(trading_session.trades.values(
-            'trade_number', 'capital_after', 'risk_percent', 'outcome_multiplier', 'profit_loss'
-        ).order_by('trade_number'))
+        start = int(request.GET['start']) if 'start' in request.GET else None
+        stop = int(request.GET['stop']) if 'stop' in request.GET else None
+        trades_history, history_total = session_history_page(store, start, stop)
         
         return JsonResponse({
             'success': True,
             'stats': stats,
-            'history': trades_history
+            'history': trades_history,
+            'history_total': history_total
         })
     except Exception as e:
         return JsonResponse({'success': False, 'error': str(e)}, status=400)
+
+
+def export_trades(request):
+    """
+    Exporte en streaming les trades stockés de la session actuelle
+    
+    GET params:
+        - format: 'csv' (défaut) ou 'ndjson'
+    
+    Les trades joués en avance rapide ne sont pas stockés individuellement
+    et ne figurent donc pas dans l'export.
+    """
+    export_format = request.GET.get('format', 'csv')
+    if export_format not in EXPORT_FORMATS:
+        return JsonResponse({'success': False, 'error': f'Format "{export_format}" non supporté'}, status=400)
+    
+    trading_session = get_or_create_session(request)
+    store = get_trade_store(trading_session)
+    
+    return streaming_export(
+        store.iter_trades(),
+        TRADE_FIELDS,
+        export_format,
+        f'trades_{trading_session.session_key[:8]}'
+    )
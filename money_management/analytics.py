@@ -0,0 +1,657 @@
+"""
+Analyses statistiques sur les résultats stockés d'un batch
+
+Les calculs parcourent les données en streaming : la mémoire utilisée ne
+dépend pas du nombre de simulations du batch.
+"""
+
+import math
+import random
+import statistics
+from bisect import bisect_left
+
+from django.db.models import Count, F, FloatField, Max, Min, Value
+from django.db.models.functions import Cast, Floor, Least
+
+
+# Percentiles des bandes du fan chart
+FAN_PERCENTILES = [5, 25, 50, 75, 95]
+
+# Bootstrap : nombre de rééchantillonnages par défaut / maximum
+BOOTSTRAP_RESAMPLES = 2000
+MAX_BOOTSTRAP_RESAMPLES = 20000
+
+# Métriques dont get_batch_statistics renvoie la distribution
+HISTOGRAM_FIELDS = ['final_performance_pct', 'max_drawdown_pct', 'max_consecutive_losses']
+
+
+class P2Quantile:
+    """
+    Estimateur P² (Jain & Chlamtac) d'un quantile en streaming
+
+    Mémoire constante (5 marqueurs) quel que soit le nombre d'observations.
+    Tant que moins de 5 valeurs ont été vues, le quantile est calculé exactement.
+    """
+
+    def __init__(self, p):
+        self.p = p
+        self.count = 0
+        self.heights = []
+        self.positions = [0, 1, 2, 3, 4]
+        self.desired = [0, 2 * p, 4 * p, 2 + 2 * p, 4]
+        self.increments = [0, p / 2, p, (1 + p) / 2, 1]
+
+    def add(self, x):
+        self.count += 1
+        q = self.heights
+
+        # Initialisation avec les 5 premières observations
+        if self.count <= 5:
+            q.append(x)
+            q.sort()
+            return
+
+        # Cellule contenant x (et mise à jour des extrêmes)
+        if x < q[0]:
+            q[0] = x
+            k = 0
+        elif x >= q[4]:
+            q[4] = x
+            k = 3
+        else:
+            k = 0
+            while x >= q[k + 1]:
+                k += 1
+
+        n = self.positions
+        for i in range(k + 1, 5):
+            n[i] += 1
+        for i in range(5):
+            self.desired[i] += self.increments[i]
+
+        # Ajustement des marqueurs centraux
+        for i in range(1, 4):
+            d = self.desired[i] - n[i]
+            if (d >= 1 and n[i + 1] - n[i] > 1) or (d <= -1 and n[i - 1] - n[i] < -1):
+                d = 1 if d > 0 else -1
+                candidate = self._parabolic(i, d)
+                if q[i - 1] < candidate < q[i + 1]:
+                    q[i] = candidate
+                else:
+                    q[i] = q[i] + d * (q[i + d] - q[i]) / (n[i + d] - n[i])
+                n[i] += d
+
+    def _parabolic(self, i, d):
+        q = self.heights
+        n = self.positions
+        return q[i] + d / (n[i + 1] - n[i - 1]) * (
+            (n[i] - n[i - 1] + d) * (q[i + 1] - q[i]) / (n[i + 1] - n[i])
+            + (n[i + 1] - n[i] - d) * (q[i] - q[i - 1]) / (n[i] - n[i - 1])
+        )
+
+    def value(self):
+        if self.count == 0:
+            return None
+        if self.count <= 5:
+            return exact_quantile(self.heights, self.p)
+        return self.heights[2]
+
+
+def exact_quantile(sorted_values, p):
+    """Quantile par interpolation linéaire sur une liste triée"""
+    position = (len(sorted_values) - 1) * p
+    low = math.floor(position)
+    high = min(low + 1, len(sorted_values) - 1)
+    return sorted_values[low] + (sorted_values[high] - sorted_values[low]) * (position - low)
+
+
+def fan_chart(curves, curve_length, points=200, percentiles=FAN_PERCENTILES):
+    """
+    Bandes de percentiles par index de trade sur un flux d'equity curves
+
+    Une courbe arrêtée avant la fin (compte crashé) garde sa dernière valeur
+    aux index suivants, comme dans simulator.run_paths : les bandes portent
+    toujours sur toutes les courbes, sans biais du survivant.
+
+    Args:
+        curves: Itérable d'equity curves (lues une par une)
+        curve_length: Longueur maximale d'une courbe (num_trades + 1)
+        points: Nombre maximal d'index échantillonnés
+        percentiles: Percentiles calculés (en %)
+
+    Returns:
+        dict: {
+            'indices': [int],  # index de trade échantillonnés
+            'bands': {'p5': [float], ...},  # une valeur par index
+            'counts': [int],  # courbes encore actives (non crashées) à chaque index
+            'num_curves': int
+        }
+    """
+    stride = max(1, math.ceil(curve_length / points))
+    indices = list(range(0, curve_length, stride))
+    if indices[-1] != curve_length - 1:
+        indices.append(curve_length - 1)
+
+    estimators = [[P2Quantile(pct / 100) for pct in percentiles] for _ in indices]
+    active = [0] * len(indices)
+    num_curves = 0
+
+    for curve in curves:
+        if not curve:
+            continue
+        num_curves += 1
+        length = len(curve)
+        for slot, index in enumerate(indices):
+            if index < length:
+                value = curve[index]
+                active[slot] += 1
+            else:
+                # Courbe arrêtée avant cet index (compte crashé) : dernière valeur reportée
+                value = curve[-1]
+            for estimator in estimators[slot]:
+                estimator.add(value)
+
+    # Index ayant reçu au moins une valeur (aucun sans courbe)
+    used = [slot for slot, row in enumerate(estimators) if row[0].count]
+    return {
+        'indices': [indices[slot] for slot in used],
+        'bands': {
+            f'p{pct}': [round(estimators[slot][k].value(), 2) for slot in used]
+            for k, pct in enumerate(percentiles)
+        },
+        'counts': [active[slot] for slot in used],
+        'num_curves': num_curves
+    }
+
+
+def summarize_paths(indices, paths, percentiles=FAN_PERCENTILES, histogram_bins=20):
+    """
+    Synthèse d'un ensemble de chemins simulés (voir simulator.run_paths)
+
+    Returns:
+        dict: {
+            'indices': [int],
+            'bands': {'p5': [float], ...},  # percentiles du capital par index
+            'ruin_probability': float,  # part des comptes crashés
+            'final_capital': {'mean', 'percentiles', 'histogram'},  # histogramme en log10(capital)
+            'drawdown_max': {'mean', 'percentiles'},
+            'representative_paths': {'p5': [float], ...}  # chemin réel le plus proche de chaque percentile final
+        }
+    """
+    count = len(paths)
+
+    bands = {f'p{pct}': [] for pct in percentiles}
+    for slot in range(len(indices)):
+        column = sorted(path['curve'][slot] for path in paths)
+        for pct in percentiles:
+            bands[f'p{pct}'].append(round(exact_quantile(column, pct / 100), 2))
+
+    finals = sorted(path['capital_final'] for path in paths)
+    drawdowns = sorted(path['drawdown_max'] for path in paths)
+
+    # Histogramme du capital final en log10 (les résultats couvrent plusieurs ordres de grandeur)
+    logs = [math.log10(max(value, 0.01)) for value in finals]
+    low, high = logs[0], logs[-1]
+    width = (high - low) / histogram_bins or 1
+    counts = [0] * histogram_bins
+    for value in logs:
+        counts[min(int((value - low) / width), histogram_bins - 1)] += 1
+
+    # Chemin dont le capital final est le plus proche de chaque percentile
+    representative = {}
+    for pct in percentiles:
+        target = exact_quantile(finals, pct / 100)
+        closest = min(paths, key=lambda path: abs(path['capital_final'] - target))
+        representative[f'p{pct}'] = [round(value, 2) for value in closest['curve']]
+
+    return {
+        'indices': indices,
+        'bands': bands,
+        'ruin_probability': sum(1 for path in paths if path['account_crashed']) / count,
+        'final_capital': {
+            'mean': round(sum(finals) / count, 2),
+            'percentiles': {f'p{pct}': round(exact_quantile(finals, pct / 100), 2) for pct in percentiles},
+            'histogram': {
+                'log10_edges': [round(low + width * i, 4) for i in range(histogram_bins + 1)],
+                'counts': counts
+            }
+        },
+        'drawdown_max': {
+            'mean': round(sum(drawdowns) / count, 2),
+            'percentiles': {f'p{pct}': round(exact_quantile(drawdowns, pct / 100), 2) for pct in percentiles}
+        },
+        'representative_paths': representative
+    }
+
+
+def sql_histograms(results, field, bins=20):
+    """
+    Histogramme et CDF d'une métrique, par configuration, calculés en SQL
+
+    Les classes sont communes à toutes les configurations (bornes min/max du
+    QuerySet) : une requête d'agrégat pour les bornes, une requête GROUP BY
+    (config, classe) pour les effectifs. Le coût ne dépend pas du nombre de
+    lignes côté Python.
+
+    Returns:
+        tuple: (edges, {config_id: {'counts': [int], 'cdf': [float]}})
+               cdf[i] = part des valeurs <= edges[i + 1]
+    """
+    bounds = results.aggregate(low=Min(field), high=Max(field))
+    low, high = bounds['low'], bounds['high']
+    if low is None:
+        return [], {}
+
+    width = (high - low) / bins or 1.0
+    rows = (
+        results
+        .annotate(bin=Least(
+            Floor((Cast(F(field), FloatField()) - Value(float(low))) / Value(width)),
+            Value(float(bins - 1))
+        ))
+        .values('config_id', 'bin')
+        .annotate(count=Count('id'))
+        .order_by()
+    )
+
+    histograms = {}
+    for row in rows:
+        counts = histograms.setdefault(row['config_id'], {'counts': [0] * bins})['counts']
+        counts[int(row['bin'])] += row['count']
+
+    for histogram in histograms.values():
+        total = sum(histogram['counts'])
+        cumulative = 0
+        histogram['cdf'] = []
+        for count in histogram['counts']:
+            cumulative += count
+            histogram['cdf'].append(round(cumulative / total, 4))
+
+    edges = [round(low + width * i, 4) for i in range(bins + 1)]
+    return edges, histograms
+
+
+def bootstrap_ci(values, statistic='mean', resamples=BOOTSTRAP_RESAMPLES, confidence=0.95, rng=None):
+    """
+    Intervalle de confiance bootstrap (méthode des percentiles) d'une moyenne ou médiane
+
+    Pour la médiane, les valeurs sont triées une fois : la médiane d'un
+    rééchantillon est la valeur à l'index médian des index tirés (triés), ce
+    qui évite de recopier et trier les valeurs à chaque tirage.
+
+    Args:
+        values: Liste de valeurs observées
+        statistic: 'mean' ou 'median'
+        resamples: Nombre de rééchantillonnages
+        confidence: Niveau de confiance (ex: 0.95)
+        rng: Générateur random.Random (résultats reproductibles)
+
+    Returns:
+        dict: {'estimate', 'low', 'high'} ou None si aucune valeur
+    """
+    n = len(values)
+    if n == 0:
+        return None
+    rng = rng or random.Random()
+    alpha = (1 - confidence) / 2
+
+    if statistic == 'mean':
+        estimate = sum(values) / n
+        stats = [sum(rng.choices(values, k=n)) / n for _ in range(resamples)]
+    elif statistic == 'median':
+        ordered = sorted(values)
+        estimate = exact_quantile(ordered, 0.5)
+        low_rank, high_rank = (n - 1) // 2, n // 2
+        population = range(n)
+        stats = []
+        for _ in range(resamples):
+            indices = sorted(rng.choices(population, k=n))
+            stats.append((ordered[indices[low_rank]] + ordered[indices[high_rank]]) / 2)
+    else:
+        raise ValueError(f'Statistique "{statistic}" non supportée (mean ou median)')
+
+    stats.sort()
+    return {
+        'estimate': round(estimate, 4),
+        'low': round(exact_quantile(stats, alpha), 4),
+        'high': round(exact_quantile(stats, 1 - alpha), 4)
+    }
+
+
+def read_columns(results, fields):
+    """
+    Lit des métriques par configuration, en colonnes, en une seule requête
+
+    Returns:
+        dict: {config_id: {'run_index': [int], field: [valeurs], ...}} (ordre des runs)
+    """
+    columns = {}
+    for row in results.values_list('config_id', 'run_index', *fields).order_by('config_id', 'run_index', 'id'):
+        column = columns.get(row[0])
+        if column is None:
+            column = columns[row[0]] = {name: [] for name in ('run_index', *fields)}
+        column['run_index'].append(row[1])
+        for name, value in zip(fields, row[2:]):
+            column[name].append(value)
+    return columns
+
+
+def paired_difference(runs_a, values_a, runs_b, values_b):
+    """
+    Différence moyenne A - B appariée par run_index (nombres aléatoires communs)
+
+    Returns:
+        dict: {
+            'n_pairs': int,
+            'mean_diff': float,
+            'std_error': float,  # erreur standard appariée
+            'unpaired_std_error': float,  # erreur standard si les runs étaient indépendants
+            'variance_reduction': float  # (unpaired / paired)², gain en nombre de runs
+        } ou None si moins de 2 paires
+    """
+    by_run_b = dict(zip(runs_b, values_b))
+    pairs = [(value, by_run_b[run]) for run, value in zip(runs_a, values_a) if run in by_run_b]
+    n = len(pairs)
+    if n < 2:
+        return None
+
+    diffs = [a - b for a, b in pairs]
+    std_error = math.sqrt(statistics.variance(diffs) / n)
+    unpaired = math.sqrt(
+        statistics.variance([a for a, _ in pairs]) / n + statistics.variance([b for _, b in pairs]) / n
+    )
+    return {
+        'n_pairs': n,
+        'mean_diff': round(statistics.fmean(diffs), 4),
+        'std_error': round(std_error, 4),
+        'unpaired_std_error': round(unpaired, 4),
+        'variance_reduction': round((unpaired / std_error) ** 2, 2) if std_error else None
+    }
+
+
+# ---------------------------------------------------------------------------
+# Tests statistiques (sans dépendance externe)
+# ---------------------------------------------------------------------------
+
+def _betacf(a, b, x):
+    """Fraction continue de la fonction bêta incomplète (méthode de Lentz)"""
+    tiny = 1e-300
+    qab, qap, qam = a + b, a + 1, a - 1
+    c = 1.0
+    d = 1 - qab * x / qap
+    d = 1 / (d if abs(d) > tiny else tiny)
+    h = d
+    for m in range(1, 300):
+        m2 = 2 * m
+        for aa in (m * (b - m) * x / ((qam + m2) * (a + m2)),
+                   -(a + m) * (qab + m) * x / ((a + m2) * (qap + m2))):
+            d = 1 + aa * d
+            d = 1 / (d if abs(d) > tiny else tiny)
+            c = 1 + aa / c
+            c = c if abs(c) > tiny else tiny
+            delta = d * c
+            h *= delta
+        if abs(delta - 1) < 3e-14:
+            break
+    return h
+
+
+def betainc(a, b, x):
+    """Fonction bêta incomplète régularisée I_x(a, b)"""
+    if x <= 0:
+        return 0.0
+    if x >= 1:
+        return 1.0
+    log_front = math.lgamma(a + b) - math.lgamma(a) - math.lgamma(b) + a * math.log(x) + b * math.log(1 - x)
+    if x < (a + 1) / (a + b + 2):
+        return math.exp(log_front) * _betacf(a, b, x) / a
+    return 1 - math.exp(log_front) * _betacf(b, a, 1 - x) / b
+
+
+def t_two_sided_p(t, df):
+    """p-value bilatérale d'une statistique t de Student"""
+    if math.isinf(t):
+        return 0.0
+    return betainc(df / 2, 0.5, df / (df + t * t))
+
+
+def normal_two_sided_p(z):
+    """p-value bilatérale d'une statistique normale centrée réduite"""
+    return math.erfc(abs(z) / math.sqrt(2))
+
+
+def _ranks(values):
+    """Rangs moyens (ex-aequo) et tailles des groupes d'ex-aequo"""
+    order = sorted(range(len(values)), key=values.__getitem__)
+    ranks = [0.0] * len(values)
+    ties = []
+    i = 0
+    while i < len(order):
+        j = i
+        while j + 1 < len(order) and values[order[j + 1]] == values[order[i]]:
+            j += 1
+        for k in range(i, j + 1):
+            ranks[order[k]] = (i + j) / 2 + 1
+        if j > i:
+            ties.append(j - i + 1)
+        i = j + 1
+    return ranks, ties
+
+
+def _t_result(t, df):
+    return {'statistic': round(t, 4), 'df': round(df, 2), 'p_value': round(t_two_sided_p(t, df), 6)}
+
+
+def paired_t_test(diffs):
+    """Test t apparié sur les différences"""
+    n = len(diffs)
+    if n < 2:
+        return None
+    sd = statistics.stdev(diffs)
+    mean = statistics.fmean(diffs)
+    t = mean / (sd / math.sqrt(n)) if sd else math.copysign(math.inf, mean) if mean else 0.0
+    return _t_result(t, n - 1)
+
+
+def welch_t_test(a, b):
+    """Test t de Welch (échantillons indépendants, variances inégales)"""
+    na, nb = len(a), len(b)
+    if na < 2 or nb < 2:
+        return None
+    va, vb = statistics.variance(a) / na, statistics.variance(b) / nb
+    mean = statistics.fmean(a) - statistics.fmean(b)
+    if va + vb == 0:
+        return _t_result(math.copysign(math.inf, mean) if mean else 0.0, na + nb - 2)
+    df = (va + vb) ** 2 / (va ** 2 / (na - 1) + vb ** 2 / (nb - 1))
+    return _t_result(mean / math.sqrt(va + vb), df)
+
+
+def wilcoxon_signed_rank(diffs):
+    """Test des rangs signés de Wilcoxon (approximation normale, correction des ex-aequo)"""
+    nonzero = [d for d in diffs if d != 0]
+    n = len(nonzero)
+    if n < 2:
+        return None
+    ranks, ties = _ranks([abs(d) for d in nonzero])
+    w_plus = sum(rank for rank, d in zip(ranks, nonzero) if d > 0)
+    mean = n * (n + 1) / 4
+    variance = n * (n + 1) * (2 * n + 1) / 24 - sum(t ** 3 - t for t in ties) / 48
+    z = (w_plus - mean) / math.sqrt(variance) if variance else 0.0
+    return {'name': 'wilcoxon', 'statistic': round(w_plus, 4), 'z': round(z, 4),
+            'p_value': round(normal_two_sided_p(z), 6)}
+
+
+def mann_whitney_u(a, b):
+    """Test U de Mann-Whitney (approximation normale, correction des ex-aequo)"""
+    na, nb = len(a), len(b)
+    if na < 1 or nb < 1:
+        return None
+    ranks, ties = _ranks(list(a) + list(b))
+    u = sum(ranks[:na]) - na * (na + 1) / 2
+    n = na + nb
+    mean = na * nb / 2
+    variance = na * nb / 12 * ((n + 1) - sum(t ** 3 - t for t in ties) / (n * (n - 1)))
+    z = (u - mean) / math.sqrt(variance) if variance > 0 else 0.0
+    return {'name': 'mann_whitney', 'statistic': round(u, 4), 'z': round(z, 4),
+            'p_value': round(normal_two_sided_p(z), 6)}
+
+
+def compare_columns(columns, fields, resamples=1000, paired=False, confidence=0.95, rng=None):
+    """
+    Matrice de comparaisons 2 à 2 entre configurations
+
+    Les moyennes bootstrap de chaque configuration sont calculées une seule
+    fois ; l'IC de la différence A - B se lit ensuite directement dans ces
+    tableaux (index communs en mode apparié, indépendants sinon). Le coût est
+    O(configurations x resamples x runs) + O(paires x resamples).
+
+    Args:
+        columns: {clé: {'run_index': [...], champ: [...]}} (voir read_columns)
+        fields: Métriques comparées
+        resamples: Rééchantillonnages bootstrap (0 pour désactiver)
+        paired: Appariement par run_index (batch en nombres aléatoires communs)
+
+    Returns:
+        list: une entrée par paire {'a', 'b', champ: {'mean_diff', 't_test', 'rank_test', 'bootstrap_ci'}}
+    """
+    rng = rng or random.Random()
+    alpha = (1 - confidence) / 2
+    keys = list(columns)
+
+    if paired:
+        # Runs présents dans toutes les configurations comparées
+        common_runs = set.intersection(*(set(columns[key]['run_index']) for key in keys))
+        aligned = {}
+        for key in keys:
+            by_run = {field: dict(zip(columns[key]['run_index'], columns[key][field])) for field in fields}
+            aligned[key] = {field: [by_run[field][run] for run in sorted(common_runs)] for field in fields}
+        columns = aligned
+
+    # Moyennes bootstrap par configuration et métrique
+    boot_means = {}
+    if resamples:
+        shared = None
+        if paired:
+            n = len(common_runs)
+            shared = [rng.choices(range(n), k=n) for _ in range(resamples)] if n else []
+        for key in keys:
+            n = len(columns[key][fields[0]])
+            if paired:
+                index_sets = shared
+            else:
+                index_sets = [rng.choices(range(n), k=n) for _ in range(resamples)] if n else []
+            boot_means[key] = {
+                field: [sum(columns[key][field][i] for i in indices) / n for indices in index_sets]
+                for field in fields
+            }
+
+    comparisons = []
+    for i, key_a in enumerate(keys):
+        for key_b in keys[i + 1:]:
+            entry = {'a': key_a, 'b': key_b}
+            for field in fields:
+                a, b = columns[key_a][field], columns[key_b][field]
+                if not a or not b:
+                    entry[field] = None
+                    continue
+                if paired:
+                    diffs = [x - y for x, y in zip(a, b)]
+                    result = {
+                        'mean_diff': round(statistics.fmean(diffs), 4),
+                        't_test': paired_t_test(diffs),
+                        'rank_test': wilcoxon_signed_rank(diffs)
+                    }
+                else:
+                    result = {
+                        'mean_diff': round(statistics.fmean(a) - statistics.fmean(b), 4),
+                        't_test': welch_t_test(a, b),
+                        'rank_test': mann_whitney_u(a, b)
+                    }
+                if resamples:
+                    diffs = sorted(x - y for x, y in zip(boot_means[key_a][field], boot_means[key_b][field]))
+                    result['bootstrap_ci'] = {
+                        'low': round(exact_quantile(diffs, alpha), 4),
+                        'high': round(exact_quantile(diffs, 1 - alpha), 4)
+                    }
+                entry[field] = result
+            comparisons.append(entry)
+    return comparisons
+
+
+def control_variate_estimate(values, controls, expected):
+    """
+    Estimateur par variable de contrôle de la moyenne de values
+
+    Y_cv = moyenne(Y) - beta * (moyenne(C) - E[C]), beta = cov(Y, C) / var(C)
+
+    Args:
+        values: Métrique de chaque run (Y)
+        controls: Variable de contrôle de chaque run (C), d'espérance connue
+        expected: Espérance exacte E[C]
+
+    Returns:
+        dict: {'mean', 'estimate', 'std_error', 'beta', 'correlation', 'variance_reduction'}
+              ou None si non estimable
+    """
+    n = len(values)
+    if n < 3 or not all(math.isfinite(v) for v in values):
+        return None
+    variance_c = statistics.variance(controls)
+    variance_y = statistics.variance(values)
+    if not variance_c or not variance_y:
+        return None
+
+    mean_y, mean_c = statistics.fmean(values), statistics.fmean(controls)
+    covariance = sum((y - mean_y) * (c - mean_c) for y, c in zip(values, controls)) / (n - 1)
+    beta = covariance / variance_c
+    correlation = covariance / math.sqrt(variance_c * variance_y)
+    residual_variance = variance_y * (1 - correlation ** 2)
+
+    return {
+        'mean': round(mean_y, 6),
+        'estimate': round(mean_y - beta * (mean_c - expected), 6),
+        'std_error': round(math.sqrt(residual_variance / n), 6),
+        'beta': round(beta, 6),
+        'correlation': round(correlation, 4),
+        'variance_reduction': round(1 / (1 - correlation ** 2), 3) if correlation ** 2 < 1 else None
+    }
+
+
+def pareto_frontier(points):
+    """
+    Indices des points non dominés (skyline), tous les critères à maximiser
+
+    Tri lexicographique décroissant puis balayage : un point est dominé si un
+    point déjà vu (premier critère supérieur ou égal) le domine sur les autres.
+    Les points déjà vus non dominés forment un escalier (second critère
+    croissant, troisième décroissant) interrogé et mis à jour par bisection,
+    soit O(n log n) comparaisons pour 2 ou 3 critères. Les points identiques
+    sont tous conservés.
+
+    Args:
+        points: Liste de tuples de 2 ou 3 valeurs
+
+    Returns:
+        list: Indices des points de la frontière, dans l'ordre de points
+    """
+    groups = {}
+    for index, point in enumerate(points):
+        groups.setdefault(tuple(point) + (0.0,) * (3 - len(point)), []).append(index)
+
+    frontier = []
+    seconds, thirds = [], []  # Escalier des points non dominés déjà vus
+    for point in sorted(groups, reverse=True):
+        _, second, third = point
+        position = bisect_left(seconds, second)
+        # Parmi les points de second critère >= second, le premier a le plus grand troisième
+        if position < len(seconds) and thirds[position] >= third:
+            continue
+        frontier.extend(groups[point])
+        # Les points de l'escalier dominés par le nouveau sont juste avant lui
+        start = position
+        while start > 0 and thirds[start - 1] <= third:
+            start -= 1
+        end = position + 1 if position < len(seconds) and seconds[position] == second else position
+        seconds[start:end] = [second]
+        thirds[start:end] = [third]
+    return sorted(frontier)
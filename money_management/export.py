@@ -0,0 +1,62 @@
+"""
+Export en streaming (CSV ou NDJSON) de lignes produites par un itérateur
+
+Les lignes sont encodées et envoyées au fur et à mesure : la mémoire reste
+constante quel que soit le nombre de lignes exportées.
+"""
+
+import csv
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import StreamingHttpResponse
+
+
+EXPORT_FORMATS = {
+    'csv': 'text/csv',
+    'ndjson': 'application/x-ndjson',
+}
+
+
+class _Echo:
+    """Pseudo-fichier : csv.writer renvoie directement la ligne encodée"""
+
+    def write(self, value):
+        return value
+
+
+def _csv_lines(rows, fields):
+    writer = csv.writer(_Echo())
+    yield writer.writerow(fields)
+    for row in rows:
+        yield writer.writerow([
+            json.dumps(row[field], cls=DjangoJSONEncoder) if isinstance(row[field], (list, dict)) else row[field]
+            for field in fields
+        ])
+
+
+def _ndjson_lines(rows, fields):
+    for row in rows:
+        yield json.dumps({field: row[field] for field in fields}, cls=DjangoJSONEncoder) + '\n'
+
+
+def streaming_export(rows, fields, export_format, filename):
+    """
+    Construit une réponse HTTP streaming à partir d'un itérateur de dicts
+
+    Args:
+        rows: Itérateur de dicts (ex: QuerySet.values().iterator())
+        fields: Colonnes exportées, dans l'ordre
+        export_format: 'csv' ou 'ndjson'
+        filename: Nom du fichier proposé au téléchargement (sans extension)
+
+    Returns:
+        StreamingHttpResponse
+    """
+    if export_format not in EXPORT_FORMATS:
+        raise ValueError(f'Format "{export_format}" non supporté (csv ou ndjson)')
+
+    lines = _csv_lines(rows, fields) if export_format == 'csv' else _ndjson_lines(rows, fields)
+    response = StreamingHttpResponse(lines, content_type=EXPORT_FORMATS[export_format])
+    response['Content-Disposition'] = f'attachment; filename="{filename}.{export_format}"'
+    return response
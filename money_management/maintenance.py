@@ -0,0 +1,195 @@
+"""
+Maintenance de la base : purge rapide des batches et compaction SQLite
+
+La purge supprime les résultats par paquets bornés en SQL brut (sans passer
+par le collector de Django) pour ne jamais bloquer les écritures longtemps.
+La compaction (incremental vacuum par étapes) tourne en arrière-plan et
+rapporte le nombre d'octets récupérés. Elle ne fait jamais de VACUUM complet :
+le passage en auto_vacuum=INCREMENTAL est fait une fois par la migration
+0014_sqlite_incremental_vacuum ; sans ce mode, le job est ignoré (skipped).
+
+Les analyses d'un batch mises en cache (fan chart, bootstrap, comparaisons)
+sont rangées sous une version du batch (batch_cache_key) : la purge change
+cette version, les anciennes entrées ne sont plus jamais lues.
+
+Registres de jobs en arrière-plan (compaction, analyse de sensibilité) : le
+thread du job ne modifie son dict que sous le verrou du registre, l'endpoint
+de suivi en lit une copie sous ce même verrou, et les jobs terminés sont
+oubliés au démarrage d'un nouveau job (prune_jobs).
+"""
+
+import threading
+import uuid
+from datetime import datetime, timedelta
+
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.utils import timezone
+
+from .models import SimulationBatch, SimulationConfig, SimulationResult
+
+
+# Nombre de lignes supprimées par transaction
+PURGE_CHUNK_SIZE = 5000
+
+# Pages libérées par étape d'incremental vacuum
+VACUUM_STEP_PAGES = 2000
+
+# Jobs de compaction : job_id -> statut (lu par l'endpoint de suivi)
+COMPACTION_JOBS = {}
+_compaction_lock = threading.Lock()
+
+# Jobs terminés conservés par registre : les plus récents, pendant au plus JOB_RETENTION
+MAX_FINISHED_JOBS = 20
+JOB_RETENTION = timedelta(hours=1)
+
+
+def prune_jobs(jobs):
+    """
+    Oublie les jobs terminés au-delà de MAX_FINISHED_JOBS ou plus vieux que JOB_RETENTION
+
+    À appeler sous le verrou du registre.
+    """
+    cutoff = timezone.now() - JOB_RETENTION
+    finished = sorted(
+        ((datetime.fromisoformat(job['finished_at']), job_id) for job_id, job in jobs.items() if job['finished_at']),
+        reverse=True
+    )
+    for rank, (finished_at, job_id) in enumerate(finished):
+        if rank >= MAX_FINISHED_JOBS or finished_at < cutoff:
+            del jobs[job_id]
+
+
+def update_job(job, lock, **fields):
+    """Met à jour un job depuis son thread, sous le verrou de son registre"""
+    with lock:
+        job.update(fields)
+
+
+def job_snapshot(jobs, lock, job_id):
+    """Copie d'un job lue sous le verrou de son registre (None si inconnu ou oublié)"""
+    with lock:
+        job = jobs.get(job_id)
+        return dict(job) if job is not None else None
+
+
+def compaction_job(job_id):
+    """Statut d'un job de compaction (copie)"""
+    return job_snapshot(COMPACTION_JOBS, _compaction_lock, job_id)
+
+
+def batch_cache_key(kind, batch_id, *parts):
+    """Clé de cache d'une analyse de batch : mm:<kind>:<batch_id>:<version>:<parts>"""
+    version = cache.get_or_set(f'mm:batch_version:{batch_id}', lambda: uuid.uuid4().hex, None)
+    return ':'.join(['mm', kind, str(batch_id), version, *map(str, parts)])
+
+
+def invalidate_batch_cache(batch_id):
+    """Rend obsolètes toutes les analyses en cache d'un batch (nouvelle version au prochain accès)"""
+    cache.delete(f'mm:batch_version:{batch_id}')
+
+
+def purge_batch(batch_id, chunk_size=PURGE_CHUNK_SIZE):
+    """
+    Supprime un batch, ses configurations et ses résultats
+
+    Args:
+        batch_id: Identifiant du batch
+        chunk_size: Nombre de résultats supprimés par transaction
+
+    Returns:
+        int: Nombre de résultats supprimés
+    """
+    table = connection.ops.quote_name(SimulationResult._meta.db_table)
+    sql = (
+        f'DELETE FROM {table} WHERE id IN '
+        f'(SELECT id FROM {table} WHERE batch_id = %s LIMIT %s)'
+    )
+
+    deleted = 0
+    while True:
+        # Une transaction courte par paquet : les autres écrivains passent entre deux
+        with transaction.atomic():
+            with connection.cursor() as cursor:
+                cursor.execute(sql, [batch_id, chunk_size])
+                count = cursor.rowcount
+        deleted += count
+        if count < chunk_size:
+            break
+
+    SimulationConfig.objects.filter(batch_id=batch_id).delete()
+    SimulationBatch.objects.filter(batch_id=batch_id).delete()
+    invalidate_batch_cache(batch_id)
+    return deleted
+
+
+def _pragma(cursor, name):
+    cursor.execute(f'PRAGMA {name}')
+    return cursor.fetchone()[0]
+
+
+def _compact(job):
+    """Corps du job : incremental vacuum par étapes (SQLite uniquement)"""
+    try:
+        if connection.vendor != 'sqlite':
+            # Les autres moteurs récupèrent l'espace eux-mêmes (autovacuum)
+            update_job(job, _compaction_lock, status='skipped',
+                       reason=f'Base {connection.vendor} : compaction gérée par le moteur')
+            return
+
+        with connection.cursor() as cursor:
+            # auto_vacuum=INCREMENTAL (2) exige un VACUUM complet, qui bloquerait
+            # les écritures : il est réservé à la migration
+            if _pragma(cursor, 'auto_vacuum') != 2:
+                update_job(job, _compaction_lock, status='skipped',
+                           reason="auto_vacuum n'est pas INCREMENTAL : appliquer la migration "
+                                  "money_management 0014_sqlite_incremental_vacuum")
+                return
+
+            page_size = _pragma(cursor, 'page_size')
+            pages_before = _pragma(cursor, 'page_count')
+
+            update_job(job, _compaction_lock, status='vacuuming')
+            while _pragma(cursor, 'freelist_count') > 0:
+                cursor.execute(f'PRAGMA incremental_vacuum({VACUUM_STEP_PAGES})')
+                cursor.fetchall()
+                update_job(job, _compaction_lock,
+                           reclaimed_bytes=(pages_before - _pragma(cursor, 'page_count')) * page_size)
+
+            update_job(job, _compaction_lock, status='completed',
+                       reclaimed_bytes=(pages_before - _pragma(cursor, 'page_count')) * page_size)
+    except Exception as e:
+        update_job(job, _compaction_lock, status='failed', error=str(e))
+    finally:
+        update_job(job, _compaction_lock, finished_at=timezone.now().isoformat())
+        # Connexion propre au thread
+        connection.close()
+
+
+def start_compaction():
+    """
+    Lance la compaction en arrière-plan (un seul job à la fois)
+
+    Returns:
+        dict: Statut du job (nouveau ou déjà en cours), copie
+    """
+    with _compaction_lock:
+        for job in COMPACTION_JOBS.values():
+            if job['status'] in ('pending', 'vacuuming'):
+                return dict(job)
+
+        prune_jobs(COMPACTION_JOBS)
+        job = {
+            'job_id': str(uuid.uuid4()),
+            'status': 'pending',
+            'reclaimed_bytes': 0,
+            'started_at': timezone.now().isoformat(),
+            'finished_at': None,
+            'reason': None,
+            'error': None,
+        }
+        COMPACTION_JOBS[job['job_id']] = job
+        snapshot = dict(job)
+
+    threading.Thread(target=_compact, args=(job,), daemon=True).start()
+    return snapshot
@@ -0,0 +1,28 @@
+# Generated by Django 6.0 on 2026-10-19 11:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('money_management', '0003_strategyreference'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='simulationresult',
+            name='final_log10_growth',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='simulationresult',
+            name='is_saturated',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddField(
+            model_name='simulationresult',
+            name='max_log10_growth',
+            field=models.FloatField(blank=True, null=True),
+        ),
+    ]
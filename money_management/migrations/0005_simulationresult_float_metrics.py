@@ -0,0 +1,63 @@
+# Generated by Django 6.0 on 2026-10-19 10:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('money_management', '0004_simulationresult_log10_growth'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='simulationresult',
+            name='avg_profit_loss',
+            field=models.FloatField(),
+        ),
+        migrations.AlterField(
+            model_name='simulationresult',
+            name='avg_risk_amount',
+            field=models.FloatField(),
+        ),
+        migrations.AlterField(
+            model_name='simulationresult',
+            name='avg_risk_pct',
+            field=models.FloatField(),
+        ),
+        migrations.AlterField(
+            model_name='simulationresult',
+            name='final_capital',
+            field=models.FloatField(),
+        ),
+        migrations.AlterField(
+            model_name='simulationresult',
+            name='final_performance_pct',
+            field=models.FloatField(),
+        ),
+        migrations.AlterField(
+            model_name='simulationresult',
+            name='initial_capital',
+            field=models.FloatField(default=10000),
+        ),
+        migrations.AlterField(
+            model_name='simulationresult',
+            name='max_capital',
+            field=models.FloatField(),
+        ),
+        migrations.AlterField(
+            model_name='simulationresult',
+            name='max_drawdown_pct',
+            field=models.FloatField(),
+        ),
+        migrations.AlterField(
+            model_name='simulationresult',
+            name='max_performance_pct',
+            field=models.FloatField(),
+        ),
+        migrations.AlterField(
+            model_name='simulationresult',
+            name='success_rate',
+            field=models.FloatField(),
+        ),
+    ]
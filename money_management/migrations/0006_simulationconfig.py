@@ -0,0 +1,78 @@
+# Generated by Django 6.0 on 2026-10-19 10:40
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def create_configs(apps, schema_editor):
+    """Crée une SimulationConfig par couple (batch_id, strategy_key) et y rattache les résultats"""
+    SimulationConfig = apps.get_model('money_management', 'SimulationConfig')
+    SimulationResult = apps.get_model('money_management', 'SimulationResult')
+    
+    groups = (
+        SimulationResult.objects
+        .values_list('batch_id', 'strategy_key')
+        .distinct()
+        .order_by()
+    )
+    for batch_id, strategy_key in list(groups):
+        results = SimulationResult.objects.filter(batch_id=batch_id, strategy_key=strategy_key)
+        first = results.order_by('id').first()
+        config = SimulationConfig.objects.create(
+            batch_id=batch_id,
+            strategy_key=strategy_key,
+            strategy_name=first.strategy_name,
+            parameters=first.parameters,
+            num_trades=first.num_trades,
+            initial_capital=first.initial_capital,
+        )
+        results.update(config=config)
+
+
+def restore_columns(apps, schema_editor):
+    """Recopie la configuration dans les colonnes de SimulationResult"""
+    SimulationConfig = apps.get_model('money_management', 'SimulationConfig')
+    SimulationResult = apps.get_model('money_management', 'SimulationResult')
+    
+    for config in SimulationConfig.objects.all():
+        SimulationResult.objects.filter(config=config).update(
+            strategy_name=config.strategy_name,
+            strategy_key=config.strategy_key,
+            parameters=config.parameters,
+            num_trades=config.num_trades,
+            initial_capital=config.initial_capital,
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('money_management', '0005_simulationresult_float_metrics'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SimulationConfig',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('batch_id', models.CharField(blank=True, max_length=100, null=True)),
+                ('strategy_key', models.CharField(max_length=50)),
+                ('strategy_name', models.CharField(max_length=100)),
+                ('parameters', models.JSONField()),
+                ('num_trades', models.IntegerField()),
+                ('initial_capital', models.FloatField(default=10000)),
+                ('outcomes_config', models.JSONField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'ordering': ['batch_id', 'strategy_key'],
+                'constraints': [models.UniqueConstraint(fields=('batch_id', 'strategy_key'), name='unique_simulation_config')],
+            },
+        ),
+        migrations.AddField(
+            model_name='simulationresult',
+            name='config',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, related_name='results', to='money_management.simulationconfig'),
+        ),
+        migrations.RunPython(create_configs, restore_columns),
+    ]
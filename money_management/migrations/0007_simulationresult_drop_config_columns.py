@@ -0,0 +1,43 @@
+# Generated by Django 6.0 on 2026-10-19 10:41
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('money_management', '0006_simulationconfig'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='simulationresult',
+            name='money_manag_strateg_fbc181_idx',
+        ),
+        migrations.RemoveField(
+            model_name='simulationresult',
+            name='initial_capital',
+        ),
+        migrations.RemoveField(
+            model_name='simulationresult',
+            name='num_trades',
+        ),
+        migrations.RemoveField(
+            model_name='simulationresult',
+            name='parameters',
+        ),
+        migrations.RemoveField(
+            model_name='simulationresult',
+            name='strategy_key',
+        ),
+        migrations.RemoveField(
+            model_name='simulationresult',
+            name='strategy_name',
+        ),
+        migrations.AlterField(
+            model_name='simulationresult',
+            name='config',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='results', to='money_management.simulationconfig'),
+        ),
+    ]
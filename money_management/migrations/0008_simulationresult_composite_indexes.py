@@ -0,0 +1,45 @@
+# Generated by Django 6.0 on 2026-10-19 11:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('money_management', '0007_simulationresult_drop_config_columns'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='simulationresult',
+            name='money_manag_batch_i_4300c4_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='simulationresult',
+            name='money_manag_final_p_bed401_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='simulationresult',
+            name='money_manag_max_dra_0c7ec1_idx',
+        ),
+        migrations.AddIndex(
+            model_name='simulationresult',
+            index=models.Index(fields=['batch_id', 'final_performance_pct', 'id'], name='money_manag_batch_i_73acdd_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='simulationresult',
+            index=models.Index(fields=['config', 'final_performance_pct', 'id'], name='money_manag_config__5d2b63_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='simulationresult',
+            index=models.Index(fields=['final_performance_pct', 'id'], name='money_manag_final_p_fd053b_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='simulationresult',
+            index=models.Index(fields=['max_drawdown_pct', 'id'], name='money_manag_max_dra_13eb07_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='simulationresult',
+            index=models.Index(fields=['success_rate', 'id'], name='money_manag_success_71ccd7_idx'),
+        ),
+    ]
@@ -0,0 +1,68 @@
+# Generated by Django 6.0 on 2026-10-19 12:10
+
+from django.db import migrations, models
+
+
+def fill_headlines(apps, schema_editor):
+    """Renseigne les chiffres clés des batches existants"""
+    SimulationBatch = apps.get_model('money_management', 'SimulationBatch')
+    SimulationResult = apps.get_model('money_management', 'SimulationResult')
+    
+    for batch in SimulationBatch.objects.all():
+        results = SimulationResult.objects.filter(batch_id=batch.batch_id)
+        best = (
+            results.values('config__strategy_key', 'config__strategy_name')
+            .annotate(avg_perf=models.Avg('final_performance_pct'))
+            .order_by('-avg_perf')
+            .first()
+        )
+        perfs = list(results.order_by('final_performance_pct').values_list('final_performance_pct', flat=True))
+        if best:
+            batch.best_strategy_key = best['config__strategy_key']
+            batch.best_strategy_name = best['config__strategy_name']
+        if perfs:
+            middle = perfs[(len(perfs) - 1) // 2:len(perfs) // 2 + 1]
+            batch.median_performance_pct = sum(middle) / len(middle)
+        batch.worst_drawdown_pct = results.aggregate(worst=models.Min('max_drawdown_pct'))['worst']
+        batch.save(update_fields=[
+            'best_strategy_key', 'best_strategy_name', 'median_performance_pct', 'worst_drawdown_pct'
+        ])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('money_management', '0008_simulationresult_composite_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='simulationbatch',
+            name='best_strategy_key',
+            field=models.CharField(blank=True, max_length=50),
+        ),
+        migrations.AddField(
+            model_name='simulationbatch',
+            name='best_strategy_name',
+            field=models.CharField(blank=True, max_length=100),
+        ),
+        migrations.AddField(
+            model_name='simulationbatch',
+            name='median_performance_pct',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='simulationbatch',
+            name='worst_drawdown_pct',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='simulationbatch',
+            index=models.Index(fields=['status', 'created_at'], name='money_manag_status_5be9a9_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='simulationbatch',
+            index=models.Index(fields=['created_at'], name='money_manag_created_7d3eee_idx'),
+        ),
+        migrations.RunPython(fill_headlines, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 6.0 on 2026-10-19 13:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('money_management', '0009_simulationbatch_headline'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='simulationbatch',
+            name='common_random_numbers',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddField(
+            model_name='simulationbatch',
+            name='seed',
+            field=models.BigIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='simulationresult',
+            name='run_index',
+            field=models.IntegerField(default=0),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 6.0 on 2026-10-19 14:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('money_management', '0010_common_random_numbers'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='simulationbatch',
+            name='sampling',
+            field=models.CharField(choices=[('iid', 'Indépendant'), ('stratified', 'Stratifié'), ('antithetic', 'Antithétique'), ('rqmc', 'Quasi-Monte Carlo randomisé')], default='iid', max_length=20),
+        ),
+        migrations.AddField(
+            model_name='simulationconfig',
+            name='variance_report',
+            field=models.JSONField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 6.0 on 2026-10-19 15:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('money_management', '0011_outcome_sampling'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='simulationbatch',
+            name='control_variate',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddField(
+            model_name='simulationconfig',
+            name='control_variate',
+            field=models.JSONField(blank=True, null=True),
+        ),
+    ]
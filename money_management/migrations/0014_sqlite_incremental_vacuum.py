@@ -0,0 +1,35 @@
+# Generated by Django 6.0 on 2026-10-19 17:05
+
+from django.db import migrations
+
+
+def enable_incremental_vacuum(apps, schema_editor):
+    """
+    Passe une base SQLite en auto_vacuum=INCREMENTAL
+
+    Le mode ne prend effet qu'après un VACUUM complet, qui réécrit toute la
+    base et bloque les écritures : il est fait une seule fois ici, au
+    déploiement, et non par le job de compaction.
+    """
+    connection = schema_editor.connection
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        cursor.execute('PRAGMA auto_vacuum')
+        if cursor.fetchone()[0] != 2:
+            cursor.execute('PRAGMA auto_vacuum = INCREMENTAL')
+            cursor.execute('VACUUM')
+
+
+class Migration(migrations.Migration):
+
+    # VACUUM est impossible dans une transaction
+    atomic = False
+
+    dependencies = [
+        ('money_management', '0013_parameter_sweep'),
+    ]
+
+    operations = [
+        migrations.RunPython(enable_incremental_vacuum, migrations.RunPython.noop, elidable=True),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 6.0 on 2026-10-19 17:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('money_management', '0014_sqlite_incremental_vacuum'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='simulationresult',
+            index=models.Index(fields=['config', 'max_drawdown_pct', 'id'], name='money_manag_config__61ea61_idx'),
+        ),
+    ]
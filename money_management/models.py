@@ -19,59 +19,121 @@ class StrategyReference(models.Model):
         return f"{self.strategy_name} - Paramètres de référence"
 
 
-class SimulationResult(models.Model):
-    """Stocke les résultats d'une simulation individuelle"""
+class SimulationConfig(models.Model):
+    """Configuration d'une stratégie dans un batch, partagée par tous ses runs"""
     
-    # Identification de la simulation
+    # Identification de la configuration
+    batch_id = models.CharField(max_length=100, null=True, blank=True)
+    strategy_key = models.CharField(max_length=50)  # Clé de stratégie + hash de la configuration
     strategy_name = models.CharField(max_length=100)
-    strategy_key = models.CharField(max_length=50)
     parameters = models.JSONField()  # Stocke les paramètres de la stratégie
     
     # Configuration de la simulation
     num_trades = models.IntegerField()
-    initial_capital = models.DecimalField(max_digits=15, decimal_places=2, default=10000)
+    initial_capital = models.FloatField(default=10000)
+    outcomes_config = models.JSONField(null=True, blank=True)
+    
+    # Facteurs de réduction de variance obtenus par le mode d'échantillonnage du batch
+    variance_report = models.JSONField(null=True, blank=True)
+    
+    # Estimations par variable de contrôle (stratégie à risque fixe sur les mêmes outcomes)
+    control_variate = models.JSONField(null=True, blank=True)
+    
+    # Résumé des runs (balayage de paramètres : les runs ne sont pas stockés un par un)
+    summary = models.JSONField(null=True, blank=True)
+    
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        ordering = ['batch_id', 'strategy_key']
+        constraints = [
+            models.UniqueConstraint(fields=['batch_id', 'strategy_key'], name='unique_simulation_config'),
+        ]
+    
+    def __str__(self):
+        return f"{self.strategy_name} ({self.strategy_key}) - {self.num_trades} trades"
+
+
+class SimulationResult(models.Model):
+    """Stocke les résultats d'une simulation individuelle"""
+    
+    # Configuration simulée (stratégie, paramètres, nombre de trades, capital initial)
+    config = models.ForeignKey(SimulationConfig, on_delete=models.CASCADE, related_name='results')
     
     # Résultats finaux
-    final_capital = models.DecimalField(max_digits=15, decimal_places=2)
-    final_performance_pct = models.DecimalField(max_digits=10, decimal_places=2)
+    final_capital = models.FloatField()
+    final_performance_pct = models.FloatField()
     
     # Statistiques de capital
-    max_capital = models.DecimalField(max_digits=15, decimal_places=2)
-    max_drawdown_pct = models.DecimalField(max_digits=10, decimal_places=2)
-    max_performance_pct = models.DecimalField(max_digits=10, decimal_places=2)
+    max_capital = models.FloatField()
+    max_drawdown_pct = models.FloatField()
+    max_performance_pct = models.FloatField()
     
     # Statistiques de risque
-    avg_risk_pct = models.DecimalField(max_digits=10, decimal_places=4)
-    avg_risk_amount = models.DecimalField(max_digits=15, decimal_places=2)
-    avg_profit_loss = models.DecimalField(max_digits=15, decimal_places=2)
+    avg_risk_pct = models.FloatField()
+    avg_risk_amount = models.FloatField()
+    avg_profit_loss = models.FloatField()
     
     # Statistiques de séries
     max_consecutive_wins = models.IntegerField()
     max_consecutive_losses = models.IntegerField()
     
     # Taux de réussite
-    success_rate = models.DecimalField(max_digits=5, decimal_places=2)
+    success_rate = models.FloatField()
     total_wins = models.IntegerField()
     total_losses = models.IntegerField()
     
+    # Croissance exacte en log10(capital / capital initial) : les valeurs ci-dessus
+    # sont plafonnées au plus grand float, celles-ci ne débordent jamais
+    final_log10_growth = models.FloatField(null=True, blank=True)
+    max_log10_growth = models.FloatField(null=True, blank=True)
+    is_saturated = models.BooleanField(default=False)  # Valeurs d'affichage plafonnées
+    
     # Données détaillées (optionnel, impact performance)
     equity_curve = models.JSONField(null=True, blank=True)  # Historique du capital trade par trade
     
     # Métadonnées
     created_at = models.DateTimeField(auto_now_add=True)
     batch_id = models.CharField(max_length=100, null=True, blank=True)  # Pour regrouper les simulations
+    run_index = models.IntegerField(default=0)  # Numéro du run dans sa configuration (appariement CRN)
+    
+    # Couche d'affichage : les métriques sont stockées en float natif et
+    # arrondies uniquement à la sortie (nombre de décimales par champ)
+    DISPLAY_DECIMALS = {
+        'final_capital': 2,
+        'final_performance_pct': 2,
+        'max_capital': 2,
+        'max_drawdown_pct': 2,
+        'max_performance_pct': 2,
+        'avg_risk_pct': 4,
+        'avg_risk_amount': 2,
+        'avg_profit_loss': 2,
+        'success_rate': 2,
+    }
     
     class Meta:
         ordering = ['-created_at']
+        # Index composites alignés sur les requêtes réelles : filtre (batch / config)
+        # puis tri par performance, 'id' en dernier pour la pagination par curseur
         indexes = [
-            models.Index(fields=['strategy_key']),
-            models.Index(fields=['batch_id']),
-            models.Index(fields=['final_performance_pct']),
-            models.Index(fields=['max_drawdown_pct']),
+            models.Index(fields=['batch_id', 'final_performance_pct', 'id']),
+            models.Index(fields=['config', 'final_performance_pct', 'id']),
+            models.Index(fields=['config', 'max_drawdown_pct', 'id']),
+            models.Index(fields=['final_performance_pct', 'id']),
+            models.Index(fields=['max_drawdown_pct', 'id']),
+            models.Index(fields=['success_rate', 'id']),
         ]
     
     def __str__(self):
-        return f"{self.strategy_name} - {self.final_performance_pct}% (DD: {self.max_drawdown_pct}%)"
+        return f"{self.config.strategy_name} - {self.final_performance_pct:.2f}% (DD: {self.max_drawdown_pct:.2f}%)"
+    
+    @classmethod
+    def display_row(cls, row):
+        """Arrondit les métriques d'un dict (ex: issu de values()) pour l'affichage"""
+        for field, decimals in cls.DISPLAY_DECIMALS.items():
+            if row.get(field) is not None:
+                row[field] = round(row[field], decimals)
+        return row
 
 
 class SimulationBatch(models.Model):
@@ -98,11 +160,71 @@ class SimulationBatch(models.Model):
     # Options de sauvegarde
     has_equity_curves = models.BooleanField(default=False)  # Indique si les equity curves ont été sauvegardées
     
+    # Tirages aléatoires : graine du batch et nombres aléatoires communs
+    # (le run i de chaque configuration consomme la même suite d'outcomes)
+    seed = models.BigIntegerField(null=True, blank=True)
+    common_random_numbers = models.BooleanField(default=False)
+    sampling = models.CharField(
+        max_length=20,
+        choices=[
+            ('iid', 'Indépendant'),
+            ('stratified', 'Stratifié'),
+            ('antithetic', 'Antithétique'),
+            ('rqmc', 'Quasi-Monte Carlo randomisé'),
+        ],
+        default='iid'
+    )
+    # Variable de contrôle : la stratégie à risque fixe rejouée sur les mêmes outcomes
+    control_variate = models.BooleanField(default=False)
+    # Balayage ou optimisation de paramètres : stratégie et axes de la grille ou
+    # domaine de recherche (null pour un batch classique)
+    sweep = models.JSONField(null=True, blank=True)
+    
+    # Chiffres clés dénormalisés, écrits à la fin du batch (liste des batches)
+    best_strategy_key = models.CharField(max_length=50, blank=True)
+    best_strategy_name = models.CharField(max_length=100, blank=True)
+    median_performance_pct = models.FloatField(null=True, blank=True)
+    worst_drawdown_pct = models.FloatField(null=True, blank=True)
+    
     created_at = models.DateTimeField(auto_now_add=True)
     completed_at = models.DateTimeField(null=True, blank=True)
     
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['status', 'created_at']),
+            models.Index(fields=['created_at']),
+        ]
     
     def __str__(self):
         return f"{self.name} ({self.completed_simulations}/{self.total_simulations})"
+    
+    def update_headline(self):
+        """
+        Calcule les chiffres clés du batch (meilleure stratégie, performance
+        médiane, pire drawdown) à partir de ses résultats. Ne sauvegarde pas.
+        """
+        results = SimulationResult.objects.filter(batch_id=self.batch_id)
+        
+        # Meilleure stratégie : performance moyenne la plus élevée
+        best = (
+            results.values('config__strategy_key', 'config__strategy_name')
+            .annotate(avg_perf=models.Avg('final_performance_pct'))
+            .order_by('-avg_perf')
+            .first()
+        )
+        self.best_strategy_key = best['config__strategy_key'] if best else ''
+        self.best_strategy_name = best['config__strategy_name'] if best else ''
+        
+        # Médiane exacte : lecture des 1 ou 2 valeurs centrales via l'index (batch_id, perf)
+        count = results.count()
+        if count:
+            middle = list(
+                results.order_by('final_performance_pct')
+                .values_list('final_performance_pct', flat=True)[(count - 1) // 2:count // 2 + 1]
+            )
+            self.median_performance_pct = sum(middle) / len(middle)
+        else:
+            self.median_performance_pct = None
+        
+        self.worst_drawdown_pct = results.aggregate(worst=models.Min('max_drawdown_pct'))['worst']
@@ -0,0 +1,248 @@
+"""
+Optimisation bayésienne des paramètres d'une stratégie (Tree-structured Parzen Estimator)
+
+Les paramètres sont ramenés dans [0, 1] (échelle log pour les bornes
+positives). Les observations sont séparées en bonnes (quantile TPE_GAMMA des
+meilleurs scores) et mauvaises ; chaque lot de candidats est tiré de la
+densité de Parzen l(x) des bonnes et retenu sur le rapport l(x) / g(x) avec
+celle des mauvaises. Le premier lot est un plan de Halton randomisé.
+
+Chaque lot est évalué en un seul appel à sweep.run_sweep (noyaux incrémentaux,
+chemins répartis sur le pool de processus). Les chemins d'un candidat sont
+toujours les premiers de la même suite de graines : les candidats sont
+comparés sur des nombres aléatoires communs. Pour un objectif bruité, les
+meilleurs candidats de chaque lot sont réévalués sur un bloc de chemins
+supplémentaire (jusqu'à max_blocks blocs) et la recommandation finale ne
+retient que des candidats ainsi confirmés.
+"""
+
+import math
+import random
+
+from .sampling import halton_points
+from .sweep import run_sweep, summarize_runs
+
+
+# Proportion des meilleures observations formant la densité l(x)
+TPE_GAMMA = 0.25
+
+# Tirages de l(x) par candidat proposé
+TPE_SAMPLES = 24
+
+# Largeur minimale des noyaux de Parzen (en unités du domaine ramené à [0, 1])
+TPE_MIN_BANDWIDTH = 0.02
+
+
+def parameter_space(defaults, space=None):
+    """
+    Domaine de recherche des paramètres
+
+    Args:
+        defaults: Paramètres déclarés de la stratégie (STRATEGIES[key]['params'])
+        space: {param: [low, high]} ; par défaut tous les paramètres déclarés,
+            entre la moitié et le double de leur valeur par défaut (0 à 1 si elle est nulle)
+
+    Returns:
+        dict: {param: (low, high, log, integer)}, échelle log si low > 0
+    """
+    if space is None:
+        space = {
+            name: [value / 2, value * 2] if value > 0 else [0, 1]
+            for name, value in defaults.items()
+        }
+
+    domain = {}
+    for name, bounds in space.items():
+        if name not in defaults:
+            raise ValueError(f'Paramètre "{name}" inconnu ({", ".join(defaults)})')
+        low, high = float(bounds[0]), float(bounds[1])
+        if not low < high:
+            raise ValueError(f'Bornes invalides pour "{name}" : {bounds}')
+        integer = isinstance(defaults[name], int)
+        if integer:
+            low, high = math.ceil(low), math.floor(high)
+            if low >= high:
+                raise ValueError(f'Bornes invalides pour "{name}" : {bounds}')
+        domain[name] = (low, high, low > 0, integer)
+    return domain
+
+
+def decode(domain, unit):
+    """Paramètres correspondant à un point de [0, 1]^d"""
+    params = {}
+    for (name, (low, high, log, integer)), u in zip(domain.items(), unit):
+        if log:
+            value = math.exp(math.log(low) + u * (math.log(high) - math.log(low)))
+        else:
+            value = low + u * (high - low)
+        params[name] = min(high, max(low, round(value))) if integer else round(value, 6)
+    return params
+
+
+def _bandwidth(count):
+    return max(TPE_MIN_BANDWIDTH, min(0.5, 0.5 * count ** -0.2))
+
+
+def _log_density(x, centers, bandwidth):
+    """Log-densité sur [0, 1] : mélange d'une loi uniforme et de noyaux gaussiens aux centres"""
+    density = 1.0
+    for center in centers:
+        z = (x - center) / bandwidth
+        density += math.exp(-0.5 * z * z) / (bandwidth * math.sqrt(2 * math.pi))
+    return math.log(density / (len(centers) + 1))
+
+
+def propose(observations, count, rng):
+    """
+    Candidats TPE : tirés de l(x), retenus sur le plus grand rapport l(x) / g(x)
+
+    Args:
+        observations: Liste de (point de [0, 1]^d, clé de score), les meilleures en tête
+        count: Nombre de candidats
+        rng: Générateur random.Random
+
+    Returns:
+        list: count points de [0, 1]^d
+    """
+    n_good = max(1, math.ceil(TPE_GAMMA * len(observations)))
+    good = [point for point, _ in observations[:n_good]]
+    bad = [point for point, _ in observations[n_good:]] or good
+    dimension = len(good[0])
+    good_bandwidth, bad_bandwidth = _bandwidth(len(good)), _bandwidth(len(bad))
+
+    samples = []
+    for _ in range(count * TPE_SAMPLES):
+        point = []
+        for d in range(dimension):
+            # Composante uniforme (exploration) ou noyau centré sur une bonne observation
+            component = rng.randrange(len(good) + 1)
+            if component == len(good):
+                point.append(rng.random())
+            else:
+                point.append(_reflect(rng.gauss(good[component][d], good_bandwidth)))
+        ratio = sum(
+            _log_density(x, [p[d] for p in good], good_bandwidth) - _log_density(x, [p[d] for p in bad], bad_bandwidth)
+            for d, x in enumerate(point)
+        )
+        samples.append((ratio, point))
+
+    samples.sort(key=lambda sample: sample[0], reverse=True)
+    return [point for _, point in samples[:count]]
+
+
+def _reflect(x):
+    """Ramène x dans [0, 1] par réflexion sur les bords"""
+    x = abs(x) % 2.0
+    return 2.0 - x if x > 1.0 else x
+
+
+def score(summary, objective, sense, constraint=None):
+    """
+    Clé de classement d'un candidat (la plus grande est la meilleure)
+
+    Args:
+        summary: Résumé des runs du candidat (sweep.summarize_runs)
+        objective: Métrique optimisée
+        sense: 'max' ou 'min'
+        constraint: {'metric': ..., 'min': ...} et/ou 'max' : les candidats qui
+            la violent sont classés après tous les autres, par violation croissante
+
+    Returns:
+        tuple: (-violation, objectif orienté)
+    """
+    violation = 0.0
+    if constraint:
+        value = summary[constraint['metric']]
+        if constraint.get('min') is not None:
+            violation += max(0.0, constraint['min'] - value)
+        if constraint.get('max') is not None:
+            violation += max(0.0, value - constraint['max'])
+    return -violation, summary[objective] if sense == 'max' else -summary[objective]
+
+
+def evaluation_blocks(n_params, rounds, batch_size, n_initial=None, reevaluate=2):
+    """
+    Nombre maximal de blocs de n_paths chemins évalués par optimize
+
+    Plan initial, puis batch_size candidats par lot, plus reevaluate blocs de
+    réévaluation après le plan initial et après chaque lot.
+    """
+    if n_initial is None:
+        n_initial = max(batch_size, min(2 * n_params, 20))
+    return n_initial + rounds * batch_size + (rounds + 1) * reevaluate
+
+
+def optimize(strategy_key, outcomes_config, domain, base_params, objective, sense, constraint=None,
+             initial_capital=10000, n=1000, n_paths=100, rounds=8, batch_size=4, n_initial=None,
+             reevaluate=2, max_blocks=4, seed=0):
+    """
+    Optimise les paramètres d'une stratégie par lots de candidats évalués en parallèle
+
+    Args:
+        strategy_key: Clé de la stratégie dans STRATEGIES
+        outcomes_config: Dict des outcomes et de leurs poids
+        domain: Domaine de recherche (voir parameter_space)
+        base_params: Paramètres complets de la stratégie (les autres restent fixes)
+        objective, sense, constraint: voir score
+        initial_capital, n: Capital de départ et nombre de trades par chemin
+        n_paths: Chemins par bloc d'évaluation
+        rounds: Nombre de lots TPE après le plan initial
+        batch_size: Candidats par lot
+        n_initial: Taille du plan de Halton initial (défaut: 2 par paramètre, entre batch_size et 20)
+        reevaluate: Meilleurs candidats réévalués après chaque lot
+        max_blocks: Nombre maximal de blocs de chemins par candidat
+        seed: Graine (chemins et tirages TPE)
+
+    Returns:
+        dict: {'best', 'candidates' (ordre d'évaluation), 'simulations'}
+    """
+    rng = random.Random(f'{seed}:tpe')
+    if n_initial is None:
+        n_initial = max(batch_size, min(2 * len(domain), 20))
+
+    candidates = []
+    seen = set()
+
+    def evaluate(group, first_path):
+        runs = run_sweep(strategy_key, outcomes_config, [candidate['params'] for candidate in group],
+                         initial_capital, n, n_paths, seed, first_path=first_path)
+        for candidate, candidate_runs in zip(group, runs):
+            candidate['runs'].extend(candidate_runs)
+            candidate['summary'] = summarize_runs(candidate['runs'])
+            candidate['score'] = score(candidate['summary'], objective, sense, constraint)
+
+    def submit(points, round_index):
+        group = []
+        for point in points:
+            params = {**base_params, **decode(domain, point)}
+            key = tuple(sorted(params.items()))
+            if key in seen:
+                continue  # Paramètres entiers : plusieurs points peuvent donner le même candidat
+            seen.add(key)
+            group.append({'params': params, 'point': point, 'round': round_index, 'runs': []})
+        if group:
+            evaluate(group, 0)
+            candidates.extend(group)
+
+        # Bruit : un bloc de chemins de plus pour les meilleurs candidats non encore confirmés
+        ranked = sorted(candidates, key=lambda candidate: candidate['score'], reverse=True)
+        promising = [c for c in ranked[:reevaluate] if len(c['runs']) < max_blocks * n_paths]
+        by_runs = {}
+        for candidate in promising:
+            by_runs.setdefault(len(candidate['runs']), []).append(candidate)
+        for first_path, group in by_runs.items():
+            evaluate(group, first_path)
+
+    submit(halton_points(n_initial, len(domain), rng), 0)
+    for round_index in range(1, rounds + 1):
+        observations = sorted(((c['point'], c['score']) for c in candidates), key=lambda o: o[1], reverse=True)
+        submit(propose(observations, batch_size, rng), round_index)
+
+    # Recommandation : meilleur score parmi les candidats réévalués au moins une fois
+    confirmed = [c for c in candidates if len(c['runs']) > n_paths] or candidates
+    best = max(confirmed, key=lambda candidate: candidate['score'])
+    return {
+        'best': best,
+        'candidates': candidates,
+        'simulations': sum(len(candidate['runs']) for candidate in candidates)
+    }
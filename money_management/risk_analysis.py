@@ -0,0 +1,664 @@
+"""
+Probabilités d'événements rares sur le capital (ruine du compte, drawdowns)
+
+Le crash du compte (capital < 1€) est trop rare pour être mesuré par Monte
+Carlo direct avec une stratégie raisonnable. L'estimateur par échantillonnage
+préférentiel tire les outcomes sous une loi inclinée vers les pertes
+(inclinaison exponentielle de la table des outcomes), puis repondère chaque
+chemin par son rapport de vraisemblance : l'estimation reste sans biais pour
+n'importe quelle fonction de stratégie, seule sa variance dépend du choix de
+l'inclinaison. Les stratégies qui ont un noyau incrémental (sweep.SWEEP_KERNELS)
+passent par ce noyau : coût par trade constant au lieu du parcours de
+l'historique de run_simulation à chaque trade.
+
+À risque fixe, les probabilités de drawdown et de crash se calculent sans
+simulation : programmation dynamique sur une grille de log(capital / pic)
+(ou de log(capital)) avec barrière absorbante. Le risque fixe optimal au
+sens de la croissance logarithmique (Kelly) se résout par bissection.
+"""
+
+import math
+import random
+from operator import mul
+
+from .simulator import _get_path_pool, fixed_risk_log10_growth, run_simulation
+from .strategies import STRATEGIES
+from .sweep import SWEEP_KERNELS
+
+
+# Échantillonnage préférentiel : chemins par défaut, chemins pilotes par essai
+# d'inclinaison et part minimale de chemins ruinés visée par les pilotes
+RUIN_PATHS = 1000
+RUIN_PILOT_PATHS = 100
+RUIN_PILOT_HIT_RATE = 0.2
+RUIN_PILOT_STEPS = 6
+
+# Grille de la programmation dynamique : cellules par pas de log-capital du plus
+# petit outcome, et nombre maximal de cellules jusqu'à la barrière
+DP_CELLS_PER_STEP = 1
+DP_MAX_CELLS = 600
+
+# Erreur absolue tolérée sur la probabilité de crash (masse haute négligée)
+CRASH_TOLERANCE = 1e-15
+
+# Seuils de drawdown (%) et risques (%) par défaut des courbes analytiques
+DRAWDOWN_THRESHOLDS = [10, 20, 30, 40, 50, 60, 75, 90]
+RISK_GRID = [0.5, 1, 1.5, 2, 3, 5]
+
+# Fractions du risque de Kelly évaluées autour de l'optimum, et seuils de
+# drawdown (%) de la courbe croissance / drawdown
+KELLY_FRACTIONS = [0.25, 0.5, 0.75, 1, 1.5, 2]
+KELLY_DRAWDOWN_THRESHOLDS = [20, 50]
+
+
+def _log_sum_exp(values):
+    top = max(values)
+    return top + math.log(sum(math.exp(value - top) for value in values))
+
+
+class OutcomeTilt:
+    """
+    Loi des outcomes inclinée exponentiellement : q_k ∝ p_k * exp(theta * z_k)
+
+    z_k = ln(1 + r * x_k) est la croissance logarithmique d'un trade à risque
+    fixe r (risque de référence) : avec theta < 0 les pertes deviennent plus
+    probables. Le rapport de vraisemblance d'un outcome vaut
+    p_k / q_k = exp(psi(theta) - theta * z_k), psi étant la log-fonction
+    génératrice des moments de z.
+
+    Args:
+        outcomes_config: Dict des outcomes et de leurs poids
+        risk_percent: Risque de référence (%) définissant z
+    """
+
+    def __init__(self, outcomes_config, risk_percent):
+        total = sum(outcomes_config.values())
+        self.outcomes = [float(outcome) for outcome in outcomes_config]
+        self.probabilities = [weight / total for weight in outcomes_config.values()]
+
+        # Le risque de référence ne doit pas ruiner le compte en un trade (z fini)
+        worst = min(self.outcomes)
+        risk = max(0.1, min(20, risk_percent))
+        if worst < 0:
+            risk = min(risk, 99 / -worst)
+        self.risk_percent = risk
+        self.growths = [math.log(1 + risk / 100 * outcome) for outcome in self.outcomes]
+
+    def psi(self, theta):
+        """Log-fonction génératrice des moments de z sous la loi d'origine"""
+        return _log_sum_exp([math.log(p) + theta * z for p, z in zip(self.probabilities, self.growths)])
+
+    def tilted(self, theta):
+        """Probabilités inclinées q_k"""
+        psi = self.psi(theta)
+        return [p * math.exp(theta * z - psi) for p, z in zip(self.probabilities, self.growths)]
+
+    def drift(self, theta):
+        """Espérance de z sous la loi inclinée (dérivée de psi, croissante en theta)"""
+        return sum(q * z for q, z in zip(self.tilted(theta), self.growths))
+
+    def _bisect(self, function, target, low, high=0.0, iterations=100):
+        """Racine de function(theta) = target sur [low, high], function croissante"""
+        for _ in range(iterations):
+            middle = (low + high) / 2
+            if function(middle) < target:
+                low = middle
+            else:
+                high = middle
+        return (low + high) / 2
+
+    def _lower_bound(self, function, target, limit=1e4):
+        """theta < 0 tel que function(theta) <= target (None si hors d'atteinte)"""
+        low = -1.0
+        while function(low) > target:
+            low *= 2
+            if low < -limit:
+                return None
+        return low
+
+    def lundberg_theta(self):
+        """
+        Racine négative de psi(theta) = 0 (exposant de Lundberg)
+
+        Inclinaison asymptotiquement optimale de la ruine sur horizon infini
+        pour la stratégie à risque fixe : sous la loi inclinée la dérive
+        devient négative. Retourne 0 si la dérive d'origine l'est déjà.
+        """
+        if self.drift(0.0) <= 0 or min(self.growths) >= 0:
+            return 0.0
+        # psi est convexe, nulle en 0 et de pente positive : psi > 0 à gauche de la racine
+        low = self._lower_bound(lambda theta: -self.psi(theta), 0.0)
+        if low is None:
+            return 0.0
+        return self._bisect(lambda theta: -self.psi(theta), 0.0, low, -1e-9)
+
+    def horizon_theta(self, log_distance, n):
+        """
+        theta tel que la dérive inclinée atteigne la ruine en n trades
+
+        log_distance = ln(capital initial) : il faut perdre au moins ce
+        logarithme en n trades pour passer sous 1€. Une marge de 25% place
+        la ruine avant l'horizon pour la plupart des chemins inclinés.
+        """
+        target = -1.25 * log_distance / n
+        if self.drift(0.0) <= target:
+            return 0.0
+        low = self._lower_bound(self.drift, target)
+        if low is None:
+            # Même les pires outcomes ne suffisent pas : inclinaison maximale
+            return -1e4
+        return self._bisect(self.drift, target, low)
+
+    def log_likelihood_ratios(self, theta):
+        """ln(p_k / q_k) de chaque outcome, indexé par sa valeur"""
+        psi = self.psi(theta)
+        return {outcome: psi - theta * z for outcome, z in zip(self.outcomes, self.growths)}
+
+
+def _path_kernel(strategy_function):
+    """Noyau incrémental de la stratégie (sweep.SWEEP_KERNELS), None si elle n'en a pas"""
+    for key, info in STRATEGIES.items():
+        if info['function'] is strategy_function:
+            return SWEEP_KERNELS.get(key)
+    return None
+
+
+def _tilted_run(strategy_function, kernel, tilt, theta, initial_capital, params, n, rng):
+    """Un chemin sous la loi inclinée : (ruiné, log du rapport de vraisemblance, trades)"""
+    weights = tilt.tilted(theta)
+    log_ratios = tilt.log_likelihood_ratios(theta)
+    outcomes = rng.choices(tilt.outcomes, weights=weights, k=n)
+    if kernel is not None:
+        capital, _, trades, crashed = kernel(outcomes, float(initial_capital), **params)
+        ruined = crashed or capital < 1
+    else:
+        result = run_simulation(strategy_function, None, initial_capital, dict(params), n, outcomes=outcomes)
+        trades = result['trades_executed']
+        ruined = result['account_crashed'] or result['log10_capital_final'] < 0
+
+    # Seuls les outcomes consommés avant l'arrêt entrent dans le rapport de vraisemblance
+    return ruined, sum(log_ratios[outcome] for outcome in outcomes[:trades]), trades
+
+
+def estimate_ruin_probability(strategy_function, outcomes_config, initial_capital=1000, params=None, n=1000,
+                              n_paths=RUIN_PATHS, risk_percent=1.0, theta=None, seed=None):
+    """
+    Probabilité que le compte passe sous 1€ en n trades, par échantillonnage préférentiel
+
+    Sans theta imposé, l'inclinaison de départ est la plus forte de l'exposant
+    de Lundberg et de celle qui amène la ruine avant l'horizon (stratégie à
+    risque fixe risk_percent). Les stratégies qui réduisent leur risque en
+    drawdown s'écartent de cette référence : des chemins pilotes renforcent
+    alors l'inclinaison jusqu'à obtenir assez de chemins ruinés. Les pilotes
+    ne servent qu'à choisir theta et sont exclus de l'estimation.
+
+    Coût : (n_paths + jusqu'à RUIN_PILOT_STEPS * RUIN_PILOT_PATHS) chemins de n
+    trades. Avec un noyau de sweep.SWEEP_KERNELS le coût d'un chemin est
+    linéaire en n ; les autres stratégies passent par run_simulation, dont les
+    stratégies qui reparcourent l'historique sont quadratiques en n (compter
+    plusieurs secondes pour 1000 chemins de 1000 trades).
+
+    Args:
+        strategy_function: Fonction de stratégie (comme run_simulation)
+        outcomes_config: Dict des outcomes et de leurs poids
+        initial_capital: Capital de départ
+        params: Paramètres de la stratégie
+        n: Horizon en nombre de trades
+        n_paths: Nombre de chemins de l'estimation
+        risk_percent: Risque de référence de l'inclinaison (ex: base_risk de la stratégie)
+        theta: Inclinaison imposée (<= 0), sinon choisie automatiquement
+        seed: Graine (résultats reproductibles si fournie)
+
+    Returns:
+        dict: {
+            'probability': float,  # 0.0 si inférieure au plus petit float
+            'log10_probability': float ou None,
+            'std_error': float,
+            'relative_error': float ou None,  # écart-type / estimation
+            'confidence_interval': [float, float],  # 95%, approximation normale
+            'hits': int,  # chemins ruinés sous la loi inclinée
+            'n_paths': int,
+            'theta': float,
+            'tilt_risk': float,
+            'tilted_distribution': dict,  # outcome -> probabilité inclinée
+            'mean_trades_to_ruin': float ou None,  # sous la loi inclinée
+            'variance_reduction': float ou None  # par rapport au Monte Carlo direct
+        }
+    """
+    if params is None:
+        params = {}
+    rng = random.Random(seed)
+    tilt = OutcomeTilt(outcomes_config, risk_percent)
+    kernel = _path_kernel(strategy_function)
+
+    if initial_capital < 1:
+        # Capital initial déjà sous 1€ : ruine certaine
+        result = _ruin_result([], n_paths, 0.0, tilt, [])
+        result.update(probability=1.0, log10_probability=0.0, confidence_interval=[1.0, 1.0])
+        return result
+    if min(tilt.outcomes) >= 0:
+        # Aucune perte possible : le capital ne peut pas baisser
+        return _ruin_result([], n_paths, 0.0, tilt, [])
+
+    if theta is None:
+        theta = min(tilt.lundberg_theta(), tilt.horizon_theta(math.log(initial_capital), n))
+        pilot_paths = min(RUIN_PILOT_PATHS, n_paths)
+        for _ in range(RUIN_PILOT_STEPS):
+            hits = sum(
+                _tilted_run(strategy_function, kernel, tilt, theta, initial_capital, params, n, rng)[0]
+                for _ in range(pilot_paths)
+            )
+            if hits >= RUIN_PILOT_HIT_RATE * pilot_paths:
+                break
+            theta = theta * 1.5 if theta < 0 else -0.5 / max(abs(z) for z in tilt.growths)
+
+    log_weights = []
+    trades_to_ruin = []
+    for _ in range(n_paths):
+        ruined, log_weight, trades = _tilted_run(strategy_function, kernel, tilt, theta, initial_capital, params, n,
+                                                 rng)
+        if ruined:
+            log_weights.append(log_weight)
+            trades_to_ruin.append(trades)
+
+    return _ruin_result(log_weights, n_paths, theta, tilt, trades_to_ruin)
+
+
+def _ruin_result(log_weights, n_paths, theta, tilt, trades_to_ruin):
+    """Estimation, erreur relative et intervalle de confiance à partir des log-poids des chemins ruinés"""
+    result = {
+        'probability': 0.0,
+        'log10_probability': None,
+        'std_error': 0.0,
+        'relative_error': None,
+        'confidence_interval': [0.0, 0.0],
+        'hits': len(log_weights),
+        'n_paths': n_paths,
+        'theta': round(theta, 6),
+        'tilt_risk': tilt.risk_percent,
+        'tilted_distribution': {
+            str(outcome): round(q, 6) for outcome, q in zip(tilt.outcomes, tilt.tilted(theta))
+        },
+        'mean_trades_to_ruin': round(sum(trades_to_ruin) / len(trades_to_ruin), 1) if trades_to_ruin else None,
+        'variance_reduction': None
+    }
+    if not log_weights:
+        return result
+
+    # Moments de l'estimateur en domaine logarithmique (probabilités de 1e-300 et moins)
+    log_mean = _log_sum_exp(log_weights) - math.log(n_paths)
+    log_second = _log_sum_exp([2 * w for w in log_weights]) - math.log(n_paths)
+    dispersion = max(0.0, math.exp(min(log_second - 2 * log_mean, 700)) - 1)
+
+    # Les poids d'un échantillon fini peuvent dépasser 1 : une probabilité reste bornée
+    probability = min(1.0, math.exp(log_mean)) if log_mean > -745 else 0.0
+    relative_error = math.sqrt(dispersion / n_paths)
+    std_error = probability * relative_error
+    result.update(
+        probability=probability,
+        log10_probability=round(min(0.0, log_mean) / math.log(10), 4),
+        std_error=std_error,
+        relative_error=round(relative_error, 4),
+        confidence_interval=[max(0.0, probability - 1.96 * std_error), min(1.0, probability + 1.96 * std_error)],
+    )
+
+    # Variance du Monte Carlo direct p(1 - p) / N contre p² * dispersion / N
+    if dispersion > 0:
+        log10_factor = (math.log1p(-min(math.exp(log_mean), 1 - 1e-16)) - log_mean - math.log(dispersion)) / math.log(10)
+        result['variance_reduction'] = round(10 ** log10_factor, 1) if log10_factor < 300 else None
+    return result
+
+
+def _fixed_risk_moves(outcomes_config, risk_percent, cell):
+    """
+    Déplacements d'un trade à risque fixe sur la grille, en cellules de log-capital
+
+    Un déplacement positif est une perte. Une croissance qui tombe entre deux
+    cellules est répartie linéairement sur les deux (déplacement moyen exact).
+    Un outcome qui ruine le compte en un trade a un déplacement infini.
+
+    Returns:
+        list: [(déplacement, probabilité)] triée par déplacement
+    """
+    total = sum(outcomes_config.values())
+    moves = {}
+    for outcome, weight in outcomes_config.items():
+        probability = weight / total
+        growth = 1 + risk_percent / 100 * float(outcome)
+        if growth <= 0:
+            moves[math.inf] = moves.get(math.inf, 0.0) + probability
+            continue
+        position = -math.log(growth) / cell
+        low = math.floor(position)
+        fraction = position - low
+        moves[low] = moves.get(low, 0.0) + probability * (1 - fraction)
+        if fraction:
+            moves[low + 1] = moves.get(low + 1, 0.0) + probability * fraction
+    return sorted((move, probability) for move, probability in moves.items() if probability > 0)
+
+
+def _grid_cells(outcomes_config, risk_percent, depth):
+    """
+    Nombre de cellules jusqu'à la barrière (située à depth en log-capital)
+
+    Une cellule par plus petit pas de log-capital, dans la limite de la moitié
+    de DP_MAX_CELLS (la grille fine de l'extrapolation en a deux fois plus).
+    """
+    steps = [
+        abs(math.log(1 + risk_percent / 100 * float(outcome)))
+        for outcome in outcomes_config
+        if 1 + risk_percent / 100 * float(outcome) > 0 and float(outcome) != 0
+    ]
+    cell = min(steps) / DP_CELLS_PER_STEP if steps else depth
+    return max(1, min(math.ceil(depth / cell), DP_MAX_CELLS // 2))
+
+
+def _extrapolate(coarse, fine):
+    """
+    Extrapolation de Richardson (erreur de discrétisation d'ordre 1 en la cellule)
+
+    Faite sur le logarithme de la plus petite des deux probabilités p et 1 - p,
+    pour rester dans [0, 1] et garder la précision relative des queues.
+    """
+    if fine <= 0.5:
+        return fine * fine / coarse if coarse > 0 else fine
+    survival, coarse_survival = 1 - fine, 1 - coarse
+    return 1 - (survival * survival / coarse_survival if coarse_survival > 0 else survival)
+
+
+def _drawdown_hitting(moves, size, n):
+    """
+    Probabilité d'atteindre la barrière (size cellules sous le pic) en n trades
+
+    État : distance au plus haut en cellules, réfléchie en 0 (nouveau plus
+    haut), absorbée à partir de size. La masse absorbée est cumulée
+    directement (précise même pour des probabilités infimes).
+    """
+    inside = [(move, probability) for move, probability in moves if move < size]
+    jump = sum(probability for move, probability in moves if move >= size)
+    shifts = [move for move, _ in inside]
+    weights = [probability for _, probability in inside]
+    below = max(max(shifts, default=0), 0)
+    above = max(-min(shifts, default=0), 0)
+    padding_below, padding_above = [0.0] * below, [0.0] * above
+
+    mass = [0.0] * size
+    mass[0] = 1.0
+    absorbed = 0.0
+    for _ in range(n):
+        remaining = sum(mass)
+        if remaining < 1e-300:
+            break
+        absorbed += jump * remaining
+        reflected = 0.0
+        for move, probability in inside:
+            if move > 0:
+                absorbed += probability * sum(mass[size - move:])
+            elif move < 0:
+                # Nouveaux plus hauts : le drawdown repart de 0
+                reflected += probability * sum(mass[:-move])
+
+        # Cellule j : somme des masses venant de j - move, pondérées par leur probabilité
+        padded = padding_below + mass + padding_above
+        columns = [padded[below - move:below - move + size] for move in shifts]
+        mass = [sum(map(mul, weights, column)) for column in zip(*columns)]
+        mass[0] += reflected
+    return min(absorbed, 1.0)
+
+
+def _crash_hitting(moves, start, n, decay=0.0):
+    """
+    Probabilité de passer sous la barrière (capital < 1€) en n trades
+
+    État : hauteur au-dessus de la barrière en cellules (départ en start),
+    absorbée sous 0. La masse trop haute pour atteindre la barrière dans les
+    trades restants est retirée, ainsi que celle dont la contribution
+    possible au crash (bornée par masse * exp(decay * hauteur), inégalité de
+    Lundberg) est sous CRASH_TOLERANCE / n.
+
+    Returns:
+        tuple: (probabilité de crash, borne de la contribution de la masse sortie)
+    """
+    finite = [(move, probability) for move, probability in moves if move != math.inf]
+    jump = sum(probability for move, probability in moves if move == math.inf)
+    shifts = [move for move, _ in finite]
+    weights = [probability for _, probability in finite]
+    worst = max(max(shifts, default=0), 0)
+    rise = max(-min(shifts, default=0), 0)
+    padding_below, padding_above = [0.0] * rise, [0.0] * (rise + worst)
+    negligible = CRASH_TOLERANCE / n
+
+    mass = [0.0] * (start + 1)
+    mass[start] = 1.0
+    absorbed = 0.0
+    escaped = 0.0
+
+    for remaining in range(n, 0, -1):
+        size = len(mass)
+        absorbed += jump * sum(mass)
+        for move, probability in finite:
+            if move > 0:
+                absorbed += probability * sum(mass[:move])
+
+        # Hauteur h -> h - move : la cellule j reçoit les masses venant de j + move
+        padded = padding_below + mass + padding_above
+        columns = [padded[rise + move:rise + move + size + rise] for move in shifts]
+        new = [sum(map(mul, weights, column)) for column in zip(*columns)]
+
+        # Au-delà de (remaining - 1) * worst cellules le crash n'est plus atteignable ;
+        # la masse haute de contribution négligeable sort de la grille
+        del new[(remaining - 1) * worst:]
+        while new and new[-1] * math.exp(decay * (len(new) - 1)) < negligible:
+            escaped += new.pop() * math.exp(decay * len(new))
+        mass = new
+        if not mass:
+            break
+    return min(absorbed, 1.0), escaped
+
+
+def drawdown_risk_curves(outcomes_config, risks=None, thresholds=None, n=1000, initial_capital=1000):
+    """
+    Probabilités exactes de drawdown et de crash à risque fixe, sans simulation
+
+    Pour chaque risque, P(drawdown max >= x% en n trades) est calculée par
+    programmation dynamique sur la distance log(pic / capital), réfléchie aux
+    nouveaux plus hauts et absorbée à la barrière -ln(1 - x/100). La
+    probabilité de crash (capital < 1€) utilise log(capital), absorbé en 0.
+
+    Les deux grilles sont alignées sur la barrière ; la discrétisation est
+    corrigée par extrapolation de Richardson entre une grille et sa moitié.
+    La masse haute négligée par le calcul du crash est bornée par l'inégalité
+    de Lundberg (crash_error_bound, erreur maximale sur crash_probability).
+
+    Args:
+        outcomes_config: Dict des outcomes et de leurs poids
+        risks: Risques fixes (%) évalués (défaut: RISK_GRID)
+        thresholds: Seuils de drawdown (%) (défaut: DRAWDOWN_THRESHOLDS)
+        n: Horizon en nombre de trades
+        initial_capital: Capital de départ (distance à la barrière de crash)
+
+    Returns:
+        dict: {
+            'thresholds': list,
+            'risks': [{
+                'risk_percent': float,
+                'drawdown_probability': list,  # P(DD max >= x) par seuil
+                'max_drawdown_cdf': list,  # P(DD max < x) par seuil
+                'crash_probability': float,
+                'crash_error_bound': float,
+                'expected_log10_growth': float ou None  # sur n trades
+            }]
+        }
+    """
+    risks = [max(0.1, min(20, float(risk))) for risk in (RISK_GRID if risks is None else risks)]
+    thresholds = sorted(DRAWDOWN_THRESHOLDS if thresholds is None else thresholds)
+    jobs = [(outcomes_config, risk, thresholds, n, initial_capital) for risk in risks]
+
+    # Un risque par processus du pool partagé avec run_paths
+    curves = list(_get_path_pool().map(_risk_curve, *zip(*jobs))) if jobs else []
+    return {'thresholds': thresholds, 'risks': curves}
+
+
+def _risk_curve(outcomes_config, risk, thresholds, n, initial_capital):
+    """Courbe de drawdown et probabilité de crash d'un risque fixe (exécutée dans le pool)"""
+    drawdown = []
+    for threshold in thresholds:
+        if drawdown and drawdown[-1] == 0.0:
+            # Seuils croissants : au-delà d'une probabilité nulle, tout est nul
+            drawdown.append(0.0)
+            continue
+        depth = -math.log(1 - threshold / 100)
+        cells = _grid_cells(outcomes_config, risk, depth)
+        coarse = _drawdown_hitting(_fixed_risk_moves(outcomes_config, risk, depth / cells), cells, n)
+        if coarse >= 1 - 1e-12:
+            drawdown.append(1.0)
+            continue
+        fine = _drawdown_hitting(_fixed_risk_moves(outcomes_config, risk, depth / (2 * cells)), 2 * cells, n)
+        drawdown.append(_extrapolate(coarse, fine))
+
+    crash, bound = 1.0, 0.0
+    if initial_capital > 1:
+        crash, bound = _crash_curve(outcomes_config, risk, math.log(initial_capital), n)
+    growth = fixed_risk_log10_growth(outcomes_config, risk)
+    return {
+        'risk_percent': risk,
+        'drawdown_probability': drawdown,
+        'max_drawdown_cdf': [1 - probability for probability in drawdown],
+        'crash_probability': crash,
+        'crash_error_bound': bound,
+        'expected_log10_growth': round(growth * n, 6) if growth is not None else None
+    }
+
+
+def _crash_curve(outcomes_config, risk, start_depth, n):
+    """Probabilité de crash extrapolée et borne de l'erreur due à la masse sortie de la grille"""
+    # Lundberg : depuis la hauteur h (en log), P(crash) <= exp(theta * h), theta < 0 si la dérive
+    # est positive. Sinon, ou si un outcome ruine en un trade, la masse sortie borne seule l'erreur
+    theta = 0.0
+    if all(1 + risk / 100 * float(outcome) > 0 for outcome in outcomes_config):
+        theta = OutcomeTilt(outcomes_config, risk).lundberg_theta()
+
+    cells = _grid_cells(outcomes_config, risk, start_depth)
+    coarse, _ = _crash_hitting(
+        _fixed_risk_moves(outcomes_config, risk, start_depth / cells), cells, n, theta * start_depth / cells
+    )
+    fine, bound = _crash_hitting(
+        _fixed_risk_moves(outcomes_config, risk, start_depth / (2 * cells)), 2 * cells, n,
+        theta * start_depth / (2 * cells)
+    )
+    return _extrapolate(coarse, fine), bound
+
+
+def _outcome_probabilities(outcomes_config):
+    total = sum(outcomes_config.values())
+    return [(float(outcome), weight / total) for outcome, weight in outcomes_config.items()]
+
+
+def log_growth(outcomes_config, risk_percent):
+    """
+    Croissance logarithmique espérée par trade, E[ln(1 + f * R)] avec f = risk_percent / 100
+
+    Sans bornage du risque (contrairement au simulateur). Vaut -inf si un
+    outcome ruine le compte en un trade.
+    """
+    fraction = risk_percent / 100
+    growth = 0.0
+    for outcome, probability in _outcome_probabilities(outcomes_config):
+        if 1 + fraction * outcome <= 0:
+            return float('-inf')
+        growth += probability * math.log1p(fraction * outcome)
+    return growth
+
+
+def kelly_risk(outcomes_config, tolerance=1e-12):
+    """
+    Risque fixe (%) maximisant la croissance logarithmique espérée (critère de Kelly)
+
+    g(f) = E[ln(1 + f * R)] est concave : l'optimum annule
+    g'(f) = E[R / (1 + f * R)], trouvé par bissection sur [0, 1 / |pire perte|[.
+
+    Returns:
+        float: 0.0 si l'espérance en R n'est pas positive (ne pas trader),
+               None si aucun outcome n'est une perte (pas d'optimum fini)
+    """
+    outcomes = _outcome_probabilities(outcomes_config)
+    worst = min(outcome for outcome, _ in outcomes)
+    if sum(probability * outcome for outcome, probability in outcomes) <= 0:
+        return 0.0
+    if worst >= 0:
+        return None
+
+    def slope(fraction):
+        return sum(probability * outcome / (1 + fraction * outcome) for outcome, probability in outcomes)
+
+    low, high = 0.0, 1 / -worst
+    while high - low > tolerance:
+        middle = (low + high) / 2
+        if slope(middle) > 0:
+            low = middle
+        else:
+            high = middle
+    return (low + high) / 2 * 100
+
+
+def kelly_profile(outcomes_config, fractions=None, risks=None, n=1000, thresholds=None, initial_capital=1000,
+                  drawdown=True):
+    """
+    Optimum de Kelly, ses fractions voisines et la courbe croissance / drawdown
+
+    Args:
+        outcomes_config: Dict des outcomes (R) et de leurs poids
+        fractions: Fractions du risque de Kelly évaluées (défaut: KELLY_FRACTIONS)
+        risks: Risques (%) de la courbe (défaut: le risque de chaque fraction)
+        n: Horizon (trades) des probabilités de drawdown et de crash
+        thresholds: Seuils de drawdown (%) de la courbe (défaut: KELLY_DRAWDOWN_THRESHOLDS)
+        initial_capital: Capital de départ (distance au crash)
+        drawdown: Calculer les probabilités de drawdown et de crash de la courbe
+            (programmation dynamique, quelques secondes) ; sinon croissance seule
+
+    Returns:
+        dict: {
+            'kelly': {'risk_percent', 'log10_growth_per_trade', 'growth_per_trade_pct', 'exceeds_risk_cap'},
+            'fractional_kelly': [{'fraction', 'risk_percent', 'log10_growth_per_trade', 'growth_ratio'}],
+            'curve': voir drawdown_risk_curves, avec la croissance par trade de chaque risque
+        }
+    """
+    fractions = KELLY_FRACTIONS if fractions is None else fractions
+    thresholds = KELLY_DRAWDOWN_THRESHOLDS if thresholds is None else thresholds
+    optimum = kelly_risk(outcomes_config)
+
+    def per_trade(risk):
+        growth = log_growth(outcomes_config, risk)
+        return {
+            'log10_growth_per_trade': growth / math.log(10) if math.isfinite(growth) else None,
+            'growth_per_trade_pct': math.expm1(growth) * 100 if math.isfinite(growth) else -100.0
+        }
+
+    kelly = {'risk_percent': optimum, 'log10_growth_per_trade': None, 'growth_per_trade_pct': None,
+             'exceeds_risk_cap': optimum is None or optimum > 20}
+    neighbours = []
+    if optimum is not None:
+        kelly.update(per_trade(optimum))
+        best = log_growth(outcomes_config, optimum)
+        for fraction in fractions:
+            risk = optimum * fraction
+            growth = log_growth(outcomes_config, risk)
+            neighbours.append({
+                'fraction': fraction,
+                'risk_percent': risk,
+                'log10_growth_per_trade': growth / math.log(10) if math.isfinite(growth) else None,
+                # Part de la croissance optimale conservée (négative au-delà de 2x Kelly environ)
+                'growth_ratio': growth / best if best > 0 and math.isfinite(growth) else None
+            })
+
+    # Courbe sur les risques acceptés par le simulateur (0.1% à 20%)
+    if risks is None:
+        risks = sorted({round(row['risk_percent'], 4) for row in neighbours if 0.1 <= row['risk_percent'] <= 20})
+    if drawdown:
+        curve = drawdown_risk_curves(outcomes_config, risks, thresholds, n, initial_capital)
+    else:
+        curve = {'thresholds': [], 'risks': [{'risk_percent': max(0.1, min(20, float(risk)))} for risk in risks]}
+    for row in curve['risks']:
+        row.update(per_trade(row['risk_percent']))
+
+    return {'kelly': kelly, 'fractional_kelly': neighbours, 'curve': curve}
@@ -0,0 +1,213 @@
+"""
+Analyse de sensibilité globale (indices de Sobol) des paramètres d'une stratégie
+
+Plan de Saltelli : deux matrices A et B de N points du domaine (suite de
+Halton brouillée en dimension 2d), et pour chaque paramètre i la matrice AB_i
+(A dont la colonne i vient de B), soit N (d + 2) jeux de paramètres évalués
+sur les mêmes chemins par sweep.run_sweep.
+
+Pour chaque métrique du résumé des runs :
+- indice de premier ordre S_i = moyenne(f(B) (f(AB_i) - f(A))) / V (Saltelli 2010)
+- indice total ST_i = moyenne((f(A) - f(AB_i))^2) / 2V (Jansen)
+avec V la variance de f sur A et B. Un paramètre d'indice total faible pour
+toutes les métriques peut être figé. Intervalles de confiance par bootstrap
+sur les N lignes du plan.
+
+L'analyse tourne en arrière-plan (job suivi par son identifiant, registre
+géré comme celui de la compaction de la base : voir maintenance).
+"""
+
+import random
+import statistics
+import threading
+import uuid
+
+from django.utils import timezone
+
+from .analytics import exact_quantile
+from .maintenance import job_snapshot, prune_jobs, update_job
+from .optimizer import decode
+from .sampling import halton_points
+from .sweep import SWEEP_METRICS, run_sweep, summarize_runs
+
+
+# Rééchantillonnages bootstrap des intervalles de confiance
+SOBOL_BOOTSTRAP = 200
+
+# Indice total (borne haute de l'IC) en dessous duquel un paramètre est jugé négligeable
+NEGLIGIBLE_TOTAL_EFFECT = 0.05
+
+# Jeux de paramètres évalués par appel à run_sweep (avancement du job)
+SENSITIVITY_CHUNK = 64
+
+# Jobs d'analyse : job_id -> statut et résultat (lu par l'endpoint de suivi)
+SENSITIVITY_JOBS = {}
+_sensitivity_lock = threading.Lock()
+
+
+def sensitivity_job(job_id):
+    """Statut d'une analyse (copie)"""
+    return job_snapshot(SENSITIVITY_JOBS, _sensitivity_lock, job_id)
+
+
+def saltelli_design(n, dimension, rng):
+    """
+    Plan de Saltelli dans [0, 1]^dimension
+
+    Returns:
+        list: n (dimension + 2) points, dans l'ordre A, B, AB_1, ..., AB_d
+    """
+    points = halton_points(n, 2 * dimension, rng)
+    a = [point[:dimension] for point in points]
+    b = [point[dimension:] for point in points]
+    design = a + b
+    for i in range(dimension):
+        design.extend(row_a[:i] + [row_b[i]] + row_a[i + 1:] for row_a, row_b in zip(a, b))
+    return design
+
+
+def sobol_indices(f_a, f_b, f_ab, rows=None):
+    """
+    Indices de premier ordre et totaux
+
+    Args:
+        f_a, f_b: Valeurs de la métrique sur A et B
+        f_ab: Pour chaque paramètre, valeurs sur AB_i
+        rows: Lignes du plan utilisées (bootstrap), toutes par défaut
+
+    Returns:
+        tuple: (liste des S_i, liste des ST_i), ou None si la métrique ne varie pas
+    """
+    if rows is None:
+        rows = range(len(f_a))
+    a = [f_a[j] for j in rows]
+    b = [f_b[j] for j in rows]
+    variance = statistics.pvariance(a + b)
+    if not variance:
+        return None
+
+    first, total = [], []
+    for column in f_ab:
+        ab = [column[j] for j in rows]
+        first.append(statistics.fmean([y_b * (y_ab - y_a) for y_a, y_b, y_ab in zip(a, b, ab)]) / variance)
+        total.append(statistics.fmean([(y_a - y_ab) ** 2 for y_a, y_ab in zip(a, ab)]) / (2 * variance))
+    return first, total
+
+
+def _metric_indices(names, f_a, f_b, f_ab, rng):
+    """Indices d'une métrique par paramètre, avec IC bootstrap à 95%"""
+    estimate = sobol_indices(f_a, f_b, f_ab)
+    if estimate is None:
+        return None
+
+    n = len(f_a)
+    samples = []
+    for _ in range(SOBOL_BOOTSTRAP):
+        resampled = sobol_indices(f_a, f_b, f_ab, [rng.randrange(n) for _ in range(n)])
+        if resampled is not None:
+            samples.append(resampled)
+
+    indices = {}
+    for i, name in enumerate(names):
+        entry = {'first_order': round(estimate[0][i], 4), 'total_effect': round(estimate[1][i], 4)}
+        for key, position in (('first_order', 0), ('total_effect', 1)):
+            values = sorted(sample[position][i] for sample in samples)
+            entry[f'{key}_ci'] = [round(exact_quantile(values, 0.025), 4), round(exact_quantile(values, 0.975), 4)] if values else None
+        indices[name] = entry
+    return indices
+
+
+def _analyze(job, strategy_key, outcomes_config, domain, base_params, n, n_paths, num_trades, initial_capital, seed):
+    """Corps du job : évaluation du plan puis indices de chaque métrique"""
+    try:
+        update_job(job, _sensitivity_lock, status='running')
+        rng = random.Random(f'{seed}:sobol')
+        names = list(domain)
+        design = saltelli_design(n, len(names), rng)
+        param_sets = [{**base_params, **decode(domain, point)} for point in design]
+
+        summaries = []
+        for start in range(0, len(param_sets), SENSITIVITY_CHUNK):
+            chunk = param_sets[start:start + SENSITIVITY_CHUNK]
+            runs = run_sweep(strategy_key, outcomes_config, chunk, initial_capital, num_trades, n_paths, seed)
+            summaries.extend(summarize_runs(cell_runs) for cell_runs in runs)
+            update_job(job, _sensitivity_lock, completed_evaluations=len(summaries))
+
+        indices = {}
+        for metric in SWEEP_METRICS:
+            values = [summary[metric] for summary in summaries]
+            f_ab = [values[(2 + i) * n:(3 + i) * n] for i in range(len(names))]
+            indices[metric] = _metric_indices(names, values[:n], values[n:2 * n], f_ab, rng)
+
+        # Paramètres négligeables : borne haute de l'IC de l'indice total faible
+        # pour toutes les métriques qui varient (prudent quand N est petit)
+        analyzed = [metric_indices for metric_indices in indices.values() if metric_indices]
+        max_total = {
+            name: max((metric_indices[name]['total_effect'] for metric_indices in analyzed), default=0.0)
+            for name in names
+        }
+        upper_total = {
+            name: max(
+                ((metric_indices[name]['total_effect_ci'] or [0, metric_indices[name]['total_effect']])[1]
+                 for metric_indices in analyzed),
+                default=0.0
+            )
+            for name in names
+        }
+        update_job(job, _sensitivity_lock, status='completed', result={
+            'indices': indices,
+            'ranking': sorted(names, key=lambda name: max_total[name], reverse=True),
+            'max_total_effect': max_total,
+            'negligible': [name for name in names if upper_total[name] < NEGLIGIBLE_TOTAL_EFFECT]
+        })
+    except Exception as e:
+        update_job(job, _sensitivity_lock, status='failed', error=str(e))
+    finally:
+        update_job(job, _sensitivity_lock, finished_at=timezone.now().isoformat())
+
+
+def start_sensitivity(strategy_key, outcomes_config, domain, base_params, n=32, n_paths=50, num_trades=1000,
+                      initial_capital=10000, seed=0):
+    """
+    Lance une analyse de sensibilité en arrière-plan
+
+    Args:
+        strategy_key: Clé de la stratégie dans STRATEGIES
+        outcomes_config: Dict des outcomes et de leurs poids
+        domain: Domaine des paramètres analysés (voir optimizer.parameter_space)
+        base_params: Paramètres complets de la stratégie (les autres restent fixes)
+        n: Nombre de lignes N du plan (N (d + 2) évaluations)
+        n_paths: Chemins par évaluation (communs à toutes les évaluations)
+        num_trades, initial_capital: comme run_sweep
+        seed: Graine (plan et chemins)
+
+    Returns:
+        dict: Statut du job (copie)
+    """
+    evaluations = n * (len(domain) + 2)
+    job = {
+        'job_id': str(uuid.uuid4()),
+        'status': 'pending',
+        'strategy_key': strategy_key,
+        'parameters': list(domain),
+        'n_samples': n,
+        'evaluations': evaluations,
+        'completed_evaluations': 0,
+        'simulations': evaluations * n_paths,
+        'seed': seed,
+        'started_at': timezone.now().isoformat(),
+        'finished_at': None,
+        'result': None,
+        'error': None,
+    }
+    with _sensitivity_lock:
+        prune_jobs(SENSITIVITY_JOBS)
+        SENSITIVITY_JOBS[job['job_id']] = job
+        snapshot = dict(job)
+
+    threading.Thread(
+        target=_analyze,
+        args=(job, strategy_key, outcomes_config, domain, base_params, n, n_paths, num_trades, initial_capital, seed),
+        daemon=True
+    ).start()
+    return snapshot
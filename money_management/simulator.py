@@ -2,11 +2,65 @@
 Simulateur générique pour exécuter 1000 trades avec une stratégie de MM
 """
 
+import math
+import os
 import random
+import sys
+from concurrent.futures import ProcessPoolExecutor
 from decimal import Decimal
 
 
-def run_simulation(strategy_function, outcomes_config, initial_capital=1000, params=None, n=1000):
+# Renormalisation du capital pour éviter l'overflow des floats sur les longs horizons :
+# au-delà de RESCALE_THRESHOLD, les montants sont divisés par 10**RESCALE_DIGITS
+RESCALE_THRESHOLD = 1e200
+RESCALE_DIGITS = 200
+
+# Plancher des capitaux de l'historique après renormalisation : le rapport entre
+# le capital courant (< RESCALE_THRESHOLD) et un capital passé reste < 1e300
+HISTORY_FLOOR = RESCALE_THRESHOLD / 1e300
+
+
+def capital_from_log10(log10_value):
+    """Convertit un log10(capital) en float (inf si non représentable)"""
+    return 10 ** log10_value if log10_value < 308 else float('inf')
+
+
+def scale_capital(value, capital_exponent):
+    """Montant en unités de 10**capital_exponent converti en float (plafonné au plus grand float)"""
+    if not value or not capital_exponent:
+        return value
+    magnitude = capital_from_log10(math.log10(abs(value)) + capital_exponent)
+    return math.copysign(min(magnitude, sys.float_info.max), value)
+
+
+def draw_outcomes(outcomes_config, n, rng=None):
+    """Tire n outcomes iid selon les poids de outcomes_config"""
+    outcomes_list = []
+    for outcome, probability in outcomes_config.items():
+        outcomes_list.extend([float(outcome)] * probability)
+    return (rng or random).choices(outcomes_list, k=n)
+
+
+def fixed_risk_log10_growth(outcomes_config, risk_percent):
+    """
+    Espérance exacte de log10(capital_après / capital_avant) par trade à risque fixe
+    
+    Returns:
+        float ou None si un outcome ruine le compte en un trade (log non défini)
+    """
+    risk = max(0.1, min(20, risk_percent)) / 100
+    total = sum(outcomes_config.values())
+    expected = 0.0
+    for outcome, probability in outcomes_config.items():
+        growth = 1 + risk * float(outcome)
+        if growth <= 0:
+            return None
+        expected += probability / total * math.log10(growth)
+    return expected
+
+
+def run_simulation(strategy_function, outcomes_config, initial_capital=1000, params=None, n=1000, rng=None,
+                   outcomes=None):
     """
     Exécute n trades en utilisant une stratégie de Money Management
     
@@ -16,26 +70,41 @@ def run_simulation(strategy_function, outcomes_config, initial_capital=1000, par
         initial_capital: Capital de départ (défaut: 1000€)
         params: Paramètres pour la stratégie (dict)
         n: Nombre de trades à exécuter (défaut: 1000)
+        rng: Générateur random.Random (défaut: module random)
+        outcomes: Suite de n outcomes imposée (voir sampling.OutcomeSampler), sinon tirage iid
+    
+    Le capital est suivi en domaine logarithmique (log10) en plus de sa valeur
+    courante : aucun overflow, même sur 10^6 trades avec une stratégie à
+    intérêts composés. Quand le capital dépasse RESCALE_THRESHOLD, le capital
+    courant et les montants de l'historique sont divisés par 10**RESCALE_DIGITS
+    et capital_exponent est incrémenté ; les stratégies, qui ne travaillent que
+    sur des ratios de capital, ne voient pas la différence. Un trade dont le
+    capital passerait sous HISTORY_FLOOR est ramené au plancher (tous ses
+    montants par le même facteur, ses ratios internes sont conservés) : les
+    ratios entre capitaux restent finis au lieu de tomber à 0 ou inf. L'equity
+    curve est en capital réel, plafonné au plus grand float.
     
     Returns:
         dict: {
-            'capital_final': float,
+            'capital_final': float,  # inf si non représentable (voir log10)
             'drawdown_max': float,  # en %
             'moyenne': float,  # gain moyen par trade
             'ecart_type': float,
-            'equity_curve': list,  # historique du capital
+            'equity_curve': list,  # historique du capital réel (plafonné au plus grand float)
             'history': list,  # liste des trades détaillés
             'trades_executed': int,
-            'account_crashed': bool
+            'account_crashed': bool,
+            'log10_capital_final': float,
+            'log10_capital_max': float,
+            'capital_exponent': int  # montants de history en unités de 10**capital_exponent
         }
     """
     if params is None:
         params = {}
     
-    # Préparer la liste pondérée des outcomes
-    outcomes_list = []
-    for outcome, probability in outcomes_config.items():
-        outcomes_list.extend([float(outcome)] * probability)
+    # Tirage de tous les outcomes en un seul appel (bien plus rapide qu'un choice par trade)
+    if outcomes is None:
+        outcomes = draw_outcomes(outcomes_config, n, rng)
     
     # Initialisation
     current_capital = float(initial_capital)
@@ -44,20 +113,18 @@ def run_simulation(strategy_function, outcomes_config, initial_capital=1000, par
     max_capital = current_capital
     max_drawdown = 0
     
+    # Suivi en domaine logarithmique
+    log10_capital = math.log10(current_capital) if current_capital > 0 else float('-inf')
+    log10_max_capital = log10_capital
+    capital_exponent = 0
+    first_live = 0  # Trades précédents tous ramenés au plancher
+    
     # Exécution des trades
     for trade_num in range(1, n + 1):
         # Vérifier le crash (capital < 1€)
-        if current_capital < 1:
-            return {
-                'capital_final': current_capital,
-                'drawdown_max': max_drawdown,
-                'moyenne': sum(t['profit_loss'] for t in history) / len(history) if history else 0,
-                'ecart_type': _calculate_std_dev(history),
-                'equity_curve': equity_curve,
-                'history': history,
-                'trades_executed': trade_num - 1,
-                'account_crashed': True
-            }
+        if log10_capital < 0:
+            return _build_result(current_capital, history, equity_curve, max_drawdown, log10_capital,
+                                 log10_max_capital, capital_exponent, trade_num - 1, True)
         
         # Calculer le risque avec la stratégie
         risk_percent = strategy_function(history, current_capital, **params)
@@ -68,8 +135,8 @@ def run_simulation(strategy_function, outcomes_config, initial_capital=1000, par
         # Calculer le montant risqué
         risk_amount = current_capital * (risk_percent / 100)
         
-        # Tirer un outcome aléatoire
-        outcome = random.choice(outcomes_list)
+        # Outcome aléatoire de ce trade
+        outcome = outcomes[trade_num - 1]
         
         # Calculer le profit/perte
         profit_loss = risk_amount * outcome
@@ -81,6 +148,11 @@ def run_simulation(strategy_function, outcomes_config, initial_capital=1000, par
         current_capital += profit_loss
         current_capital = max(0, current_capital)  # Ne peut pas être négatif
         
+        # Mettre à jour le log du capital (le ratio ne dépend pas de l'échelle)
+        growth = 1 + (risk_percent / 100) * outcome
+        log10_capital = log10_capital + math.log10(growth) if growth > 0 else float('-inf')
+        log10_max_capital = max(log10_max_capital, log10_capital)
+        
         # Enregistrer le trade
         trade = {
             'trade_number': trade_num,
@@ -93,26 +165,129 @@ def run_simulation(strategy_function, outcomes_config, initial_capital=1000, par
             'is_win': profit_loss > 0
         }
         history.append(trade)
-        equity_curve.append(current_capital)
+        equity_curve.append(scale_capital(current_capital, capital_exponent))
         
         # Mettre à jour le max capital et drawdown
         max_capital = max(max_capital, current_capital)
         current_dd = ((current_capital - max_capital) / max_capital) * 100
         max_drawdown = min(max_drawdown, current_dd)
+        
+        # Renormaliser les montants avant l'overflow
+        if current_capital > RESCALE_THRESHOLD:
+            scale = 10.0 ** -RESCALE_DIGITS
+            for index in range(first_live, len(history)):
+                past_trade = history[index]
+                low = min(past_trade['capital_before'], past_trade['capital_after'])
+                factor = scale
+                if 0 < low * scale < HISTORY_FLOOR:
+                    factor = HISTORY_FLOOR / low
+                    if index == first_live:
+                        first_live += 1
+                for key in ('capital_before', 'capital_after', 'risk_amount', 'profit_loss'):
+                    past_trade[key] *= factor
+            current_capital *= scale
+            max_capital *= scale
+            capital_exponent += RESCALE_DIGITS
     
-    # Calculs finaux
+    return _build_result(current_capital, history, equity_curve, max_drawdown, log10_capital,
+                         log10_max_capital, capital_exponent, n, False)
+
+
+# Pool de processus partagé entre les requêtes (créé au premier usage)
+_path_pool = None
+
+
+def _get_path_pool():
+    global _path_pool
+    if _path_pool is None:
+        _path_pool = ProcessPoolExecutor(max_workers=os.cpu_count() or 1)
+    return _path_pool
+
+
+def _run_path_chunk(strategy_key, outcomes_config, initial_capital, params, n, seeds, indices):
+    """
+    Exécute une série de chemins (un par graine) dans un processus du pool
+
+    Seuls les points échantillonnés de chaque equity curve sont renvoyés,
+    en capital réel (plafonné au plus grand float).
+    """
+    from .strategies import STRATEGIES
+    strategy_function = STRATEGIES[strategy_key]['function']
+
+    paths = []
+    for seed in seeds:
+        result = run_simulation(strategy_function, outcomes_config, initial_capital,
+                                dict(params), n, rng=random.Random(seed))
+        curve = result['equity_curve']
+        # Compte crashé : le capital reste figé sur sa dernière valeur
+        sampled = [curve[min(index, len(curve) - 1)] for index in indices]
+        paths.append({
+            'curve': sampled,
+            'capital_final': min(result['capital_final'], sys.float_info.max),
+            'drawdown_max': result['drawdown_max'],
+            'account_crashed': result['account_crashed'],
+            'trades_executed': result['trades_executed']
+        })
+    return paths
+
+
+def run_paths(strategy_key, outcomes_config, initial_capital=1000, params=None, n=1000,
+              n_paths=100, points=200, seed=None):
+    """
+    Exécute n_paths simulations indépendantes, réparties sur un pool de processus
+
+    Args:
+        strategy_key: Clé de la stratégie dans STRATEGIES
+        outcomes_config, initial_capital, params, n: comme run_simulation
+        n_paths: Nombre de chemins simulés
+        points: Nombre maximal d'index échantillonnés par equity curve
+        seed: Graine globale (résultats reproductibles si fournie)
+
+    Returns:
+        tuple: (indices échantillonnés, liste des chemins)
+    """
+    stride = max(1, math.ceil((n + 1) / points))
+    indices = list(range(0, n + 1, stride))
+    if indices[-1] != n:
+        indices.append(n)
+
+    # Une graine par chemin : le résultat ne dépend pas du découpage en paquets
+    seeder = random.Random(seed)
+    seeds = [seeder.getrandbits(64) for _ in range(n_paths)]
+    args = (strategy_key, outcomes_config, initial_capital, params or {}, n)
+
+    workers = os.cpu_count() or 1
+    if workers == 1 or n_paths < 2 * workers:
+        return indices, _run_path_chunk(*args, seeds, indices)
+
+    # Plusieurs paquets par processus pour équilibrer la charge
+    chunk_size = math.ceil(n_paths / (workers * 4))
+    chunks = [seeds[i:i + chunk_size] for i in range(0, n_paths, chunk_size)]
+    futures = [_get_path_pool().submit(_run_path_chunk, *args, chunk, indices) for chunk in chunks]
+
+    paths = []
+    for future in futures:
+        paths.extend(future.result())
+    return indices, paths
+
+
+def _build_result(current_capital, history, equity_curve, max_drawdown, log10_capital,
+                  log10_max_capital, capital_exponent, trades_executed, account_crashed):
+    """Construit le dict résultat de run_simulation"""
     moyenne = sum(t['profit_loss'] for t in history) / len(history) if history else 0
-    ecart_type = _calculate_std_dev(history)
     
     return {
-        'capital_final': current_capital,
+        'capital_final': current_capital if capital_exponent == 0 else capital_from_log10(log10_capital),
         'drawdown_max': max_drawdown,
-        'moyenne': moyenne,
-        'ecart_type': ecart_type,
+        'moyenne': scale_capital(moyenne, capital_exponent),
+        'ecart_type': scale_capital(_calculate_std_dev(history), capital_exponent),
         'equity_curve': equity_curve,
         'history': history,
-        'trades_executed': n,
-        'account_crashed': False
+        'trades_executed': trades_executed,
+        'account_crashed': account_crashed,
+        'log10_capital_final': log10_capital,
+        'log10_capital_max': log10_max_capital,
+        'capital_exponent': capital_exponent
     }
 
 
@@ -121,8 +296,12 @@ def _calculate_std_dev(history):
     if not history or len(history) < 2:
         return 0
     
-    profits = [t['profit_loss'] for t in history]
+    # Calcul sur les profits ramenés à [-1, 1] : pas d'overflow des carrés
+    largest = max(abs(t['profit_loss']) for t in history)
+    if not largest:
+        return 0
+    profits = [t['profit_loss'] / largest for t in history]
     mean = sum(profits) / len(profits)
     variance = sum((p - mean) ** 2 for p in profits) / len(profits)
     
-    return variance ** 0.5
+    return variance ** 0.5 * largest
@@ -4,6 +4,7 @@ Chaque stratégie calcule le risque à appliquer au prochain trade
 en fonction de l'historique des trades précédents.
 """
 
+import math
 from decimal import Decimal
 
 
@@ -149,6 +150,12 @@ def strategy_6_scaling_geometrique(history, capital, base_risk=1.0, growth_rate=
         return base_risk
     
     steps = int(gain_percent / step)
+    
+    # Au-delà de max_risk le risque est plafonné : borner steps évite l'overflow
+    # de growth_rate ** steps sur les longs horizons
+    if growth_rate > 1 and 0 < base_risk < max_risk:
+        steps = min(steps, math.ceil(math.log(max_risk / base_risk, growth_rate)) + 1)
+    
     calculated_risk = base_risk * (growth_rate ** steps)
     return min(calculated_risk, max_risk)
 
@@ -0,0 +1,360 @@
+"""
+Balayage d'une grille de paramètres de stratégie en un seul passage
+
+Chaque chemin tire une seule suite d'outcomes, rejouée par tous les jeux de
+paramètres de la grille (nombres aléatoires communs, comme le run i de chaque
+configuration d'un batch en mode common_random_numbers : une cellule de la
+grille reproduit exactement le batch équivalent).
+
+Les stratégies les plus balayées ont un noyau dédié qui avance le chemin avec
+un état incrémental (plus haut du capital, série de pertes, fenêtre de
+rendements, compteur R) au lieu de reparcourir l'historique à chaque trade :
+le coût par trade est constant au lieu de croître avec l'historique, et aucun
+dict de trade n'est construit. Les noyaux reprennent les expressions des
+stratégies à l'identique (mêmes seuils, mêmes arrondis). Les autres stratégies
+passent par run_simulation sur la même suite d'outcomes.
+
+Les chemins sont répartis par paquets sur le pool de processus du simulateur.
+"""
+
+import math
+import os
+import random
+import sys
+
+from .analytics import exact_quantile
+from .simulator import _get_path_pool, draw_outcomes, run_simulation
+
+
+def _sweep_strategy_1(tape, capital, dd1=5, dd2=20, base_risk=1.0):
+    """Noyau de strategy_1_drawdown_lineaire"""
+    peak = 0.0  # Plus haut des capitaux après trade (vu par la stratégie)
+    top = capital  # Plus haut incluant le capital initial (drawdown max du simulateur)
+    max_drawdown = 0
+    for trade, outcome in enumerate(tape):
+        if capital < 1:
+            return capital, max_drawdown, trade, True
+        risk = base_risk
+        if trade:
+            dd = ((capital - peak) / peak) * 100
+            if dd >= -dd1:
+                risk = base_risk
+            elif dd <= -dd2:
+                risk = base_risk * 0.2
+            else:
+                risk = base_risk * (1 - 0.8 * ((abs(dd) - dd1) / (dd2 - dd1)))
+        risk = 0.1 if risk < 0.1 else 20 if risk > 20 else risk
+        capital += capital * (risk / 100) * outcome
+        if capital < 0:
+            capital = 0
+        if capital > peak:
+            peak = capital
+        if capital > top:
+            top = capital
+        else:
+            dd = ((capital - top) / top) * 100
+            if dd < max_drawdown:
+                max_drawdown = dd
+    return capital, max_drawdown, len(tape), False
+
+
+def _sweep_strategy_2(tape, capital, base_risk=1.0, dd_step=5, decay=0.8, min_risk=0.1):
+    """Noyau de strategy_2_dd_lineaire"""
+    peak = 0.0
+    top = capital
+    max_drawdown = 0
+    for trade, outcome in enumerate(tape):
+        if capital < 1:
+            return capital, max_drawdown, trade, True
+        risk = base_risk
+        if trade:
+            dd = ((capital - peak) / peak) * 100
+            risk = max(min_risk, base_risk * (decay ** max(0, int(abs(dd) / dd_step))))
+        risk = 0.1 if risk < 0.1 else 20 if risk > 20 else risk
+        capital += capital * (risk / 100) * outcome
+        if capital < 0:
+            capital = 0
+        if capital > peak:
+            peak = capital
+        if capital > top:
+            top = capital
+        else:
+            dd = ((capital - top) / top) * 100
+            if dd < max_drawdown:
+                max_drawdown = dd
+    return capital, max_drawdown, len(tape), False
+
+
+def _sweep_strategy_3(tape, capital, base_risk=1.0, dd_threshold=15, safe_risk=0.25):
+    """Noyau de strategy_3_mode_securite"""
+    peak = 0.0
+    top = capital
+    max_drawdown = 0
+    for trade, outcome in enumerate(tape):
+        if capital < 1:
+            return capital, max_drawdown, trade, True
+        risk = base_risk
+        if trade and ((capital - peak) / peak) * 100 < -dd_threshold:
+            risk = safe_risk
+        risk = 0.1 if risk < 0.1 else 20 if risk > 20 else risk
+        capital += capital * (risk / 100) * outcome
+        if capital < 0:
+            capital = 0
+        if capital > peak:
+            peak = capital
+        if capital > top:
+            top = capital
+        else:
+            dd = ((capital - top) / top) * 100
+            if dd < max_drawdown:
+                max_drawdown = dd
+    return capital, max_drawdown, len(tape), False
+
+
+def _sweep_strategy_19(tape, capital, base_risk=1.0, dd_threshold=10, streak_threshold=4, drastic_factor=0.25,
+                       moderate_factor=0.5):
+    """Noyau de strategy_19_risk_corridor"""
+    peak = 0.0
+    top = capital
+    max_drawdown = 0
+    losses = 0  # Pertes consécutives en fin d'historique
+    for trade, outcome in enumerate(tape):
+        if capital < 1:
+            return capital, max_drawdown, trade, True
+        risk = base_risk
+        if trade:
+            dd_signal = ((capital - peak) / peak) * 100 < -dd_threshold
+            streak_signal = losses >= streak_threshold
+            if dd_signal and streak_signal:
+                risk = base_risk * drastic_factor
+            elif dd_signal or streak_signal:
+                risk = base_risk * moderate_factor
+        risk = 0.1 if risk < 0.1 else 20 if risk > 20 else risk
+        profit_loss = capital * (risk / 100) * outcome
+        capital += profit_loss
+        losses = losses + 1 if profit_loss < 0 else 0
+        if capital < 0:
+            capital = 0
+        if capital > peak:
+            peak = capital
+        if capital > top:
+            top = capital
+        else:
+            dd = ((capital - top) / top) * 100
+            if dd < max_drawdown:
+                max_drawdown = dd
+    return capital, max_drawdown, len(tape), False
+
+
+def _sweep_strategy_20(tape, capital, base_risk=1.0, a=0.3, b=0.4, c=0.3):
+    """Noyau de strategy_20_modele_lineaire_3_signaux"""
+    peak = 0.0
+    top = capital
+    max_drawdown = 0
+    losses = 0
+    returns = []  # Rendements (profit / capital avant) des 10 derniers trades
+    for trade, outcome in enumerate(tape):
+        if capital < 1:
+            return capital, max_drawdown, trade, True
+        risk = base_risk
+        if trade >= 10:
+            # min / max écrits en expressions conditionnelles (appels évités dans la boucle)
+            dd_signal = abs(((capital - peak) / peak) * 100) / 20
+            dd_signal = dd_signal if dd_signal < 1.0 else 1.0
+            streak_signal = losses / 5 if losses < 5 else 1.0
+            mean_return = sum(returns) / 10
+            vol_signal = (sum([(r - mean_return) ** 2 for r in returns]) / 10) ** 0.5 / 0.1
+            vol_signal = vol_signal if vol_signal < 1.0 else 1.0
+            risk_reduction = a * dd_signal + b * streak_signal + c * vol_signal
+            risk = base_risk * (1.0 - 0.75 * risk_reduction)
+            if risk < 0.25 * base_risk:
+                risk = 0.25 * base_risk
+        risk = 0.1 if risk < 0.1 else 20 if risk > 20 else risk
+        profit_loss = capital * (risk / 100) * outcome
+        returns.append(profit_loss / capital)
+        if len(returns) > 10:
+            del returns[0]
+        capital += profit_loss
+        losses = losses + 1 if profit_loss < 0 else 0
+        if capital < 0:
+            capital = 0
+        if capital > peak:
+            peak = capital
+        if capital > top:
+            top = capital
+        else:
+            dd = ((capital - top) / top) * 100
+            if dd < max_drawdown:
+                max_drawdown = dd
+    return capital, max_drawdown, len(tape), False
+
+
+def _sweep_strategy_21(tape, capital, base_risk=1.0, step_1=5, step_2=10, step_3=15,
+                       risk_neutral=1.0, risk_up_1=1.5, risk_up_2=2.0, risk_up_3=3.0,
+                       risk_down_1=0.5, risk_down_2=0.25, risk_down_3=0.1, reset_dd_threshold=30):
+    """Noyau de strategy_21_r_counter (le plus haut inclut le capital initial, comme la stratégie)"""
+    peak = capital
+    top = capital
+    max_drawdown = 0
+    counter = 0
+    reset = False  # DD après le dernier trade au-delà du seuil : compteur vu à zéro
+    for trade, outcome in enumerate(tape):
+        if capital < 1:
+            return capital, max_drawdown, trade, True
+        r_counter = 0 if reset else counter
+        if r_counter >= step_3:
+            risk = risk_up_3
+        elif r_counter >= step_2:
+            risk = risk_up_2
+        elif r_counter >= step_1:
+            risk = risk_up_1
+        elif r_counter > -step_1:
+            risk = risk_neutral
+        elif r_counter > -step_2:
+            risk = risk_down_1
+        elif r_counter > -step_3:
+            risk = risk_down_2
+        else:
+            risk = risk_down_3
+        risk = 0.1 if risk < 0.1 else 20 if risk > 20 else risk
+        capital += capital * (risk / 100) * outcome
+        if capital < 0:
+            capital = 0
+        if capital > peak:
+            peak = capital
+        reset = ((capital - peak) / peak) * 100 < -reset_dd_threshold
+        if reset:
+            counter = 0
+        counter += outcome
+        if capital > top:
+            top = capital
+        else:
+            dd = ((capital - top) / top) * 100
+            if dd < max_drawdown:
+                max_drawdown = dd
+    return capital, max_drawdown, len(tape), False
+
+
+# Métriques du résumé d'une cellule (voir summarize_runs)
+SWEEP_METRICS = [
+    'mean_performance_pct', 'median_performance_pct', 'p05_performance_pct',
+    'median_drawdown_pct', 'p95_drawdown_pct', 'crash_rate'
+]
+
+
+# Noyaux incrémentaux disponibles (les autres stratégies passent par run_simulation)
+SWEEP_KERNELS = {
+    'strategy_1': _sweep_strategy_1,
+    'strategy_2': _sweep_strategy_2,
+    'strategy_3': _sweep_strategy_3,
+    'strategy_19': _sweep_strategy_19,
+    'strategy_20': _sweep_strategy_20,
+    'strategy_21': _sweep_strategy_21,
+}
+
+
+def parameter_grid(base_params, x_param, x_values, y_param=None, y_values=None):
+    """
+    Jeux de paramètres d'une grille (ligne par ligne : y puis x)
+
+    Returns:
+        list: Un dict de paramètres par cellule, base_params complétés des valeurs des axes
+    """
+    rows = y_values if y_param else [None]
+    grid = []
+    for y in rows:
+        for x in x_values:
+            params = {**base_params, x_param: x}
+            if y_param:
+                params[y_param] = y
+            grid.append(params)
+    return grid
+
+
+def _sweep_chunk(strategy_key, outcomes_config, initial_capital, param_sets, n, seed, path_indices):
+    """
+    Exécute tous les jeux de paramètres sur une série de chemins (dans un processus du pool)
+
+    Returns:
+        list: Pour chaque jeu de paramètres, un tuple (performance %, drawdown max %, crash) par chemin
+    """
+    kernel = SWEEP_KERNELS.get(strategy_key)
+    if kernel is None:
+        from .strategies import STRATEGIES
+        strategy_function = STRATEGIES[strategy_key]['function']
+
+    runs = [[] for _ in param_sets]
+    for path_index in path_indices:
+        # Même graine que le run path_index d'un batch en nombres aléatoires communs
+        tape = draw_outcomes(outcomes_config, n, random.Random(f'{seed}:{path_index}'))
+        for params, cell_runs in zip(param_sets, runs):
+            if kernel is not None:
+                capital, max_drawdown, _, crashed = kernel(tape, float(initial_capital), **params)
+            else:
+                result = run_simulation(strategy_function, outcomes_config, initial_capital, dict(params), n,
+                                        outcomes=tape)
+                capital, max_drawdown, crashed = (result['capital_final'], result['drawdown_max'],
+                                                  result['account_crashed'])
+            performance = min(capital / initial_capital * 100 - 100, sys.float_info.max)
+            cell_runs.append((performance, max_drawdown, crashed))
+    return runs
+
+
+def run_sweep(strategy_key, outcomes_config, param_sets, initial_capital=1000, n=1000, n_paths=200, seed=0,
+              first_path=0):
+    """
+    Évalue chaque jeu de paramètres sur les mêmes n_paths suites d'outcomes
+
+    Args:
+        strategy_key: Clé de la stratégie dans STRATEGIES
+        outcomes_config: Dict des outcomes et de leurs poids
+        param_sets: Liste de dicts de paramètres complets (voir parameter_grid)
+        initial_capital: Capital de départ
+        n: Nombre de trades par chemin
+        n_paths: Nombre de chemins par jeu de paramètres
+        seed: Graine du balayage (le chemin i utilise la graine f'{seed}:{i}')
+        first_path: Indice du premier chemin (chemins first_path à first_path + n_paths - 1)
+
+    Returns:
+        list: Pour chaque jeu de paramètres, la liste des (performance %, drawdown max %, crash) de ses chemins
+    """
+    args = (strategy_key, outcomes_config, initial_capital, param_sets, n, seed)
+
+    workers = os.cpu_count() or 1
+    if workers == 1 or n_paths < 2 * workers:
+        return _sweep_chunk(*args, range(first_path, first_path + n_paths))
+
+    chunk_size = math.ceil(n_paths / (workers * 4))
+    end = first_path + n_paths
+    futures = [
+        _get_path_pool().submit(_sweep_chunk, *args, range(start, min(start + chunk_size, end)))
+        for start in range(first_path, end, chunk_size)
+    ]
+
+    runs = [[] for _ in param_sets]
+    for future in futures:
+        for cell_runs, chunk_runs in zip(runs, future.result()):
+            cell_runs.extend(chunk_runs)
+    return runs
+
+
+def summarize_runs(runs):
+    """
+    Résumé d'une cellule du balayage
+
+    Returns:
+        dict: performance moyenne / médiane / 5e percentile, drawdown médian et
+        p95 (drawdown dépassé par 5% des chemins), taux de crash
+    """
+    performances = sorted(performance for performance, _, _ in runs)
+    drawdowns = sorted(max_drawdown for _, max_drawdown, _ in runs)
+    return {
+        'runs': len(runs),
+        'mean_performance_pct': min(sum(performances) / len(performances), sys.float_info.max),
+        'median_performance_pct': exact_quantile(performances, 0.5),
+        'p05_performance_pct': exact_quantile(performances, 0.05),
+        'median_drawdown_pct': exact_quantile(drawdowns, 0.5),
+        'p95_drawdown_pct': exact_quantile(drawdowns, 0.05),
+        'crash_rate': sum(1 for _, _, crashed in runs if crashed) / len(runs)
+    }
+
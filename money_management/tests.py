@@ -0,0 +1,600 @@
+import json
+import math
+import statistics
+from random import Random
+from unittest import mock
+
+from django.db import connection
+from django.test import SimpleTestCase, TestCase
+
+from .analytics import (
+    bootstrap_ci, fan_chart, mann_whitney_u, paired_difference, paired_t_test, pareto_frontier, t_two_sided_p,
+    welch_t_test, wilcoxon_signed_rank
+)
+from .maintenance import _compact, purge_batch
+from .optimizer import evaluation_blocks, optimize, parameter_space
+from .risk_analysis import drawdown_risk_curves, estimate_ruin_probability, kelly_profile, kelly_risk, log_growth
+from .sampling import OutcomeSampler
+from .sensitivity import saltelli_design, sobol_indices
+from .models import SimulationBatch, SimulationConfig, SimulationResult
+from .simulator import draw_outcomes, run_simulation
+from .strategies import STRATEGIES
+from .sweep import SWEEP_KERNELS
+from .views import MAX_ANALYTIC_TRADES, MAX_OPTIMIZER_ROUNDS, MAX_SWEEP_PATHS, MAX_SYNC_SIMULATED_TRADES
+
+
+BALANCED = {'-1': 12, '-5': 2, '2': 3, '3': 2, '4': 1, '5': 1, '9': 1}
+
+
+def make_batch(batch_id, strategies=('strategy_1', 'strategy_2'), runs=10, num_trades=4, curves=True):
+    """Batch terminé avec des résultats fixes : performance du run i de la stratégie k = 10 * i + k"""
+    batch = SimulationBatch.objects.create(
+        batch_id=batch_id, name=batch_id, total_simulations=len(strategies) * runs,
+        completed_simulations=len(strategies) * runs, status='completed', has_equity_curves=curves
+    )
+    for k, strategy_key in enumerate(strategies):
+        config = SimulationConfig.objects.create(
+            batch_id=batch_id, strategy_key=strategy_key, strategy_name=strategy_key,
+            parameters={}, num_trades=num_trades, initial_capital=1000
+        )
+        SimulationResult.objects.bulk_create(
+            SimulationResult(
+                config=config, batch_id=batch_id, run_index=i,
+                final_capital=1000 + 100 * i + 10 * k, final_performance_pct=10 * i + k,
+                max_capital=1000 + 100 * i + 10 * k, max_drawdown_pct=-(i % 5) - k,
+                max_performance_pct=10 * i + k, avg_risk_pct=1, avg_risk_amount=10, avg_profit_loss=1,
+                max_consecutive_wins=2, max_consecutive_losses=3, success_rate=50, total_wins=2, total_losses=2,
+                equity_curve=[1000 + step * (10 * i + k) for step in range(num_trades + 1)] if curves else None
+            )
+            for i in range(runs)
+        )
+    return batch
+
+
+class LongHorizonSimulationTests(SimpleTestCase):
+    """Simulations de 10^6 trades avec des stratégies à intérêts composés (plusieurs renormalisations)"""
+
+    def assert_long_run(self, strategy_key):
+        result = run_simulation(STRATEGIES[strategy_key]['function'], BALANCED, 1000, {}, n=1000000, rng=Random(1))
+
+        self.assertEqual(result['trades_executed'], 1000000)
+        self.assertFalse(result['account_crashed'])
+        self.assertGreater(result['capital_exponent'], 2 * 200)
+        self.assertTrue(math.isfinite(result['log10_capital_final']))
+        self.assertTrue(math.isfinite(result['moyenne']))
+        self.assertTrue(math.isfinite(result['ecart_type']))
+        self.assertTrue(all(math.isfinite(value) for value in result['equity_curve']))
+        self.assertEqual(result['equity_curve'][0], 1000)
+        self.assertGreater(result['history'][0]['capital_before'], 0)
+
+    def test_strategy_5_million_trades(self):
+        self.assert_long_run('strategy_5')
+
+    def test_strategy_6_million_trades(self):
+        self.assert_long_run('strategy_6')
+
+
+class FanChartTests(SimpleTestCase):
+    """Bandes de percentiles avec des comptes crashés"""
+
+    def test_crashed_curves_keep_last_value(self):
+        curves = [
+            [100, 50, 0.5],
+            [100, 50, 0.5],
+            [100, 110, 120, 130, 140],
+            [100, 120, 140, 160, 180],
+        ]
+        fan = fan_chart(iter(curves), 5)
+
+        self.assertEqual(fan['indices'], [0, 1, 2, 3, 4])
+        self.assertEqual(fan['counts'], [4, 4, 4, 2, 2])
+        self.assertEqual(fan['num_curves'], 4)
+        # Les deux comptes crashés restent dans les bandes basses jusqu'au bout
+        self.assertLess(fan['bands']['p5'][-1], 1)
+        self.assertLess(fan['bands']['p25'][-1], 140)
+
+
+class BatchCacheTests(TestCase):
+    """Les analyses en cache d'un batch supprimé ne sont plus servies"""
+
+    def fan(self, batch_id):
+        return self.client.get(f'/money-management/batch/{batch_id}/strategy/strategy_1/fan/')
+
+    def test_delete_invalidates_cached_analyses(self):
+        make_batch('cache-batch')
+        self.assertFalse(self.fan('cache-batch').json()['cached'])
+        self.assertTrue(self.fan('cache-batch').json()['cached'])
+
+        self.client.post('/money-management/batch/cache-batch/delete/')
+        self.assertEqual(self.fan('cache-batch').status_code, 404)
+
+        # Même batch_id recréé : rien n'est relu du cache
+        make_batch('cache-batch', runs=3)
+        response = self.fan('cache-batch').json()
+        self.assertFalse(response['cached'])
+        self.assertEqual(response['num_curves'], 3)
+
+    def test_delete_invalidates_cached_bootstrap(self):
+        url = '/money-management/batch/cache-batch/stats/'
+        make_batch('cache-batch')
+        self.client.get(url, {'bootstrap': 200})
+        self.client.post('/money-management/batch/cache-batch/delete/')
+
+        make_batch('cache-batch', runs=3)
+        intervals = self.client.get(url, {'bootstrap': 200}).json()['strategies']['strategy_1']['confidence_intervals']
+        self.assertEqual(intervals['performance_mean']['estimate'], 10)
+
+    def test_delete_invalidates_cached_comparisons(self):
+        url = '/money-management/batch/cache-batch/compare/'
+        make_batch('cache-batch')
+        self.client.get(url)
+        self.client.post('/money-management/batch/cache-batch/delete/')
+
+        make_batch('cache-batch', runs=3)
+        comparison = self.client.get(url).json()['comparisons'][0]['final_performance_pct']
+        self.assertEqual(comparison['t_test']['df'], 4)
+
+
+class MaintenanceTests(TestCase):
+    """Purge par paquets et compaction sans VACUUM complet"""
+
+    def test_purge_batch_in_chunks(self):
+        make_batch('purged', runs=25)
+        make_batch('kept', runs=3)
+
+        self.assertEqual(purge_batch('purged', chunk_size=7), 50)
+        self.assertFalse(SimulationResult.objects.filter(batch_id='purged').exists())
+        self.assertFalse(SimulationConfig.objects.filter(batch_id='purged').exists())
+        self.assertFalse(SimulationBatch.objects.filter(batch_id='purged').exists())
+        self.assertEqual(SimulationResult.objects.filter(batch_id='kept').count(), 6)
+
+    def run_compaction(self):
+        job = {'status': 'pending', 'reclaimed_bytes': 0, 'finished_at': None, 'reason': None, 'error': None}
+        _compact(job)
+        return job
+
+    def test_compaction_is_incremental(self):
+        with connection.cursor() as cursor:
+            cursor.execute('PRAGMA auto_vacuum')
+            self.assertEqual(cursor.fetchone()[0], 2)  # Migration 0014
+        make_batch('purged', runs=200)
+        purge_batch('purged')
+
+        job = self.run_compaction()
+        self.assertEqual(job['status'], 'completed')
+        self.assertGreaterEqual(job['reclaimed_bytes'], 0)
+
+    def test_compaction_skipped_without_incremental_mode(self):
+        with mock.patch('money_management.maintenance._pragma', side_effect=lambda cursor, name: 0):
+            job = self.run_compaction()
+        self.assertEqual(job['status'], 'skipped')
+        self.assertIn('0014_sqlite_incremental_vacuum', job['reason'])
+
+
+class SweepTests(TestCase):
+    """Noyaux de balayage et limites du balayage synchrone"""
+
+    def test_kernels_match_run_simulation(self):
+        for strategy_key, kernel in SWEEP_KERNELS.items():
+            info = STRATEGIES[strategy_key]
+            for path in range(5):
+                tape = draw_outcomes(BALANCED, 500, Random(f'kernel:{path}'))
+                capital, max_drawdown, _, crashed = kernel(tape, 1000.0, **info['params'])
+                result = run_simulation(info['function'], BALANCED, 1000, dict(info['params']), 500, outcomes=tape)
+                with self.subTest(strategy=strategy_key, path=path):
+                    self.assertAlmostEqual(capital, result['capital_final'], delta=1e-6 * max(1, capital))
+                    self.assertAlmostEqual(max_drawdown, result['drawdown_max'], places=6)
+                    self.assertEqual(crashed, result['account_crashed'])
+
+    def post_sweep(self, **payload):
+        payload = {'strategy_key': 'strategy_1', 'x': {'param': 'dd1', 'values': [2, 5]}, **payload}
+        return self.client.post('/money-management/sweep/run/', json.dumps(payload), content_type='application/json')
+
+    def test_sweep_limits(self):
+        self.assertEqual(self.post_sweep(num_trades=MAX_ANALYTIC_TRADES + 1).status_code, 400)
+        response = self.post_sweep(num_paths=MAX_SWEEP_PATHS, num_trades=MAX_ANALYTIC_TRADES)
+        self.assertEqual(response.status_code, 400)
+        self.assertIn(str(MAX_SYNC_SIMULATED_TRADES), response.json()['error'])
+        self.assertFalse(SimulationBatch.objects.exists())
+
+        response = self.post_sweep(num_paths=5, num_trades=50, seed=1)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(SimulationBatch.objects.get().status, 'completed')
+
+
+class OptimizerTests(TestCase):
+    """Borne du travail d'une optimisation synchrone"""
+
+    def test_evaluation_blocks_bound_simulations(self):
+        domain = parameter_space(STRATEGIES['strategy_1']['params'], {'dd1': [2, 10], 'dd2': [15, 40]})
+        result = optimize(
+            'strategy_1', BALANCED, domain, STRATEGIES['strategy_1']['params'], 'median_performance_pct', 'max',
+            n=50, n_paths=4, rounds=3, batch_size=2, seed=1
+        )
+        self.assertGreater(result['simulations'], 0)
+        self.assertLessEqual(result['simulations'], evaluation_blocks(len(domain), 3, 2) * 4)
+
+    def test_optimizer_limits(self):
+        url = '/money-management/optimize/strategy_1/'
+        payload = {'rounds': MAX_OPTIMIZER_ROUNDS, 'batch_size': 16, 'num_paths': 1000, 'num_trades': 1000}
+        response = self.client.post(url, json.dumps(payload), content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn(str(MAX_SYNC_SIMULATED_TRADES), response.json()['error'])
+        response = self.client.post(url, json.dumps({'num_trades': 10 ** 6}), content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(SimulationBatch.objects.exists())
+
+
+class BatchStatisticsTests(TestCase):
+    """Médianes exactes par configuration"""
+
+    def test_exact_medians(self):
+        make_batch('stats-batch', runs=10)
+        make_batch('other-batch', runs=3)
+        strategies = self.client.get('/money-management/batch/stats-batch/stats/').json()['strategies']
+
+        self.assertEqual(strategies['strategy_1']['performance']['median'], 45)
+        self.assertEqual(strategies['strategy_2']['performance']['median'], 46)
+        self.assertEqual(strategies['strategy_1']['drawdown']['median'], -2)
+        self.assertEqual(strategies['strategy_2']['drawdown']['median'], -3)
+
+
+class SamplingTests(SimpleTestCase):
+    """Réduction de variance mesurée contre des batches iid indépendants"""
+
+    @staticmethod
+    def batch_means(mode, batches=30, n=100, n_paths=200):
+        kernel, params = SWEEP_KERNELS['strategy_1'], STRATEGIES['strategy_1']['params']
+        means = []
+        for batch in range(batches):
+            if mode == 'iid':
+                tapes = (draw_outcomes(BALANCED, n, Random(f'iid:{batch}:{i}')) for i in range(n_paths))
+            else:
+                sampler = OutcomeSampler(BALANCED, n, n_paths, mode, f'{mode}:{batch}')
+                tapes = (sampler.tape(i) for i in range(n_paths))
+            means.append(statistics.fmean(kernel(tape, 1000.0, **params)[0] / 10 - 100 for tape in tapes))
+        return means
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.iid = cls.batch_means('iid')
+        cls.rqmc = cls.batch_means('rqmc')
+
+    def test_rqmc_reduces_variance(self):
+        # Mesuré : environ 8 (30 batches de 200 runs de 100 trades)
+        self.assertGreater(statistics.variance(self.iid) / statistics.variance(self.rqmc), 3)
+
+    def test_rqmc_keeps_the_mean(self):
+        standard_error = math.sqrt(
+            statistics.variance(self.iid) / len(self.iid) + statistics.variance(self.rqmc) / len(self.rqmc)
+        )
+        self.assertLess(abs(statistics.fmean(self.iid) - statistics.fmean(self.rqmc)), 4 * standard_error)
+
+
+class ExportTests(TestCase):
+    """Export streaming d'un batch : une ligne par résultat"""
+
+    def export(self, **params):
+        response = self.client.get('/money-management/batch/export-batch/export/', params)
+        return b''.join(response.streaming_content).decode().splitlines()
+
+    def test_row_counts(self):
+        make_batch('export-batch', runs=7)
+        make_batch('other-batch', runs=3)
+
+        self.assertEqual(len(self.export()), 1 + 14)  # En-tête + résultats du batch seul
+        self.assertEqual(len(self.export(format='ndjson')), 14)
+        self.assertEqual(len(self.export(strategy_key='strategy_2')), 1 + 7)
+
+        rows = [json.loads(line) for line in self.export(format='ndjson', equity_curves='1')]
+        self.assertEqual(len({row['id'] for row in rows}), 14)
+        self.assertTrue(all(len(row['equity_curve']) == 5 for row in rows))
+
+
+class QueryResultsTests(TestCase):
+    """Pagination par curseur : pages disjointes, dans l'ordre, ex-aequo départagés par id"""
+
+    def pages(self, **params):
+        ids, cursor = [], None
+        while True:
+            query = {**params, 'limit': 7, **({'cursor': cursor} if cursor else {})}
+            response = self.client.get('/money-management/results/query/', query).json()
+            ids.extend(row['id'] for row in response['results'])
+            cursor = response['next_cursor']
+            if cursor is None:
+                return ids
+
+    def test_keyset_pages_cover_results_once(self):
+        make_batch('query-batch', runs=25)
+        make_batch('other-batch', runs=4)
+        results = SimulationResult.objects.filter(batch_id='query-batch')
+
+        for sort in ('-final_performance_pct', 'max_drawdown_pct', '-max_drawdown_pct'):
+            with self.subTest(sort=sort):
+                ordering = [sort, '-id' if sort.startswith('-') else 'id']
+                expected = list(results.order_by(*ordering).values_list('id', flat=True))
+                self.assertEqual(self.pages(batch_id='query-batch', sort=sort), expected)
+
+        filtered = self.pages(batch_id='query-batch', strategy_key='strategy_2', min_dd=-2, sort='max_drawdown_pct')
+        self.assertEqual(
+            sorted(filtered),
+            sorted(results.filter(config__strategy_key='strategy_2', max_drawdown_pct__gte=-2).values_list('id', flat=True))
+        )
+        self.assertEqual(len(filtered), len(set(filtered)))
+
+
+class BootstrapTests(SimpleTestCase):
+    """Intervalles bootstrap comparés aux valeurs théoriques"""
+
+    def test_constant_values(self):
+        interval = bootstrap_ci([3.5] * 20, 'median', 200, rng=Random(1))
+        self.assertEqual(interval, {'estimate': 3.5, 'low': 3.5, 'high': 3.5})
+
+    def test_mean_matches_normal_interval(self):
+        values = list(range(1, 101))
+        interval = bootstrap_ci(values, 'mean', 4000, rng=Random(1))
+        # IC normal : 50.5 ± 1.96 × écart-type / √n (écart-type population 28.87)
+        half_width = 1.96 * statistics.pstdev(values) / 10
+        self.assertEqual(interval['estimate'], 50.5)
+        self.assertAlmostEqual(interval['low'], 50.5 - half_width, delta=0.4)
+        self.assertAlmostEqual(interval['high'], 50.5 + half_width, delta=0.4)
+
+    def test_median_interval_contains_estimate(self):
+        values = [float(value) for value in range(1, 102)]
+        interval = bootstrap_ci(values, 'median', 2000, rng=Random(2))
+        self.assertEqual(interval['estimate'], 51)
+        self.assertLess(interval['low'], 51)
+        self.assertGreater(interval['high'], 51)
+        # Rangs d'ordre de l'IC binomial de la médiane (n = 101) : environ 41 et 61
+        self.assertAlmostEqual(interval['low'], 41, delta=3)
+        self.assertAlmostEqual(interval['high'], 61, delta=3)
+
+
+class StatisticalTestsTests(SimpleTestCase):
+    """Tests de comparaison contre des valeurs de référence (tables, calcul à la main)"""
+
+    def test_t_distribution_critical_values(self):
+        self.assertAlmostEqual(t_two_sided_p(2.776445, 4), 0.05, places=6)
+        self.assertAlmostEqual(t_two_sided_p(2.228139, 10), 0.05, places=6)
+        self.assertEqual(t_two_sided_p(0, 7), 1.0)
+
+    def test_paired_t_test(self):
+        result = paired_t_test([1, 2, 3, 4, 5])
+        self.assertEqual(result['statistic'], 4.2426)  # 3 / (√2.5 / √5)
+        self.assertEqual(result['df'], 4)
+        self.assertAlmostEqual(result['p_value'], 0.013236, places=5)
+
+    def test_welch_t_test(self):
+        result = welch_t_test([1, 2, 3, 4, 5], [2, 4, 6, 8, 10])
+        self.assertEqual(result['statistic'], -1.8974)  # -3 / √(0.5 + 2)
+        self.assertEqual(result['df'], 5.88)
+        self.assertAlmostEqual(result['p_value'], 0.1075, places=4)
+
+    def test_rank_tests(self):
+        result = wilcoxon_signed_rank(list(range(1, 11)))
+        self.assertEqual(result['statistic'], 55)  # Toutes les différences positives
+        self.assertAlmostEqual(result['z'], 55 / 2 / math.sqrt(96.25), places=4)
+        self.assertAlmostEqual(result['p_value'], 0.00506, places=5)
+
+        result = mann_whitney_u([1, 2, 3], [4, 5, 6])
+        self.assertEqual(result['statistic'], 0)
+        self.assertAlmostEqual(result['z'], -4.5 / math.sqrt(5.25), places=4)
+        self.assertAlmostEqual(result['p_value'], 0.0495, places=4)
+
+    def test_paired_difference_matches_by_run(self):
+        # Les runs de B sont dans un autre ordre et le run 9 n'a pas de paire
+        result = paired_difference(
+            [0, 1, 2, 3, 4], [1, 2, 3, 4, 5],
+            [4, 3, 2, 1, 0, 9], [4.5, 3.4, 2.6, 1.4, 0.6, 100]
+        )
+        self.assertEqual(result['n_pairs'], 5)
+        self.assertAlmostEqual(result['mean_diff'], 0.5)
+        self.assertAlmostEqual(result['std_error'], math.sqrt(0.01 / 5), places=4)
+        self.assertAlmostEqual(result['unpaired_std_error'], math.sqrt((2.5 + 2.41) / 5), places=4)
+        self.assertAlmostEqual(result['variance_reduction'], 491, delta=1)
+        self.assertIsNone(paired_difference([0], [1], [0], [2]))
+
+
+def fixed_risk(history, capital, risk=1.0):
+    """Stratégie à risque fixe, sans noyau de balayage (passe par run_simulation)"""
+    return risk
+
+
+class RuinProbabilityTests(SimpleTestCase):
+    """Échantillonnage préférentiel contre Monte Carlo direct, sur une ruine assez fréquente pour être comptée"""
+
+    def plain_ruin(self, simulate, n_paths=4000):
+        """Proportion de chemins ruinés et son erreur standard"""
+        rng = Random('ruin')
+        p = sum(simulate(draw_outcomes(BALANCED, 200, rng)) for _ in range(n_paths)) / n_paths
+        return p, math.sqrt(p * (1 - p) / n_paths)
+
+    def assert_agrees(self, estimate, plain):
+        p, std_error = plain
+        self.assertGreater(estimate['hits'], 50)
+        self.assertAlmostEqual(estimate['probability'], p, delta=4 * math.hypot(std_error, estimate['std_error']))
+
+    def test_fixed_risk_matches_plain_monte_carlo(self):
+        def simulate(tape):
+            capital = 10.0
+            for outcome in tape:
+                capital *= 1 + 0.05 * outcome
+                if capital < 1:
+                    return True
+            return False
+
+        plain = self.plain_ruin(simulate)
+        estimate = estimate_ruin_probability(fixed_risk, BALANCED, 10, {'risk': 5}, n=200, n_paths=400,
+                                             risk_percent=5, seed=1)
+        self.assert_agrees(estimate, plain)
+        # Dix fois moins de chemins pour une erreur plus petite
+        self.assertLess(estimate['std_error'], plain[1])
+
+    def test_kernel_strategy_matches_plain_monte_carlo(self):
+        info = STRATEGIES['strategy_1']
+        params = dict(info['params'], base_risk=8, dd1=40, dd2=90)
+
+        def simulate(tape):
+            capital, _, _, crashed = SWEEP_KERNELS['strategy_1'](tape, 10.0, **params)
+            return crashed or capital < 1
+
+        plain = self.plain_ruin(simulate)
+        estimate = estimate_ruin_probability(info['function'], BALANCED, 10, params, n=200, n_paths=400,
+                                             risk_percent=8, seed=1)
+        self.assert_agrees(estimate, plain)
+
+
+class DrawdownRiskCurvesTests(SimpleTestCase):
+    """Programmation dynamique à risque fixe contre Monte Carlo direct"""
+
+    def simulate(self, risk_percent, thresholds, n_paths=2000):
+        """Part des chemins dont le drawdown max atteint chaque seuil, et part des chemins ruinés"""
+        rng = Random('drawdown')
+        reached = [0] * len(thresholds)
+        crashes = 0
+        for _ in range(n_paths):
+            capital = peak = 10.0
+            worst = 0.0
+            crashed = False
+            for outcome in draw_outcomes(BALANCED, 200, rng):
+                capital *= 1 + risk_percent / 100 * outcome
+                peak = max(peak, capital)
+                worst = max(worst, 100 * (1 - capital / peak))
+                crashed = crashed or capital < 1
+            for i, threshold in enumerate(thresholds):
+                reached[i] += worst >= threshold
+            crashes += crashed
+        return [count / n_paths for count in reached], crashes / n_paths
+
+    def assert_probability(self, exact, frequency, n_paths=2000):
+        # 4 erreurs standard du Monte Carlo, plus une marge pour la discrétisation de la grille
+        delta = 4 * math.sqrt(max(exact * (1 - exact), 1 / n_paths) / n_paths) + 0.005
+        self.assertAlmostEqual(exact, frequency, delta=delta)
+
+    def test_matches_plain_monte_carlo(self):
+        thresholds = [10, 20, 30, 40, 60]
+        curves = drawdown_risk_curves(BALANCED, risks=[1, 2, 5], thresholds=thresholds, n=200, initial_capital=10)
+        self.assertEqual(curves['thresholds'], thresholds)
+
+        for curve in curves['risks']:
+            frequencies, crash_frequency = self.simulate(curve['risk_percent'], thresholds)
+            with self.subTest(risk=curve['risk_percent']):
+                for exact, frequency in zip(curve['drawdown_probability'], frequencies):
+                    self.assert_probability(exact, frequency)
+                self.assert_probability(curve['crash_probability'], crash_frequency)
+                self.assertEqual(curve['drawdown_probability'], sorted(curve['drawdown_probability'], reverse=True))
+
+
+class KellyTests(SimpleTestCase):
+    """Optimum de Kelly contre la formule fermée du pari binaire f* = p - q / b"""
+
+    def test_binary_bet_optimum(self):
+        self.assertAlmostEqual(kelly_risk({'-1': 1, '2': 1}), 25, places=8)  # 0.5 - 0.5 / 2
+        self.assertAlmostEqual(kelly_risk({'-1': 10, '1': 11}), 100 / 21, places=8)  # 11/21 - 10/21
+        self.assertAlmostEqual(log_growth({'-1': 1, '2': 1}, 25), 0.5 * math.log(1.5) + 0.5 * math.log(0.75))
+
+    def test_edge_cases(self):
+        self.assertEqual(kelly_risk({'-1': 3, '1': 2}), 0.0)  # Espérance négative : ne pas trader
+        self.assertIsNone(kelly_risk({'1': 1, '2': 1}))  # Aucune perte : pas d'optimum fini
+        self.assertEqual(log_growth({'-5': 1, '9': 1}, 20), float('-inf'))
+
+    def test_optimum_maximizes_growth(self):
+        optimum = kelly_risk(BALANCED)
+        best = log_growth(BALANCED, optimum)
+        for step in (0.01, 0.5):
+            self.assertLess(log_growth(BALANCED, optimum - step), best)
+            self.assertLess(log_growth(BALANCED, optimum + step), best)
+
+    def test_fractional_kelly(self):
+        profile = kelly_profile({'-1': 10, '1': 11}, fractions=[0.5, 1, 2], drawdown=False)
+        self.assertAlmostEqual(profile['kelly']['risk_percent'], 100 / 21, places=8)
+        self.assertFalse(profile['kelly']['exceeds_risk_cap'])
+        ratios = [row['growth_ratio'] for row in profile['fractional_kelly']]
+        # Petit avantage : g(c * f*) / g(f*) ≈ c * (2 - c)
+        self.assertAlmostEqual(ratios[0], 0.75, delta=0.01)
+        self.assertAlmostEqual(ratios[1], 1.0)
+        self.assertAlmostEqual(ratios[2], 0.0, delta=0.02)
+        self.assertEqual([row['risk_percent'] for row in profile['curve']['risks']],
+                         sorted(round(row['risk_percent'], 4) for row in profile['fractional_kelly']))
+
+
+def dominated_scan(points):
+    """Frontière par comparaison de toutes les paires (référence quadratique)"""
+    return [
+        i for i, point in enumerate(points)
+        if not any(
+            all(o >= p for o, p in zip(other, point)) and other != point
+            for other in points
+        )
+    ]
+
+
+class ParetoFrontierTests(TestCase):
+    """Balayage en O(n log n) contre la comparaison de toutes les paires"""
+
+    def test_matches_pairwise_scan(self):
+        rng = Random('pareto')
+        for dimension in (2, 3):
+            for size in (1, 5, 50, 300):
+                # Petites valeurs entières : beaucoup d'ex-aequo et de points identiques
+                points = [tuple(rng.randint(0, 8) for _ in range(dimension)) for _ in range(size)]
+                with self.subTest(dimension=dimension, size=size):
+                    self.assertEqual(pareto_frontier(points), dominated_scan(points))
+                points = [tuple(rng.gauss(0, 1) for _ in range(dimension)) for _ in range(size)]
+                with self.subTest(dimension=dimension, size=size, continuous=True):
+                    self.assertEqual(pareto_frontier(points), dominated_scan(points))
+
+    def test_known_frontier(self):
+        points = [(1, 5), (2, 4), (2, 2), (3, 1), (0, 0), (3, 1), (1, 4)]
+        self.assertEqual(pareto_frontier(points), [0, 1, 3, 5])
+        self.assertEqual(pareto_frontier([]), [])
+
+    def test_endpoint(self):
+        make_batch('pareto', strategies=('strategy_1', 'strategy_2', 'strategy_3'))
+        url = '/money-management/batch/pareto/pareto/'
+
+        # Performance et drawdown en opposition : les trois configurations sont non dominées
+        response = self.client.get(url, {'metrics': 'median_performance_pct,p95_drawdown_pct'}).json()
+        self.assertEqual(response['total_configurations'], 3)
+        self.assertEqual([row['strategy_key'] for row in response['frontier']],
+                         ['strategy_3', 'strategy_2', 'strategy_1'])
+
+        # Aucun crash : la meilleure performance domine les autres
+        response = self.client.get(url, {'metrics': 'median_performance_pct,crash_rate'}).json()
+        self.assertEqual([row['strategy_key'] for row in response['frontier']], ['strategy_3'])
+
+        self.assertEqual(self.client.get(url, {'metrics': 'median_performance_pct'}).status_code, 400)
+        self.assertEqual(self.client.get('/money-management/batch/missing/pareto/').status_code, 404)
+
+
+class SobolIndicesTests(SimpleTestCase):
+    """Indices de Sobol du plan de Saltelli contre les valeurs analytiques"""
+
+    def indices(self, function, n, dimension):
+        design = saltelli_design(n, dimension, Random('sobol'))
+        self.assertEqual(len(design), n * (dimension + 2))
+        values = [function(point) for point in design]
+        f_ab = [values[(2 + i) * n:(3 + i) * n] for i in range(dimension)]
+        return sobol_indices(values[:n], values[n:2 * n], f_ab)
+
+    def test_ishigami(self):
+        # f = sin x1 + 7 sin² x2 + 0.1 x3⁴ sin x1 sur [-π, π]³ : S = (0.3139, 0.4424, 0), ST = (0.5576, 0.4424, 0.2437)
+        def ishigami(point):
+            x1, x2, x3 = (math.pi * (2 * u - 1) for u in point)
+            return math.sin(x1) + 7 * math.sin(x2) ** 2 + 0.1 * x3 ** 4 * math.sin(x1)
+
+        first, total = self.indices(ishigami, 4096, 3)
+        for estimate, expected in zip(first + total, [0.3139, 0.4424, 0, 0.5576, 0.4424, 0.2437]):
+            self.assertAlmostEqual(estimate, expected, delta=0.02)
+
+    def test_additive_function(self):
+        # f = x1 + 2 x2 (x3 inerte) : S_i = ST_i = (1/5, 4/5, 0)
+        first, total = self.indices(lambda point: point[0] + 2 * point[1], 1024, 3)
+        for indices in (first, total):
+            for estimate, expected in zip(indices, [0.2, 0.8, 0]):
+                self.assertAlmostEqual(estimate, expected, delta=0.02)
+        self.assertEqual(total[2], 0)
+
+    def test_constant_metric(self):
+        self.assertIsNone(self.indices(lambda point: 1.0, 64, 2))
@@ -18,7 +18,29 @@ urlpatterns = [
     path('batch/results/', views.batch_results_view, name='batch_results'),
     path('batch/<str:batch_id>/stats/', views.get_batch_statistics, name='batch_stats'),
     path('batch/<str:batch_id>/strategy/<str:strategy_key>/', views.get_strategy_details, name='strategy_details'),
+    path('batch/<str:batch_id>/strategy/<str:strategy_key>/fan/', views.get_strategy_fan_chart, name='strategy_fan_chart'),
     path('batch/<str:batch_id>/delete/', views.delete_batch, name='delete_batch'),
+    path('batch/<str:batch_id>/export/', views.export_batch, name='export_batch'),
+    path('batch/<str:batch_id>/compare/', views.compare_batch_strategies, name='compare_strategies'),
+    path('batch/<str:batch_id>/heatmap/', views.get_sweep_heatmap, name='sweep_heatmap'),
+    path('batch/<str:batch_id>/pareto/', views.get_pareto_frontier, name='pareto_frontier'),
+    
+    # API: Balayage d'une grille de paramètres (heatmaps)
+    path('sweep/run/', views.run_parameter_sweep, name='run_sweep'),
+    
+    # API: Optimisation bayésienne des paramètres (meilleurs paramètres en référence)
+    path('optimize/<str:strategy_key>/', views.optimize_strategy, name='optimize_strategy'),
+    
+    # API: Analyse de sensibilité globale des paramètres (job en arrière-plan)
+    path('sensitivity/<str:strategy_key>/', views.sensitivity_analysis, name='sensitivity_analysis'),
+    path('sensitivity/job/<str:job_id>/', views.sensitivity_status, name='sensitivity_status'),
+    
+    # API: Recherche de résultats (filtres + pagination par curseur)
+    path('results/query/', views.query_results, name='query_results'),
+    
+    # API: Maintenance de la base (compaction après suppression)
+    path('maintenance/compact/', views.compact_database, name='compact_database'),
+    path('maintenance/compact/<str:job_id>/', views.compaction_status, name='compaction_status'),
     
     # Ancienne page des stratégies
     path('list/', views.strategies_view, name='strategies_view'),
@@ -28,6 +50,10 @@ urlpatterns = [
     
     # API: Endpoint générique pour exécuter une stratégie
     path('simulate/<str:strategy_name>/', views.simulate_strategy, name='simulate_strategy'),
+    path('simulate/<str:strategy_name>/ruin/', views.estimate_ruin, name='estimate_ruin'),
+    
+    # API: Probabilités analytiques de drawdown et de crash à risque fixe
+    path('risk/drawdown/', views.drawdown_risk_profile, name='drawdown_risk_profile'),
     
     # API: Gestion des paramètres de référence
     path('reference/<str:strategy_key>/save/', views_reference.save_reference_params, name='save_reference'),
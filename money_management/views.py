@@ -6,15 +6,37 @@ from django.http import JsonResponse
 from django.shortcuts import render
 from django.views.decorators.csrf import csrf_exempt
 from django.utils import timezone
-from django.db.models import Avg, Max, Min, Count
-from decimal import Decimal
+from django.core.cache import cache
+from django.core.paginator import Paginator
+from django.db.models import Avg, Max, Min, Count, F, Q
+import base64
+import binascii
 import json
+import math
+import random
+import statistics
+import sys
+import time
 import uuid
 import hashlib
+from urllib.parse import urlencode
 
 from .strategies import STRATEGIES
-from .simulator import run_simulation
-from .models import SimulationResult, SimulationBatch
+from .simulator import (
+    capital_from_log10, draw_outcomes, fixed_risk_log10_growth, run_paths, run_simulation, scale_capital
+)
+from .models import SimulationConfig, SimulationResult, SimulationBatch, StrategyReference
+from .analytics import (
+    HISTOGRAM_FIELDS, MAX_BOOTSTRAP_RESAMPLES, bootstrap_ci, compare_columns, control_variate_estimate, fan_chart,
+    paired_difference, pareto_frontier, read_columns, sql_histograms, summarize_paths
+)
+from .export import EXPORT_FORMATS, streaming_export
+from .maintenance import batch_cache_key, compaction_job, purge_batch, start_compaction
+from .optimizer import evaluation_blocks, optimize, parameter_space
+from .risk_analysis import RUIN_PATHS, drawdown_risk_curves, estimate_ruin_probability
+from .sampling import SAMPLING_MODES, OutcomeSampler, variance_reduction
+from .sensitivity import sensitivity_job, start_sensitivity
+from .sweep import SWEEP_KERNELS, SWEEP_METRICS, parameter_grid, run_sweep, summarize_runs
 
 
 def strategies_view(request):
@@ -43,6 +65,23 @@ def visualizer_view(request):
     })
 
 
+# Nombre maximal de chemins simulés par requête
+MAX_SIMULATION_PATHS = 2000
+
+# Nombre maximal de chemins de l'estimation de la probabilité de ruine
+MAX_RUIN_PATHS = 20000
+
+# Courbes analytiques drawdown / risque : tailles maximales des grilles demandées
+MAX_RISK_POINTS = 20
+MAX_DRAWDOWN_THRESHOLDS = 20
+MAX_ANALYTIC_TRADES = 5000
+
+# Travail maximal d'un balayage ou d'une optimisation exécutés dans la requête :
+# trades simulés (cellules ou candidats × chemins × trades), soit une dizaine
+# de secondes avec les noyaux de sweep.SWEEP_KERNELS
+MAX_SYNC_SIMULATED_TRADES = 10000000
+
+
 @csrf_exempt
 def simulate_strategy(request, strategy_name):
     """
@@ -55,9 +94,15 @@ def simulate_strategy(request, strategy_name):
         "initial_capital": 1000,  # optionnel
         "outcomes_config": {...},  # optionnel, sinon preset balanced
         "params": {...},  # paramètres de la stratégie (optionnel)
-        "n_trades": 1000  # optionnel
+        "n_trades": 1000,  # optionnel
+        "n_paths": 200,  # optionnel : simule plusieurs chemins (voir ci-dessous)
+        "seed": 42  # optionnel, avec n_paths : résultats reproductibles
     }
     
+    Avec n_paths > 1, la réponse contient à la place de la courbe unique :
+    indices, bands (p5..p95 par index), ruin_probability, final_capital
+    (moyenne, percentiles, histogramme), drawdown_max et representative_paths.
+    
     Response: {
         "success": true,
         "strategy_name": "...",
@@ -102,6 +147,37 @@ def simulate_strategy(request, strategy_name):
     if 'params' in data:
         strategy_params.update(data['params'])
     
+    # Plusieurs chemins : bandes de percentiles et probabilité de ruine
+    n_paths = data.get('n_paths', 1)
+    if not isinstance(n_paths, int) or not 1 <= n_paths <= MAX_SIMULATION_PATHS:
+        return JsonResponse({
+            'success': False,
+            'error': f'n_paths doit être un entier entre 1 et {MAX_SIMULATION_PATHS}'
+        }, status=400)
+    
+    if n_paths > 1:
+        indices, paths = run_paths(
+            strategy_key=strategy_name,
+            outcomes_config=outcomes_config,
+            initial_capital=initial_capital,
+            params=strategy_params,
+            n=n_trades,
+            n_paths=n_paths,
+            points=data.get('points', 200),
+            seed=data.get('seed')
+        )
+        return JsonResponse({
+            'success': True,
+            'strategy_name': strategy_info['name'],
+            'strategy_key': strategy_name,
+            'description': strategy_info['description'],
+            'params_used': strategy_params,
+            'capital_initial': initial_capital,
+            'n_paths': n_paths,
+            'n_trades': n_trades,
+            **summarize_paths(indices, paths)
+        })
+    
     # Exécuter la simulation
     strategy_function = strategy_info['function']
     result = run_simulation(
@@ -130,6 +206,201 @@ def simulate_strategy(request, strategy_name):
     })
 
 
+@csrf_exempt
+def estimate_ruin(request, strategy_name):
+    """
+    Probabilité de crash du compte (capital < 1€) par échantillonnage préférentiel
+    
+    URL: /money-management/simulate/<strategy_name>/ruin/
+    Method: POST
+    
+    Body: {
+        "initial_capital": 1000,  # optionnel
+        "outcomes_config": {...},  # optionnel, sinon preset balanced
+        "params": {...},  # paramètres de la stratégie (optionnel)
+        "n_trades": 1000,  # optionnel : horizon
+        "n_paths": 1000,  # optionnel
+        "tilt_risk": 1.0,  # optionnel : risque de référence de l'inclinaison (défaut: base_risk)
+        "theta": -2.5,  # optionnel : inclinaison imposée, sinon choisie automatiquement
+        "seed": 42  # optionnel
+    }
+    
+    Response: {
+        "success": true,
+        "probability": 1.2e-06,
+        "log10_probability": -5.92,
+        "relative_error": 0.08,
+        "confidence_interval": [...],
+        "hits": 640,
+        "theta": -3.1,
+        "variance_reduction": 95000.0,
+        ...
+    }
+    """
+    if request.method != 'POST':
+        return JsonResponse({'success': False, 'error': 'Method not allowed'}, status=405)
+    
+    if strategy_name not in STRATEGIES:
+        return JsonResponse({
+            'success': False,
+            'error': f'Stratégie "{strategy_name}" non trouvée',
+            'available_strategies': list(STRATEGIES.keys())
+        }, status=404)
+    
+    try:
+        data = json.loads(request.body)
+    except json.JSONDecodeError:
+        return JsonResponse({'success': False, 'error': 'Invalid JSON'}, status=400)
+    
+    n_paths = data.get('n_paths', RUIN_PATHS)
+    if not isinstance(n_paths, int) or not 1 <= n_paths <= MAX_RUIN_PATHS:
+        return JsonResponse({
+            'success': False,
+            'error': f'n_paths doit être un entier entre 1 et {MAX_RUIN_PATHS}'
+        }, status=400)
+    
+    theta = data.get('theta')
+    if theta is not None and (not isinstance(theta, (int, float)) or not -1e4 <= theta <= 0):
+        return JsonResponse({'success': False, 'error': 'theta doit être un nombre entre -10000 et 0'}, status=400)
+    
+    strategy_info = STRATEGIES[strategy_name]
+    strategy_params = strategy_info['params'].copy()
+    strategy_params.update(data.get('params', {}))
+    initial_capital = data.get('initial_capital', 1000)
+    n_trades = data.get('n_trades', 1000)
+    
+    try:
+        estimate = estimate_ruin_probability(
+            strategy_function=strategy_info['function'],
+            outcomes_config=data.get('outcomes_config', {
+                '-1': 12, '-5': 2, '2': 3, '3': 2, '4': 1, '5': 1, '9': 1
+            }),
+            initial_capital=initial_capital,
+            params=strategy_params,
+            n=n_trades,
+            n_paths=n_paths,
+            risk_percent=float(data.get('tilt_risk', strategy_params.get('base_risk', 1.0))),
+            theta=theta,
+            seed=data.get('seed')
+        )
+    except Exception as e:
+        return JsonResponse({'success': False, 'error': str(e)}, status=400)
+    
+    return JsonResponse({
+        'success': True,
+        'strategy_name': strategy_info['name'],
+        'strategy_key': strategy_name,
+        'params_used': strategy_params,
+        'capital_initial': initial_capital,
+        'n_trades': n_trades,
+        **estimate
+    })
+
+
+def _number_list(values, low, high, limit):
+    """Vrai si values est une liste de 1 à limit nombres dans ]low, high]"""
+    return (
+        isinstance(values, list) and 0 < len(values) <= limit
+        and all(isinstance(v, (int, float)) and low < v <= high for v in values)
+    )
+
+
+def _valid_outcomes_config(outcomes_config):
+    """Vrai si outcomes_config associe des outcomes numériques à des poids entiers positifs"""
+    if not isinstance(outcomes_config, dict) or not outcomes_config:
+        return False
+    try:
+        [float(outcome) for outcome in outcomes_config]
+    except ValueError:
+        return False
+    return all(isinstance(weight, int) and weight > 0 for weight in outcomes_config.values())
+
+
+@csrf_exempt
+def drawdown_risk_profile(request):
+    """
+    Probabilités exactes de drawdown et de crash à risque fixe, sans simulation
+    
+    URL: /money-management/risk/drawdown/
+    Method: POST
+    
+    Body: {
+        "outcomes_config": {...},  # optionnel, sinon preset balanced
+        "risks": [0.5, 1, 2, 3, 5],  # optionnel : risques fixes (%) évalués
+        "thresholds": [10, 20, 50],  # optionnel : seuils de drawdown (%)
+        "n_trades": 1000,  # optionnel : horizon
+        "initial_capital": 1000  # optionnel : distance au crash (capital < 1€)
+    }
+    
+    Response: {
+        "success": true,
+        "thresholds": [10, 20, 50],
+        "risks": [{
+            "risk_percent": 1.0,
+            "drawdown_probability": [...],  # P(DD max >= seuil) en n trades
+            "max_drawdown_cdf": [...],  # P(DD max < seuil)
+            "crash_probability": 1.5e-27,
+            "crash_error_bound": 1e-15,
+            "expected_log10_growth": 1.37
+        }, ...]
+    }
+    """
+    if request.method != 'POST':
+        return JsonResponse({'success': False, 'error': 'Method not allowed'}, status=405)
+    
+    try:
+        data = json.loads(request.body) if request.body else {}
+    except json.JSONDecodeError:
+        return JsonResponse({'success': False, 'error': 'Invalid JSON'}, status=400)
+    
+    outcomes_config = data.get('outcomes_config', {
+        '-1': 12, '-5': 2, '2': 3, '3': 2, '4': 1, '5': 1, '9': 1
+    })
+    risks = data.get('risks')
+    thresholds = data.get('thresholds')
+    n_trades = data.get('n_trades', 1000)
+    initial_capital = data.get('initial_capital', 1000)
+    
+    if risks is not None and not _number_list(risks, 0, 20, MAX_RISK_POINTS):
+        return JsonResponse({
+            'success': False,
+            'error': f'risks doit être une liste de 1 à {MAX_RISK_POINTS} risques entre 0 et 20%'
+        }, status=400)
+    if thresholds is not None and not _number_list(thresholds, 0, 99.99, MAX_DRAWDOWN_THRESHOLDS):
+        return JsonResponse({
+            'success': False,
+            'error': f'thresholds doit être une liste de 1 à {MAX_DRAWDOWN_THRESHOLDS} seuils entre 0 et 100%'
+        }, status=400)
+    if not isinstance(n_trades, int) or not 1 <= n_trades <= MAX_ANALYTIC_TRADES:
+        return JsonResponse({
+            'success': False,
+            'error': f'n_trades doit être un entier entre 1 et {MAX_ANALYTIC_TRADES}'
+        }, status=400)
+    if not isinstance(initial_capital, (int, float)) or initial_capital <= 0:
+        return JsonResponse({'success': False, 'error': 'initial_capital doit être positif'}, status=400)
+    if not _valid_outcomes_config(outcomes_config):
+        return JsonResponse({
+            'success': False,
+            'error': 'outcomes_config doit associer des outcomes numériques à des poids entiers positifs'
+        }, status=400)
+    
+    # Calcul déterministe : mis en cache par jeu de paramètres
+    request_key = json.dumps([outcomes_config, risks, thresholds, n_trades, initial_capital], sort_keys=True)
+    cache_key = f'mm:drawdown_risk:{hashlib.md5(request_key.encode()).hexdigest()}'
+    payload = cache.get(cache_key)
+    if payload is None:
+        curves = drawdown_risk_curves(outcomes_config, risks, thresholds, n_trades, initial_capital)
+        payload = {
+            'success': True,
+            'n_trades': n_trades,
+            'initial_capital': initial_capital,
+            **curves
+        }
+        cache.set(cache_key, payload, ANALYTICS_CACHE_TIMEOUT)
+    
+    return JsonResponse(payload)
+
+
 def list_strategies(request):
     """
     Liste toutes les stratégies disponibles
@@ -171,6 +442,54 @@ def batch_runner_view(request):
     })
 
 
+def _saturate(value):
+    """
+    Plafonne une valeur au plus grand float représentable
+    
+    Returns:
+        tuple: (float fini, True si la valeur a été plafonnée)
+    """
+    if math.isfinite(value):
+        return value, False
+    if math.isnan(value):
+        return 0.0, True
+    return math.copysign(sys.float_info.max, value), True
+
+
+def _finite_or_none(value):
+    """None pour les valeurs infinies (non stockables)"""
+    return value if math.isfinite(value) else None
+
+
+def _final_performance_pct(result, initial_capital):
+    """Performance finale (%) d'un résultat de run_simulation, sans overflow"""
+    if result['capital_final'] <= 0:
+        return -100.0
+    return capital_from_log10(result['log10_capital_final'] - math.log10(initial_capital) + 2) - 100
+
+
+def _variance_report(sampler, run_metrics):
+    """Facteurs de réduction de variance (performance finale, drawdown max) d'une configuration"""
+    groups = [sampler.group(i) for i, _, _ in run_metrics]
+    report = {'sampling': sampler.mode, 'runs': len(run_metrics)}
+    for field, position in (('final_performance_pct', 1), ('max_drawdown_pct', 2)):
+        factor = variance_reduction([metrics[position] for metrics in run_metrics], groups)
+        report[field] = round(factor, 3) if factor is not None else None
+    return report
+
+
+def _control_variate_report(risk_percent, expected, control_values):
+    """Estimations par variable de contrôle (croissance log10 et performance finale) d'une configuration"""
+    controls = [control for _, _, control in control_values]
+    report = {'base_risk': risk_percent, 'expected_control': round(expected, 6), 'runs': len(control_values)}
+    for field, position in (('final_log10_growth', 0), ('final_performance_pct', 1)):
+        values = [metrics[position] for metrics in control_values]
+        report[field] = None
+        if all(value is not None for value in values):
+            report[field] = control_variate_estimate(values, controls, expected)
+    return report
+
+
 @csrf_exempt
 def run_batch_simulations(request):
     """
@@ -194,7 +513,13 @@ def run_batch_simulations(request):
                 "initial_capital": 10000,
                 "params": {"base_risk": 0.5, "dd_step": 5, "decay": 0.8}
             }
-        ]
+        ],
+        "seed": 42,  # optionnel : batch reproductible
+        "common_random_numbers": true,  # optionnel : le run i de chaque configuration
+                                        # utilise la même suite d'outcomes (comparaisons appariées)
+        "sampling": "antithetic",  # optionnel : iid (défaut), stratified, antithetic ou rqmc
+        "control_variate": true  # optionnel : estimations corrigées par la stratégie à risque
+                                 # fixe (base_risk) rejouée sur les mêmes outcomes
     }
     """
     if request.method != 'POST':
@@ -205,6 +530,21 @@ def run_batch_simulations(request):
         batch_name = data.get('batch_name', f'Batch {timezone.now().strftime("%Y-%m-%d %H:%M")}')
         simulations_config = data.get('simulations', [])
         save_equity_curves = data.get('save_equity_curves', False)  # Option pour sauvegarder les equity curves
+        common_random_numbers = bool(data.get('common_random_numbers', False))
+        seed = data.get('seed')
+        sampling = data.get('sampling', 'iid')
+        control_variate = bool(data.get('control_variate', False))
+        
+        if sampling not in SAMPLING_MODES:
+            return JsonResponse({
+                'success': False,
+                'error': f'Mode d\'échantillonnage "{sampling}" non supporté ({", ".join(SAMPLING_MODES)})'
+            }, status=400)
+        
+        # Les nombres aléatoires communs et les modes d'échantillonnage
+        # nécessitent une graine (tirée si absente)
+        if seed is None and (common_random_numbers or sampling != 'iid'):
+            seed = random.SystemRandom().getrandbits(62)
         
         if not simulations_config:
             return JsonResponse({'success': False, 'error': 'No simulations configured'}, status=400)
@@ -220,14 +560,18 @@ def run_batch_simulations(request):
             description=f"{len(simulations_config)} configurations de stratégies",
             total_simulations=total_sims,
             status='running',
-            has_equity_curves=save_equity_curves
+            has_equity_curves=save_equity_curves,
+            seed=seed,
+            common_random_numbers=common_random_numbers,
+            sampling=sampling,
+            control_variate=control_variate
         )
         
         # Exécuter toutes les simulations
         completed = 0
         results = []
         
-        for sim_config in simulations_config:
+        for config_index, sim_config in enumerate(simulations_config):
             strategy_key = sim_config.get('strategy_key')
             num_simulations = sim_config.get('num_simulations', 1)
             num_trades = sim_config.get('num_trades', 1000)
@@ -241,12 +585,6 @@ def run_batch_simulations(request):
             strategy_info = STRATEGIES[strategy_key]
             strategy_function = strategy_info['function']
             
-            # Générer un identifiant unique incluant les paramètres
-            # Hash MD5 des paramètres pour différencier les variations
-            params_str = json.dumps(params, sort_keys=True)
-            params_hash = hashlib.md5(params_str.encode()).hexdigest()[:8]
-            unique_strategy_key = f"{strategy_key}_{params_hash}"
-            
             # Utiliser le preset balanced par défaut si outcomes_config n'est pas fourni
             if outcomes_config is None:
                 outcomes_config = {
@@ -259,18 +597,74 @@ def run_batch_simulations(request):
                     '9': 1
                 }
             
+            # Générer un identifiant unique incluant la configuration complète
+            # Hash MD5 pour différencier les variations (paramètres, trades, capital, outcomes)
+            config_str = json.dumps({
+                'params': params,
+                'num_trades': num_trades,
+                'initial_capital': initial_capital,
+                'outcomes_config': outcomes_config
+            }, sort_keys=True)
+            config_hash = hashlib.md5(config_str.encode()).hexdigest()[:8]
+            unique_strategy_key = f"{strategy_key}_{config_hash}"
+            
+            # Configuration enregistrée une seule fois, partagée par tous les runs
+            simulation_config, _ = SimulationConfig.objects.get_or_create(
+                batch_id=batch_id,
+                strategy_key=unique_strategy_key,
+                defaults={
+                    'strategy_name': strategy_info['name'],
+                    'parameters': params,
+                    'num_trades': num_trades,
+                    'initial_capital': initial_capital,
+                    'outcomes_config': outcomes_config
+                }
+            )
+            
+            # Suites d'outcomes à variance réduite (mode d'échantillonnage du batch)
+            seed_prefix = f'{seed}' if common_random_numbers else f'{seed}:{config_index}'
+            sampler = None
+            if sampling != 'iid':
+                sampler = OutcomeSampler(outcomes_config, num_trades, num_simulations, sampling, seed_prefix)
+            run_metrics = []
+            
+            # Variable de contrôle : croissance log10 à risque fixe (base_risk) sur la même
+            # suite d'outcomes, dont l'espérance est connue analytiquement
+            control_risk = None
+            control_expected = None
+            if control_variate:
+                control_risk = max(0.1, min(20, float(params.get('base_risk', strategy_info['params'].get('base_risk', 1.0)))))
+                control_expected = fixed_risk_log10_growth(outcomes_config, control_risk)
+            control_values = []
+            
             # Lancer num_simulations fois cette configuration
             for i in range(num_simulations):
                 try:
                     print(f"[BATCH {batch_id[:8]}] Simulation {completed + 1}/{total_sims} - {strategy_info['name']} (run {i+1}/{num_simulations})")
                     
+                    # Générateur du run : même graine pour le run i de chaque
+                    # configuration en mode nombres aléatoires communs
+                    rng = None
+                    if common_random_numbers:
+                        rng = random.Random(f'{seed}:{i}')
+                    elif seed is not None:
+                        rng = random.Random(f'{seed}:{config_index}:{i}')
+                    
+                    # Suite d'outcomes tirée ici (mêmes tirages que run_simulation)
+                    # quand la variable de contrôle doit la relire
+                    outcomes = sampler.tape(i) if sampler else None
+                    if control_expected is not None and outcomes is None:
+                        outcomes = draw_outcomes(outcomes_config, num_trades, rng)
+                    
                     # Exécuter la simulation
                     result = run_simulation(
                         strategy_function=strategy_function,
                         outcomes_config=outcomes_config,
                         initial_capital=initial_capital,
                         params=params,
-                        n=num_trades
+                        n=num_trades,
+                        rng=rng,
+                        outcomes=outcomes
                     )
                     
                     # Calculer les statistiques
@@ -302,92 +696,77 @@ def run_batch_simulations(request):
                     total_losses = len(trades) - total_wins
                     success_rate = (total_wins / len(trades) * 100) if trades else 0
                     
-                    # Calculer max capital et max performance
+                    # Capital et performances à partir du log10 du capital (sans overflow)
+                    log10_initial = math.log10(initial_capital)
                     equity_curve = result.get('equity_curve', [initial_capital])
-                    max_capital = max(equity_curve)
                     
-                    # Limite maximale stockable dans une base de données (Decimal peut aller jusqu'à 10^28 mais on limite pour la sécurité)
-                    MAX_STORABLE = Decimal('9999999999999')  # ~10 trillions (13 chiffres)
+                    final_log10_growth = result['log10_capital_final'] - log10_initial
+                    max_log10_growth = result['log10_capital_max'] - log10_initial
                     
                     final_capital = result['capital_final']
+                    max_capital = max(equity_curve) if result['capital_exponent'] == 0 else capital_from_log10(result['log10_capital_max'])
+                    final_performance_pct = _final_performance_pct(result, initial_capital)
+                    max_performance_pct = capital_from_log10(max_log10_growth + 2) - 100
                     
-                    # Détection d'overflow et plafonnement
-                    is_overflow = False
-                    try:
-                        final_capital_decimal = Decimal(str(final_capital))
-                        if final_capital_decimal > MAX_STORABLE:
-                            final_capital_decimal = MAX_STORABLE
-                            is_overflow = True
-                    except:
-                        final_capital_decimal = MAX_STORABLE
-                        is_overflow = True
-                    
-                    try:
-                        max_capital_decimal = Decimal(str(max_capital))
-                        if max_capital_decimal > MAX_STORABLE:
-                            max_capital_decimal = MAX_STORABLE
-                            is_overflow = True
-                    except:
-                        max_capital_decimal = MAX_STORABLE
-                        is_overflow = True
-                    
-                    # Calculer les performances (gérer l'overflow)
-                    try:
-                        final_performance_pct = Decimal(str(((float(final_capital_decimal) - initial_capital) / initial_capital) * 100))
-                        if final_performance_pct > MAX_STORABLE:
-                            final_performance_pct = MAX_STORABLE
-                    except:
-                        final_performance_pct = MAX_STORABLE
-                    
-                    try:
-                        max_performance_pct = Decimal(str(((float(max_capital_decimal) - initial_capital) / initial_capital) * 100))
-                        if max_performance_pct > MAX_STORABLE:
-                            max_performance_pct = MAX_STORABLE
-                    except:
-                        max_performance_pct = MAX_STORABLE
+                    # Métriques stockées en float natif : seules les valeurs hors de la plage
+                    # des floats sont plafonnées, la valeur exacte reste en log10
+                    display = {}
+                    is_saturated = False
+                    for field, value in (
+                        ('final_capital', final_capital),
+                        ('max_capital', max_capital),
+                        ('final_performance_pct', final_performance_pct),
+                        ('max_performance_pct', max_performance_pct),
+                        ('avg_risk_amount', scale_capital(avg_risk_amount, result['capital_exponent'])),
+                        ('avg_profit_loss', scale_capital(avg_profit_loss, result['capital_exponent'])),
+                    ):
+                        display[field], saturated = _saturate(value)
+                        is_saturated = is_saturated or saturated
                     
                     # Sauvegarder dans la base de données
                     try:
                         # Préparer l'equity curve si demandé
                         equity_curve_data = None
                         if save_equity_curves:
-                            equity_curve_data = [round(float(val), 2) for val in equity_curve]
+                            equity_curve_data = [_saturate(val)[0] for val in equity_curve]
                         
                         sim_result = SimulationResult.objects.create(
-                            strategy_name=strategy_info['name'],
-                            strategy_key=unique_strategy_key,
-                            parameters=params,
-                            num_trades=num_trades,
-                            initial_capital=Decimal(str(initial_capital)),
-                            final_capital=final_capital_decimal,
-                            final_performance_pct=final_performance_pct,
-                            max_capital=max_capital_decimal,
-                            max_drawdown_pct=Decimal(str(result['drawdown_max'])),
-                            max_performance_pct=max_performance_pct,
-                            avg_risk_pct=Decimal(str(avg_risk_pct)),
-                            avg_risk_amount=Decimal(str(min(avg_risk_amount, float(MAX_STORABLE)))),
-                            avg_profit_loss=Decimal(str(min(avg_profit_loss, float(MAX_STORABLE)))),
+                            config=simulation_config,
+                            run_index=i,
+                            max_drawdown_pct=result['drawdown_max'],
+                            avg_risk_pct=avg_risk_pct,
                             max_consecutive_wins=max_consecutive_wins,
                             max_consecutive_losses=max_consecutive_losses,
-                            success_rate=Decimal(str(success_rate)),
+                            success_rate=success_rate,
                             total_wins=total_wins,
                             total_losses=total_losses,
+                            final_log10_growth=_finite_or_none(final_log10_growth),
+                            max_log10_growth=_finite_or_none(max_log10_growth),
+                            is_saturated=is_saturated,
                             batch_id=batch_id,
-                            equity_curve=equity_curve_data  # Sauvegarder l'equity curve si demandé
+                            equity_curve=equity_curve_data,  # Sauvegarder l'equity curve si demandé
+                            **display
                         )
                         
                         completed += 1
+                        run_metrics.append((i, sim_result.final_performance_pct, sim_result.max_drawdown_pct))
+                        if control_expected is not None:
+                            control_values.append((
+                                sim_result.final_log10_growth,
+                                sim_result.final_performance_pct,
+                                sum(math.log10(1 + control_risk / 100 * x) for x in outcomes)
+                            ))
                         
-                        if is_overflow:
-                            print(f"  ✅ Terminé (OVERFLOW MAX) - Perf: >{sim_result.final_performance_pct:.2f}% | DD: {sim_result.max_drawdown_pct:.2f}%")
+                        if is_saturated:
+                            print(f"  ✅ Terminé (SATURÉ, log10 croissance: {final_log10_growth:.2f}) - Perf: >{sim_result.final_performance_pct:.2f}% | DD: {sim_result.max_drawdown_pct:.2f}%")
                         else:
                             print(f"  ✅ Terminé - Perf: {sim_result.final_performance_pct:.2f}% | DD: {sim_result.max_drawdown_pct:.2f}%")
                         
                         results.append({
                             'id': sim_result.id,
                             'strategy': strategy_info['name'],
-                            'final_performance': float(sim_result.final_performance_pct),
-                            'max_drawdown': float(sim_result.max_drawdown_pct)
+                            'final_performance': round(sim_result.final_performance_pct, 2),
+                            'max_drawdown': round(sim_result.max_drawdown_pct, 2)
                         })
                     except Exception as db_error:
                         print(f"  ❌ Erreur DB: {str(db_error)}")
@@ -396,11 +775,21 @@ def run_batch_simulations(request):
                 except Exception as e:
                     print(f"  ❌ Erreur simulation {i+1}: {str(e)}")
                     continue
+            
+            # Réduction de variance obtenue par le mode d'échantillonnage
+            if sampler and run_metrics:
+                simulation_config.variance_report = _variance_report(sampler, run_metrics)
+                simulation_config.save(update_fields=['variance_report'])
+            
+            if control_expected is not None and control_values:
+                simulation_config.control_variate = _control_variate_report(control_risk, control_expected * num_trades, control_values)
+                simulation_config.save(update_fields=['control_variate'])
         
-        # Mettre à jour le batch
+        # Mettre à jour le batch (avec ses chiffres clés pour la liste des batches)
         batch.completed_simulations = completed
         batch.status = 'completed'
         batch.completed_at = timezone.now()
+        batch.update_headline()
         batch.save()
         
         print('=' * 80)
@@ -426,12 +815,635 @@ def run_batch_simulations(request):
         }, status=500)
 
 
+# Balayage de paramètres : valeurs par axe / chemins par cellule
+MAX_SWEEP_AXIS_VALUES = 50
+MAX_SWEEP_PATHS = 2000
+
+
+def _sweep_axis(spec, declared_params):
+    """
+    Axe d'un balayage : {"param": "dd1", "values": [...]} ou {"param": "dd1", "start": 2, "stop": 20, "steps": 10}
+    
+    Les valeurs sont arrondies à l'entier pour les paramètres entiers de la stratégie.
+    
+    Returns:
+        tuple: (nom du paramètre, liste des valeurs sans doublon)
+    """
+    param = spec.get('param')
+    if param not in declared_params:
+        raise ValueError(f'Paramètre "{param}" inconnu ({", ".join(declared_params)})')
+    
+    if 'values' in spec:
+        values = [float(value) for value in spec['values']]
+    else:
+        start, stop = float(spec['start']), float(spec['stop'])
+        steps = min(max(int(spec.get('steps', 10)), 2), MAX_SWEEP_AXIS_VALUES)
+        values = [start + (stop - start) * i / (steps - 1) for i in range(steps)]
+    
+    if isinstance(declared_params[param], int):
+        values = [round(value) for value in values]
+    values = list(dict.fromkeys(values))
+    
+    if not 1 <= len(values) <= MAX_SWEEP_AXIS_VALUES:
+        raise ValueError(f'Axe "{param}" : entre 1 et {MAX_SWEEP_AXIS_VALUES} valeurs')
+    return param, values
+
+
+def _sweep_heatmaps(sweep, cells):
+    """
+    Heatmaps d'un balayage : pour chaque métrique, une ligne par valeur de y, une colonne par valeur de x
+    
+    Args:
+        sweep: Axes du balayage (SimulationBatch.sweep)
+        cells: Liste de (paramètres, résumé) des cellules
+    """
+    x, y = sweep['x'], sweep['y']
+    rows = len(y['values']) if y else 1
+    heatmaps = {metric: [[None] * len(x['values']) for _ in range(rows)] for metric in SWEEP_METRICS}
+    for params, summary in cells:
+        column = x['values'].index(params[x['param']])
+        row = y['values'].index(params[y['param']]) if y else 0
+        for metric in SWEEP_METRICS:
+            heatmaps[metric][row][column] = summary[metric]
+    return heatmaps
+
+
+def _complete_summary_batch(batch, strategy_key, cells, runs, num_trades, initial_capital, outcomes_config):
+    """
+    Enregistre les configurations d'un balayage ou d'une optimisation et termine le batch
+    
+    Une configuration par jeu de paramètres avec le résumé de ses runs, clé
+    calculée comme pour un batch classique ; chiffres clés du batch calculés
+    sur les runs en mémoire.
+    
+    Args:
+        cells: Liste de (paramètres, résumé)
+        runs: Runs (performance %, drawdown max %, crash) de chaque jeu de paramètres
+    
+    Returns:
+        SimulationConfig: Configuration de meilleure performance moyenne
+    """
+    configs = []
+    for params, summary in cells:
+        config_str = json.dumps({
+            'params': params,
+            'num_trades': num_trades,
+            'initial_capital': initial_capital,
+            'outcomes_config': outcomes_config
+        }, sort_keys=True)
+        configs.append(SimulationConfig(
+            batch_id=batch.batch_id,
+            strategy_key=f"{strategy_key}_{hashlib.md5(config_str.encode()).hexdigest()[:8]}",
+            strategy_name=STRATEGIES[strategy_key]['name'],
+            parameters=params,
+            num_trades=num_trades,
+            initial_capital=initial_capital,
+            outcomes_config=outcomes_config,
+            summary=summary
+        ))
+    SimulationConfig.objects.bulk_create(configs)
+    
+    best = max(configs, key=lambda config: config.summary['mean_performance_pct'])
+    performances = sorted(performance for cell_runs in runs for performance, _, _ in cell_runs)
+    middle = performances[(len(performances) - 1) // 2:len(performances) // 2 + 1]
+    batch.best_strategy_key = best.strategy_key
+    batch.best_strategy_name = best.strategy_name
+    batch.median_performance_pct = sum(middle) / len(middle)
+    batch.worst_drawdown_pct = min(max_drawdown for cell_runs in runs for _, max_drawdown, _ in cell_runs)
+    batch.completed_simulations = len(performances)
+    batch.total_simulations = len(performances)
+    batch.status = 'completed'
+    batch.completed_at = timezone.now()
+    batch.save()
+    return best
+
+
+def _sync_num_trades(value):
+    """Nombre de trades par chemin d'un calcul synchrone (1 à MAX_ANALYTIC_TRADES)"""
+    num_trades = int(value)
+    if not 1 <= num_trades <= MAX_ANALYTIC_TRADES:
+        raise ValueError(f'num_trades doit être un entier entre 1 et {MAX_ANALYTIC_TRADES}')
+    return num_trades
+
+
+def _check_sync_budget(label, simulations, num_trades):
+    """Refuse un calcul synchrone de plus de MAX_SYNC_SIMULATED_TRADES trades simulés"""
+    if simulations * num_trades > MAX_SYNC_SIMULATED_TRADES:
+        raise ValueError(
+            f'{label} : {simulations} simulations × {num_trades} trades dépassent la limite de '
+            f'{MAX_SYNC_SIMULATED_TRADES} trades simulés par requête (réduire la grille, num_paths ou num_trades)'
+        )
+
+
+@csrf_exempt
+def run_parameter_sweep(request):
+    """
+    Balaye une grille de paramètres (1 ou 2 axes) d'une stratégie en un seul passage
+    
+    POST /money-management/sweep/run/
+    Body: {
+        "strategy_key": "strategy_1",
+        "x": {"param": "dd1", "start": 2, "stop": 20, "steps": 20},
+        "y": {"param": "dd2", "values": [20, 25, 30, 40]},  # optionnel : balayage 1-D
+        "params": {"base_risk": 1.0},  # optionnel : autres paramètres (défaut: ceux de la stratégie)
+        "num_paths": 200,
+        "num_trades": 1000,
+        "initial_capital": 10000,
+        "outcomes_config": {...},  # optionnel (défaut: preset balanced)
+        "seed": 42  # optionnel
+    }
+    
+    Chaque chemin tire une suite d'outcomes rejouée par toutes les cellules
+    (voir sweep.run_sweep). Le balayage est enregistré comme un batch : une
+    configuration par cellule avec le résumé de ses runs (les runs eux-mêmes
+    ne sont pas stockés), relu par /batch/<batch_id>/heatmap/.
+    
+    Le balayage s'exécute dans la requête : num_trades est limité à
+    MAX_ANALYTIC_TRADES et cellules × chemins × trades à MAX_SYNC_SIMULATED_TRADES.
+    """
+    if request.method != 'POST':
+        return JsonResponse({'success': False, 'error': 'Method not allowed'}, status=405)
+    
+    try:
+        data = json.loads(request.body)
+        strategy_key = data.get('strategy_key')
+        if strategy_key not in STRATEGIES:
+            return JsonResponse({'success': False, 'error': f'Strategy "{strategy_key}" not found'}, status=404)
+        strategy_info = STRATEGIES[strategy_key]
+        
+        try:
+            x_param, x_values = _sweep_axis(data.get('x') or {}, strategy_info['params'])
+            y_param, y_values = _sweep_axis(data['y'], strategy_info['params']) if data.get('y') else (None, None)
+            if x_param == y_param:
+                raise ValueError('Les deux axes doivent porter sur des paramètres différents')
+            unknown = set(data.get('params', {})) - set(strategy_info['params'])
+            if unknown:
+                raise ValueError(f'Paramètres inconnus : {", ".join(sorted(unknown))}')
+            num_paths = min(max(int(data.get('num_paths', 200)), 1), MAX_SWEEP_PATHS)
+            num_trades = _sync_num_trades(data.get('num_trades', 1000))
+            initial_capital = float(data.get('initial_capital', 10000))
+            if not 0 < initial_capital < math.inf:
+                raise ValueError('initial_capital doit être positif')
+            cells = len(x_values) * (len(y_values) if y_values else 1)
+            _check_sync_budget(f'{cells} configurations', cells * num_paths, num_trades)
+        except (KeyError, TypeError, ValueError) as e:
+            return JsonResponse({'success': False, 'error': str(e)}, status=400)
+        
+        outcomes_config = data.get('outcomes_config') or {
+            '-1': 12, '-5': 2, '2': 3, '3': 2, '4': 1, '5': 1, '9': 1
+        }
+        if not _valid_outcomes_config(outcomes_config):
+            return JsonResponse({'success': False, 'error': 'outcomes_config invalide'}, status=400)
+        
+        seed = data.get('seed')
+        if seed is None:
+            seed = random.SystemRandom().getrandbits(62)
+        
+        base_params = {**strategy_info['params'], **data.get('params', {})}
+        grid = parameter_grid(base_params, x_param, x_values, y_param, y_values)
+        sweep = {
+            'strategy_key': strategy_key,
+            'x': {'param': x_param, 'values': x_values},
+            'y': {'param': y_param, 'values': y_values} if y_param else None,
+            'engine': 'kernel' if strategy_key in SWEEP_KERNELS else 'run_simulation'
+        }
+        
+        batch_id = str(uuid.uuid4())
+        axes = f"{x_param} × {y_param}" if y_param else x_param
+        batch = SimulationBatch.objects.create(
+            batch_id=batch_id,
+            name=data.get('batch_name', f'Balayage {strategy_info["name"]} ({axes})'),
+            description=f"Balayage {axes} : {len(grid)} configurations × {num_paths} chemins",
+            total_simulations=len(grid) * num_paths,
+            status='running',
+            seed=seed,
+            common_random_numbers=True,
+            sweep=sweep
+        )
+        
+        print(f"[SWEEP {batch_id[:8]}] {strategy_info['name']} - {len(grid)} configurations × {num_paths} chemins × {num_trades} trades ({sweep['engine']})")
+        started = time.perf_counter()
+        try:
+            runs = run_sweep(strategy_key, outcomes_config, grid, initial_capital, num_trades, num_paths, seed)
+            elapsed = time.perf_counter() - started
+            
+            cells = [(params, summarize_runs(cell_runs)) for params, cell_runs in zip(grid, runs)]
+            best = _complete_summary_batch(batch, strategy_key, cells, runs, num_trades, initial_capital, outcomes_config)
+        except Exception:
+            batch.status = 'failed'
+            batch.save(update_fields=['status'])
+            raise
+        
+        print(f"✅ BALAYAGE TERMINÉ en {elapsed:.1f}s - meilleure configuration : {best.strategy_key} {best.parameters}")
+        
+        return JsonResponse({
+            'success': True,
+            'batch_id': batch_id,
+            **sweep,
+            'num_paths': num_paths,
+            'num_trades': num_trades,
+            'seed': seed,
+            'elapsed_seconds': round(elapsed, 3),
+            'metrics': SWEEP_METRICS,
+            'heatmaps': _sweep_heatmaps(sweep, cells)
+        })
+        
+    except Exception as e:
+        return JsonResponse({
+            'success': False,
+            'error': str(e)
+        }, status=500)
+
+
+def get_sweep_heatmap(request, batch_id):
+    """
+    Heatmaps d'un balayage de paramètres enregistré
+    
+    GET /money-management/batch/<batch_id>/heatmap/
+    """
+    batch = SimulationBatch.objects.filter(batch_id=batch_id).first()
+    if batch is None or not batch.sweep or 'x' not in batch.sweep:
+        return JsonResponse({'success': False, 'error': 'Balayage introuvable'}, status=404)
+    
+    cells = SimulationConfig.objects.filter(batch_id=batch_id, summary__isnull=False).values_list('parameters', 'summary')
+    
+    return JsonResponse({
+        'success': True,
+        'batch_id': batch_id,
+        **batch.sweep,
+        'num_paths': batch.total_simulations // max(len(cells), 1),
+        'metrics': SWEEP_METRICS,
+        'heatmaps': _sweep_heatmaps(batch.sweep, cells)
+    })
+
+
+# Critères de la frontière de Pareto : sens d'optimisation des métriques du résumé
+# (les drawdowns sont négatifs : le meilleur est le plus proche de 0)
+PARETO_METRICS = {
+    'mean_performance_pct': 'max',
+    'median_performance_pct': 'max',
+    'p05_performance_pct': 'max',
+    'median_drawdown_pct': 'max',
+    'p95_drawdown_pct': 'max',
+    'crash_rate': 'min',
+}
+
+
+def _config_summaries(batch):
+    """
+    Configurations d'un batch avec leur résumé (voir sweep.summarize_runs)
+    
+    Les balayages ont leurs résumés dès la création ; ceux d'un batch classique
+    sont calculés depuis ses résultats (crash : capital final < 1) puis
+    enregistrés une fois le batch terminé.
+    """
+    configs = list(SimulationConfig.objects.filter(batch_id=batch.batch_id))
+    missing = {config.id: config for config in configs if config.summary is None}
+    if missing:
+        results = SimulationResult.objects.filter(batch_id=batch.batch_id, config_id__in=missing)
+        columns = read_columns(results, ['final_performance_pct', 'max_drawdown_pct', 'final_capital'])
+        for config_id, column in columns.items():
+            missing[config_id].summary = summarize_runs([
+                (performance, max_drawdown, final_capital < 1)
+                for performance, max_drawdown, final_capital in zip(
+                    column['final_performance_pct'], column['max_drawdown_pct'], column['final_capital']
+                )
+            ])
+        if batch.status == 'completed':
+            SimulationConfig.objects.bulk_update([config for config in missing.values() if config.summary], ['summary'])
+    return [config for config in configs if config.summary]
+
+
+def get_pareto_frontier(request, batch_id):
+    """
+    Frontière de Pareto (configurations non dominées) d'un batch ou d'un balayage
+    
+    GET /money-management/batch/<batch_id>/pareto/?metrics=median_performance_pct,p95_drawdown_pct
+    
+    2 ou 3 métriques parmi PARETO_METRICS. Les configurations de la frontière
+    sont renvoyées avec leurs paramètres complets (réutilisables tels quels dans
+    un batch ou comme référence), triées sur la première métrique.
+    """
+    metrics = [metric for metric in request.GET.get('metrics', 'median_performance_pct,p95_drawdown_pct').split(',') if metric]
+    if not 2 <= len(set(metrics)) == len(metrics) <= 3 or not all(metric in PARETO_METRICS for metric in metrics):
+        return JsonResponse({
+            'success': False,
+            'error': f'2 ou 3 métriques distinctes parmi : {", ".join(PARETO_METRICS)}'
+        }, status=400)
+    
+    batch = SimulationBatch.objects.filter(batch_id=batch_id).first()
+    if batch is None:
+        return JsonResponse({'success': False, 'error': 'Batch not found'}, status=404)
+    
+    configs = _config_summaries(batch)
+    signs = [1 if PARETO_METRICS[metric] == 'max' else -1 for metric in metrics]
+    points = [tuple(sign * config.summary[metric] for sign, metric in zip(signs, metrics)) for config in configs]
+    frontier = [configs[index] for index in pareto_frontier(points)]
+    frontier.sort(key=lambda config: signs[0] * config.summary[metrics[0]], reverse=True)
+    
+    return JsonResponse({
+        'success': True,
+        'batch_id': batch_id,
+        'metrics': [{'name': metric, 'sense': PARETO_METRICS[metric]} for metric in metrics],
+        'total_configurations': len(configs),
+        'frontier': [
+            {
+                'strategy_key': config.strategy_key,
+                'strategy_name': config.strategy_name,
+                'parameters': config.parameters,
+                **{metric: config.summary[metric] for metric in metrics},
+                'summary': config.summary
+            }
+            for config in frontier
+        ]
+    })
+
+
+# Optimisation : lots TPE / chemins par bloc d'évaluation
+MAX_OPTIMIZER_ROUNDS = 50
+MAX_OPTIMIZER_BATCH_SIZE = 16
+
+
+def _optimizer_constraint(spec):
+    """
+    Valide la contrainte d'une optimisation
+    
+    Args:
+        spec: {"metric": ..., "min": ..., "max": ...} (au moins une borne), ou None
+    
+    Returns:
+        dict: Contrainte avec ses bornes en float, ou None
+    """
+    if spec is None:
+        return None
+    if not isinstance(spec, dict):
+        raise ValueError('constraint doit être un objet {"metric", "min" et/ou "max"}')
+    if spec.get('metric') not in PARETO_METRICS:
+        raise ValueError(f'Contrainte sur une métrique inconnue ({", ".join(PARETO_METRICS)})')
+    
+    constraint = {'metric': spec['metric']}
+    for bound in ('min', 'max'):
+        value = spec.get(bound)
+        if value is None:
+            continue
+        if isinstance(value, bool) or not isinstance(value, (int, float)) or not math.isfinite(value):
+            raise ValueError(f'Borne "{bound}" de la contrainte non numérique : {value!r}')
+        constraint[bound] = float(value)
+    if len(constraint) == 1:
+        raise ValueError('La contrainte doit avoir une borne "min" et/ou "max"')
+    if constraint.get('min', -math.inf) > constraint.get('max', math.inf):
+        raise ValueError('Borne "min" de la contrainte supérieure à sa borne "max"')
+    return constraint
+
+
+@csrf_exempt
+def optimize_strategy(request, strategy_key):
+    """
+    Optimisation bayésienne (TPE) des paramètres d'une stratégie
+    
+    POST /money-management/optimize/<strategy_key>/
+    Body: {
+        "space": {"dd1": [2, 20], "dd2": [10, 50]},  # optionnel (défaut: tous les paramètres, ×0.5 à ×2)
+        "params": {"base_risk": 1.0},  # optionnel : paramètres fixes hors du domaine
+        "objective": "median_performance_pct",  # métrique de PARETO_METRICS
+        "constraint": {"metric": "p95_drawdown_pct", "min": -30},  # optionnel
+        "rounds": 8, "batch_size": 4, "num_paths": 100,
+        "num_trades": 1000, "initial_capital": 10000,
+        "outcomes_config": {...}, "seed": 42,
+        "save_reference": true  # meilleurs paramètres enregistrés dans StrategyReference (s'ils respectent la contrainte)
+    }
+    
+    Chaque lot de candidats est évalué en parallèle sur des chemins communs
+    (voir optimizer.optimize) ; les candidats sont enregistrés comme un batch
+    (résumés par configuration, frontière de Pareto disponible).
+    
+    L'optimisation s'exécute dans la requête : num_trades est limité à
+    MAX_ANALYTIC_TRADES et blocs d'évaluation × chemins × trades (au pire, voir
+    optimizer.evaluation_blocks) à MAX_SYNC_SIMULATED_TRADES.
+    """
+    if request.method != 'POST':
+        return JsonResponse({'success': False, 'error': 'Method not allowed'}, status=405)
+    
+    if strategy_key not in STRATEGIES:
+        return JsonResponse({'success': False, 'error': f'Strategy "{strategy_key}" not found'}, status=404)
+    strategy_info = STRATEGIES[strategy_key]
+    
+    try:
+        data = json.loads(request.body) if request.body else {}
+        
+        try:
+            domain = parameter_space(strategy_info['params'], data.get('space'))
+            if not domain:
+                raise ValueError('Domaine de recherche vide')
+            objective = data.get('objective', 'median_performance_pct')
+            if objective not in PARETO_METRICS:
+                raise ValueError(f'Objectif "{objective}" inconnu ({", ".join(PARETO_METRICS)})')
+            constraint = _optimizer_constraint(data.get('constraint'))
+            unknown = set(data.get('params', {})) - set(strategy_info['params'])
+            if unknown:
+                raise ValueError(f'Paramètres inconnus : {", ".join(sorted(unknown))}')
+            rounds = min(max(int(data.get('rounds', 8)), 0), MAX_OPTIMIZER_ROUNDS)
+            batch_size = min(max(int(data.get('batch_size', 4)), 1), MAX_OPTIMIZER_BATCH_SIZE)
+            num_paths = min(max(int(data.get('num_paths', 100)), 1), MAX_SWEEP_PATHS)
+            num_trades = _sync_num_trades(data.get('num_trades', 1000))
+            initial_capital = float(data.get('initial_capital', 10000))
+            if not 0 < initial_capital < math.inf:
+                raise ValueError('initial_capital doit être positif')
+            blocks = evaluation_blocks(len(domain), rounds, batch_size)
+            _check_sync_budget(f'{blocks} blocs d\'évaluation', blocks * num_paths, num_trades)
+        except (KeyError, TypeError, ValueError) as e:
+            return JsonResponse({'success': False, 'error': str(e)}, status=400)
+        
+        outcomes_config = data.get('outcomes_config') or {
+            '-1': 12, '-5': 2, '2': 3, '3': 2, '4': 1, '5': 1, '9': 1
+        }
+        if not _valid_outcomes_config(outcomes_config):
+            return JsonResponse({'success': False, 'error': 'outcomes_config invalide'}, status=400)
+        
+        seed = data.get('seed')
+        if seed is None:
+            seed = random.SystemRandom().getrandbits(62)
+        
+        batch_id = str(uuid.uuid4())
+        batch = SimulationBatch.objects.create(
+            batch_id=batch_id,
+            name=data.get('batch_name', f'Optimisation {strategy_info["name"]} ({objective})'),
+            description=f"Optimisation TPE de {', '.join(domain)}",
+            total_simulations=0,
+            status='running',
+            seed=seed,
+            common_random_numbers=True,
+            sweep={
+                'strategy_key': strategy_key,
+                'optimizer': 'tpe',
+                'objective': objective,
+                'constraint': constraint,
+                'space': {name: [low, high] for name, (low, high, _, _) in domain.items()}
+            }
+        )
+        
+        print(f"[OPTIM {batch_id[:8]}] {strategy_info['name']} - {len(domain)} paramètres, {rounds} lots de {batch_size} ({objective})")
+        started = time.perf_counter()
+        try:
+            result = optimize(
+                strategy_key, outcomes_config, domain, {**strategy_info['params'], **data.get('params', {})},
+                objective, PARETO_METRICS[objective], constraint,
+                initial_capital=initial_capital, n=num_trades, n_paths=num_paths,
+                rounds=rounds, batch_size=batch_size, seed=seed
+            )
+            elapsed = time.perf_counter() - started
+            
+            candidates = result['candidates']
+            _complete_summary_batch(
+                batch, strategy_key, [(candidate['params'], candidate['summary']) for candidate in candidates],
+                [candidate['runs'] for candidate in candidates], num_trades, initial_capital, outcomes_config
+            )
+        except Exception:
+            batch.status = 'failed'
+            batch.save(update_fields=['status'])
+            raise
+        
+        best = result['best']
+        feasible = best['score'][0] == 0
+        reference_saved, reference_error = False, None
+        if data.get('save_reference', True):
+            # Une référence choisie par l'utilisateur n'est remplacée que par un candidat admissible
+            if feasible:
+                StrategyReference.objects.update_or_create(
+                    strategy_key=strategy_key,
+                    defaults={
+                        'strategy_name': strategy_info['name'],
+                        'reference_params': best['params']
+                    }
+                )
+                reference_saved = True
+            else:
+                reference_error = 'Aucun candidat ne respecte la contrainte : référence inchangée'
+        
+        print(f"✅ OPTIMISATION TERMINÉE en {elapsed:.1f}s - {result['simulations']} simulations - {objective}: {best['summary'][objective]:.2f} - {best['params']}")
+        
+        return JsonResponse({
+            'success': True,
+            'batch_id': batch_id,
+            'strategy_key': strategy_key,
+            'objective': objective,
+            'constraint': constraint,
+            'best': {
+                'params': best['params'],
+                'runs': len(best['runs']),
+                'feasible': feasible,
+                'summary': best['summary']
+            },
+            'reference_saved': reference_saved,
+            'reference_error': reference_error,
+            'evaluations': len(candidates),
+            'simulations': result['simulations'],
+            'elapsed_seconds': round(elapsed, 3),
+            'history': [
+                {
+                    'round': candidate['round'],
+                    'params': {name: candidate['params'][name] for name in domain},
+                    'runs': len(candidate['runs']),
+                    'feasible': candidate['score'][0] == 0,
+                    objective: candidate['summary'][objective]
+                }
+                for candidate in candidates
+            ]
+        })
+        
+    except Exception as e:
+        return JsonResponse({
+            'success': False,
+            'error': str(e)
+        }, status=500)
+
+
+# Analyse de sensibilité : lignes N du plan de Saltelli
+MAX_SOBOL_SAMPLES = 512
+
+
+@csrf_exempt
+def sensitivity_analysis(request, strategy_key):
+    """
+    Lance une analyse de sensibilité globale (indices de Sobol) des paramètres d'une stratégie
+    
+    POST /money-management/sensitivity/<strategy_key>/
+    Body: {
+        "space": {"dd_threshold": [5, 20], ...},  # optionnel (défaut: tous les paramètres, ×0.5 à ×2)
+        "params": {...},  # optionnel : paramètres fixes hors du domaine
+        "n_samples": 32,  # lignes N du plan : N (d + 2) évaluations
+        "num_paths": 50, "num_trades": 1000, "initial_capital": 10000,
+        "outcomes_config": {...}, "seed": 42
+    }
+    
+    Le job tourne en arrière-plan ; indices de premier ordre et totaux de
+    chaque métrique sur /money-management/sensitivity/job/<job_id>/.
+    """
+    if request.method != 'POST':
+        return JsonResponse({'success': False, 'error': 'Method not allowed'}, status=405)
+    
+    if strategy_key not in STRATEGIES:
+        return JsonResponse({'success': False, 'error': f'Strategy "{strategy_key}" not found'}, status=404)
+    strategy_info = STRATEGIES[strategy_key]
+    
+    try:
+        data = json.loads(request.body) if request.body else {}
+        domain = parameter_space(strategy_info['params'], data.get('space'))
+        if not domain:
+            raise ValueError('Domaine de recherche vide')
+        unknown = set(data.get('params', {})) - set(strategy_info['params'])
+        if unknown:
+            raise ValueError(f'Paramètres inconnus : {", ".join(sorted(unknown))}')
+        n_samples = min(max(int(data.get('n_samples', 32)), 4), MAX_SOBOL_SAMPLES)
+        num_paths = min(max(int(data.get('num_paths', 50)), 1), MAX_SWEEP_PATHS)
+        num_trades = max(int(data.get('num_trades', 1000)), 1)
+        initial_capital = float(data.get('initial_capital', 10000))
+        if not 0 < initial_capital < math.inf:
+            raise ValueError('initial_capital doit être positif')
+    except (KeyError, TypeError, ValueError) as e:
+        return JsonResponse({'success': False, 'error': str(e)}, status=400)
+    
+    outcomes_config = data.get('outcomes_config') or {
+        '-1': 12, '-5': 2, '2': 3, '3': 2, '4': 1, '5': 1, '9': 1
+    }
+    if not _valid_outcomes_config(outcomes_config):
+        return JsonResponse({'success': False, 'error': 'outcomes_config invalide'}, status=400)
+    
+    seed = data.get('seed')
+    if seed is None:
+        seed = random.SystemRandom().getrandbits(62)
+    
+    job = start_sensitivity(
+        strategy_key, outcomes_config, domain, {**strategy_info['params'], **data.get('params', {})},
+        n=n_samples, n_paths=num_paths, num_trades=num_trades, initial_capital=initial_capital, seed=seed
+    )
+    print(f"[SOBOL {job['job_id'][:8]}] {strategy_info['name']} - {len(domain)} paramètres, {job['evaluations']} évaluations × {num_paths} chemins")
+    
+    return JsonResponse({'success': True, 'job': {**job, 'result': None}})
+
+
+def sensitivity_status(request, job_id):
+    """
+    Statut d'une analyse de sensibilité (indices une fois terminée)
+    
+    GET /money-management/sensitivity/job/<job_id>/
+    """
+    job = sensitivity_job(job_id)
+    if job is None:
+        return JsonResponse({'success': False, 'error': 'Job not found'}, status=404)
+    
+    return JsonResponse({'success': True, 'job': job})
+
+
 @csrf_exempt
 def delete_batch(request, batch_id):
     """
     Supprime un batch et toutes ses simulations
     
     DELETE /money-management/batch/<batch_id>/delete/
+    
+    Les résultats sont supprimés par paquets en SQL brut, puis une compaction
+    de la base est lancée en arrière-plan (voir compaction_status).
     """
     if request.method != 'POST' and request.method != 'DELETE':
         return JsonResponse({'success': False, 'error': 'Method not allowed'}, status=405)
@@ -440,19 +1452,17 @@ def delete_batch(request, batch_id):
         batch = SimulationBatch.objects.get(batch_id=batch_id)
         batch_name = batch.name
         
-        # Compter les simulations avant suppression
-        num_simulations = SimulationResult.objects.filter(batch_id=batch_id).count()
+        # Supprimer les simulations, les configurations et le batch
+        num_simulations = purge_batch(batch_id)
         
-        # Supprimer toutes les simulations associées
-        SimulationResult.objects.filter(batch_id=batch_id).delete()
-        
-        # Supprimer le batch
-        batch.delete()
+        # Récupérer l'espace libéré sans bloquer la requête
+        job = start_compaction()
         
         return JsonResponse({
             'success': True,
             'message': f'Batch "{batch_name}" supprimé avec succès',
-            'deleted_simulations': num_simulations
+            'deleted_simulations': num_simulations,
+            'compaction_job': job['job_id']
         })
         
     except SimulationBatch.DoesNotExist:
@@ -467,15 +1477,76 @@ def delete_batch(request, batch_id):
         }, status=500)
 
 
+@csrf_exempt
+def compact_database(request):
+    """
+    Lance une compaction de la base en arrière-plan
+    
+    POST /money-management/maintenance/compact/
+    """
+    if request.method != 'POST':
+        return JsonResponse({'success': False, 'error': 'Method not allowed'}, status=405)
+    
+    return JsonResponse({'success': True, 'job': start_compaction()})
+
+
+def compaction_status(request, job_id):
+    """
+    Statut d'un job de compaction (octets récupérés inclus)
+    
+    Un job 'skipped' n'a rien fait ; 'reason' en donne la cause (base non
+    SQLite, ou auto_vacuum pas encore passé en INCREMENTAL par la migration).
+    
+    GET /money-management/maintenance/compact/<job_id>/
+    """
+    job = compaction_job(job_id)
+    if job is None:
+        return JsonResponse({'success': False, 'error': 'Job not found'}, status=404)
+    
+    return JsonResponse({'success': True, 'job': job})
+
+
+# Nombre de batches par page dans la liste des résultats
+BATCHES_PER_PAGE = 25
+
+
 def batch_results_view(request):
     """
     Vue pour afficher les résultats des simulations batch
+    
+    GET params:
+        - q: recherche dans le nom du batch
+        - status: filtrer par statut
+        - equity: '1' pour ne garder que les batches avec equity curves
+        - page: numéro de page
     """
-    # Récupérer tous les batches
-    batches = SimulationBatch.objects.all()
+    # Liste paginée : seules les colonnes affichées sont lues
+    batches = SimulationBatch.objects.only(
+        'batch_id', 'name', 'status', 'total_simulations', 'completed_simulations',
+        'has_equity_curves', 'best_strategy_name', 'median_performance_pct',
+        'worst_drawdown_pct', 'created_at'
+    )
+    
+    filters = {
+        'q': request.GET.get('q', '').strip(),
+        'status': request.GET.get('status', ''),
+        'equity': request.GET.get('equity', '')
+    }
+    if filters['q']:
+        batches = batches.filter(name__icontains=filters['q'])
+    if filters['status']:
+        batches = batches.filter(status=filters['status'])
+    if filters['equity'] == '1':
+        batches = batches.filter(has_equity_curves=True)
+    
+    page = Paginator(batches, BATCHES_PER_PAGE).get_page(request.GET.get('page'))
     
     return render(request, 'money_management/batch_results.html', {
-        'batches': batches
+        'batches': page.object_list,
+        'page': page,
+        'filters': filters,
+        'status_choices': SimulationBatch._meta.get_field('status').choices,
+        'query_string': urlencode({key: value for key, value in filters.items() if value})
     })
 
 
@@ -487,45 +1558,40 @@ def get_strategy_details(request, batch_id, strategy_key):
     """
     try:
         batch = SimulationBatch.objects.get(batch_id=batch_id)
-        results = SimulationResult.objects.filter(
+        config = SimulationConfig.objects.filter(
             batch_id=batch_id,
             strategy_key=strategy_key
-        ).order_by('-final_performance_pct')
+        ).first()
+        results = SimulationResult.objects.filter(config=config).order_by('-final_performance_pct')
         
-        if not results.exists():
+        if config is None or not results.exists():
             return JsonResponse({
                 'success': False,
                 'error': 'No results found for this strategy'
             }, status=404)
         
-        # Convertir les résultats en liste de dictionnaires
+        # Champs de configuration, communs à toutes les simulations
+        config_data = {
+            'strategy_name': config.strategy_name,
+            'parameters': config.parameters,
+            'num_trades': config.num_trades,
+            'initial_capital': round(config.initial_capital, 2)
+        }
+        
+        # Lecture directe des floats stockés, arrondis uniquement pour l'affichage
         simulations = []
-        for result in results:
-            sim_data = {
-                'id': result.id,
-                'strategy_name': result.strategy_name,
-                'parameters': result.parameters,
-                'num_trades': result.num_trades,
-                'initial_capital': float(result.initial_capital),
-                'final_capital': float(result.final_capital),
-                'final_performance_pct': float(result.final_performance_pct),
-                'max_capital': float(result.max_capital),
-                'max_drawdown_pct': float(result.max_drawdown_pct),
-                'max_performance_pct': float(result.max_performance_pct),
-                'avg_risk_pct': float(result.avg_risk_pct),
-                'avg_risk_amount': float(result.avg_risk_amount),
-                'avg_profit_loss': float(result.avg_profit_loss),
-                'max_consecutive_wins': result.max_consecutive_wins,
-                'max_consecutive_losses': result.max_consecutive_losses,
-                'success_rate': float(result.success_rate),
-                'total_wins': result.total_wins,
-                'total_losses': result.total_losses,
-                'created_at': result.created_at.strftime('%Y-%m-%d %H:%M:%S')
-            }
+        for sim_data in results.values(
+            'id', *SimulationResult.DISPLAY_DECIMALS,
+            'max_consecutive_wins', 'max_consecutive_losses',
+            'total_wins', 'total_losses', 'created_at', 'equity_curve'
+        ):
+            SimulationResult.display_row(sim_data)
+            sim_data.update(config_data)
+            sim_data['created_at'] = sim_data['created_at'].strftime('%Y-%m-%d %H:%M:%S')
             
             # Ajouter l'equity curve si disponible
-            if result.equity_curve:
-                sim_data['equity_curve'] = result.equity_curve
+            if not sim_data['equity_curve']:
+                del sim_data['equity_curve']
             
             simulations.append(sim_data)
         
@@ -534,7 +1600,7 @@ def get_strategy_details(request, batch_id, strategy_key):
             'batch_id': batch_id,
             'batch_name': batch.name,
             'strategy_key': strategy_key,
-            'strategy_name': results.first().strategy_name,
+            'strategy_name': config.strategy_name,
             'total_simulations': len(simulations),
             'simulations': simulations
         })
@@ -551,12 +1617,147 @@ def get_strategy_details(request, batch_id, strategy_key):
         }, status=500)
 
 
+# Durée de cache des analyses de batch (les résultats d'un batch terminé ne changent plus)
+ANALYTICS_CACHE_TIMEOUT = 3600
+
+
+def get_strategy_fan_chart(request, batch_id, strategy_key):
+    """
+    Fan chart d'une stratégie : percentiles des equity curves par index de trade
+    
+    GET /money-management/batch/<batch_id>/strategy/<strategy_key>/fan/?points=200
+    
+    Les courbes sont lues par paquets et agrégées par estimateurs P² : seules
+    quelques centaines de valeurs sont renvoyées au navigateur.
+    """
+    try:
+        points = min(max(int(request.GET.get('points', 200)), 2), 2000)
+    except ValueError:
+        return JsonResponse({'success': False, 'error': 'Paramètre "points" invalide'}, status=400)
+    
+    config = SimulationConfig.objects.filter(batch_id=batch_id, strategy_key=strategy_key).first()
+    if config is None:
+        return JsonResponse({
+            'success': False,
+            'error': 'No results found for this strategy'
+        }, status=404)
+    
+    cache_key = batch_cache_key('fan', batch_id, strategy_key, points)
+    cached = cache.get(cache_key)
+    if cached is not None:
+        return JsonResponse({**cached, 'cached': True})
+    
+    curves = (
+        SimulationResult.objects
+        .filter(config=config, equity_curve__isnull=False)
+        .values_list('equity_curve', flat=True)
+        .iterator(chunk_size=100)
+    )
+    fan = fan_chart(curves, config.num_trades + 1, points=points)
+    
+    if fan['num_curves'] == 0:
+        return JsonResponse({
+            'success': False,
+            'error': 'Aucune equity curve sauvegardée pour cette stratégie'
+        }, status=404)
+    
+    payload = {
+        'success': True,
+        'batch_id': batch_id,
+        'strategy_key': strategy_key,
+        'strategy_name': config.strategy_name,
+        **fan
+    }
+    cache.set(cache_key, payload, ANALYTICS_CACHE_TIMEOUT)
+    
+    return JsonResponse({**payload, 'cached': False})
+
+
+def _batch_bootstrap_intervals(batch_id, results, resamples):
+    """
+    IC bootstrap par configuration d'un batch, lus en une requête et mis en cache
+    
+    Le générateur est initialisé à partir du batch_id : le résultat est
+    reproductible, qu'il vienne du cache ou non.
+    """
+    cache_key = batch_cache_key('bootstrap', batch_id, resamples)
+    intervals = cache.get(cache_key)
+    if intervals is not None:
+        return intervals
+    
+    columns = read_columns(results, ['final_performance_pct', 'max_drawdown_pct'])
+    
+    rng = random.Random(batch_id)
+    intervals = {
+        config_id: {
+            'performance_mean': bootstrap_ci(column['final_performance_pct'], 'mean', resamples, rng=rng),
+            'performance_median': bootstrap_ci(column['final_performance_pct'], 'median', resamples, rng=rng),
+            'drawdown_median': bootstrap_ci(column['max_drawdown_pct'], 'median', resamples, rng=rng)
+        }
+        for config_id, column in columns.items()
+    }
+    cache.set(cache_key, intervals, ANALYTICS_CACHE_TIMEOUT)
+    return intervals
+
+
+def _batch_paired_statistics(results, configs):
+    """
+    Comparaisons appariées (run i contre run i) de chaque configuration avec
+    la meilleure (performance moyenne), pour un batch en nombres aléatoires communs
+    """
+    columns = read_columns(results, ['final_performance_pct', 'max_drawdown_pct'])
+    if len(columns) < 2:
+        return None
+    
+    baseline_id = max(columns, key=lambda config_id: statistics.fmean(columns[config_id]['final_performance_pct']))
+    baseline = columns[baseline_id]
+    
+    comparisons = {}
+    for config_id, column in columns.items():
+        if config_id == baseline_id:
+            continue
+        comparisons[configs[config_id].strategy_key] = {
+            field: paired_difference(column['run_index'], column[field], baseline['run_index'], baseline[field])
+            for field in ('final_performance_pct', 'max_drawdown_pct')
+        }
+    
+    return {
+        'baseline': configs[baseline_id].strategy_key,
+        'comparisons': comparisons  # différences (stratégie - baseline)
+    }
+
+
+def _exact_median(results, field, count):
+    """
+    Médiane exacte d'une métrique d'une configuration : lecture des 1 ou 2
+    valeurs centrales triées, comme SimulationBatch.update_headline (index
+    (config, final_performance_pct, id) et (config, max_drawdown_pct, id) :
+    l'OFFSET est parcouru dans un index couvrant, sans lire la table)
+    """
+    middle = list(results.order_by(field, 'id').values_list(field, flat=True)[(count - 1) // 2:count // 2 + 1])
+    return sum(middle) / len(middle) if middle else None
+
+
 def get_batch_statistics(request, batch_id):
     """
     Récupère les statistiques d'un batch
     
-    GET /money-management/batch/<batch_id>/stats/
+    GET /money-management/batch/<batch_id>/stats/?bins=20&bootstrap=2000
+    
+    Pour chaque stratégie, 'histograms' donne effectifs et CDF de la performance
+    finale, du drawdown max et des pertes consécutives max ; les bornes des
+    classes (communes au batch) sont dans 'histogram_edges'.
+    
+    Avec bootstrap=N (nombre de rééchantillonnages), 'confidence_intervals'
+    donne les IC à 95% de la moyenne et de la médiane de la performance finale
+    et de la médiane du drawdown max.
     """
+    try:
+        bins = min(max(int(request.GET.get('bins', 20)), 1), 100)
+        resamples = min(max(int(request.GET.get('bootstrap', 0)), 0), MAX_BOOTSTRAP_RESAMPLES)
+    except ValueError:
+        return JsonResponse({'success': False, 'error': 'Paramètre "bins" ou "bootstrap" invalide'}, status=400)
+    
     try:
         batch = SimulationBatch.objects.get(batch_id=batch_id)
         results = SimulationResult.objects.filter(batch_id=batch_id)
@@ -567,19 +1768,14 @@ def get_batch_statistics(request, batch_id):
                 'error': 'No results found for this batch'
             }, status=404)
         
-        # Regrouper par stratégie
-        strategies_stats = {}
-        
-        for strategy_key in results.values_list('strategy_key', flat=True).distinct():
-            strategy_results = results.filter(strategy_key=strategy_key)
-            
-            # Calculer les statistiques agrégées
-            stats = strategy_results.aggregate(
+        # Regrouper par configuration (clé entière) en une seule requête GROUP BY
+        grouped_stats = (
+            results
+            .values('config_id')
+            .annotate(
                 count=Count('id'),
                 avg_final_perf=Avg('final_performance_pct'),
-                median_final_perf=Avg('final_performance_pct'),  # Approximation
                 avg_drawdown=Avg('max_drawdown_pct'),
-                median_drawdown=Avg('max_drawdown_pct'),  # Approximation
                 max_perf=Max('final_performance_pct'),
                 min_perf=Min('final_performance_pct'),
                 max_dd=Max('max_drawdown_pct'),
@@ -588,37 +1784,72 @@ def get_batch_statistics(request, batch_id):
                 avg_consecutive_wins=Avg('max_consecutive_wins'),
                 avg_consecutive_losses=Avg('max_consecutive_losses')
             )
+            .order_by('config_id')
+        )
+        
+        # Configurations du batch (nom, clé et paramètres de chaque stratégie)
+        configs = SimulationConfig.objects.filter(batch_id=batch_id).in_bulk()
+        
+        # Distributions calculées en SQL (une requête GROUP BY par métrique)
+        histogram_edges = {}
+        histograms = {}
+        for field in HISTOGRAM_FIELDS:
+            histogram_edges[field], histograms[field] = sql_histograms(results, field, bins)
+        
+        # Intervalles de confiance bootstrap (optionnels, mis en cache)
+        intervals = _batch_bootstrap_intervals(batch_id, results, resamples) if resamples else {}
+        
+        strategies_stats = {}
+        
+        for stats in grouped_stats:
+            config = configs[stats['config_id']]
+            # Filtre sur la seule configuration : le tri est lu dans l'index (config, métrique, id)
+            config_results = SimulationResult.objects.filter(config_id=stats['config_id'])
+            stats['median_final_perf'] = _exact_median(config_results, 'final_performance_pct', stats['count'])
+            stats['median_drawdown'] = _exact_median(config_results, 'max_drawdown_pct', stats['count'])
             
-            # Récupérer le nom de la stratégie
-            first_result = strategy_results.first()
-            
-            strategies_stats[strategy_key] = {
-                'strategy_name': first_result.strategy_name,
-                'parameters': first_result.parameters,
+            strategies_stats[config.strategy_key] = {
+                'strategy_name': config.strategy_name,
+                'parameters': config.parameters,
                 'num_simulations': stats['count'],
                 'performance': {
-                    'avg': float(stats['avg_final_perf'] or 0),
-                    'median': float(stats['median_final_perf'] or 0),
-                    'max': float(stats['max_perf'] or 0),
-                    'min': float(stats['min_perf'] or 0)
+                    'avg': round(stats['avg_final_perf'] or 0, 2),
+                    'median': round(stats['median_final_perf'] or 0, 2),
+                    'max': round(stats['max_perf'] or 0, 2),
+                    'min': round(stats['min_perf'] or 0, 2)
                 },
                 'drawdown': {
-                    'avg': float(stats['avg_drawdown'] or 0),
-                    'median': float(stats['median_drawdown'] or 0),
-                    'max': float(stats['max_dd'] or 0),
-                    'min': float(stats['min_dd'] or 0)
+                    'avg': round(stats['avg_drawdown'] or 0, 2),
+                    'median': round(stats['median_drawdown'] or 0, 2),
+                    'max': round(stats['max_dd'] or 0, 2),
+                    'min': round(stats['min_dd'] or 0, 2)
                 },
-                'success_rate_avg': float(stats['avg_success_rate'] or 0),
-                'consecutive_wins_avg': float(stats['avg_consecutive_wins'] or 0),
-                'consecutive_losses_avg': float(stats['avg_consecutive_losses'] or 0)
+                'success_rate_avg': round(stats['avg_success_rate'] or 0, 2),
+                'consecutive_wins_avg': round(stats['avg_consecutive_wins'] or 0, 2),
+                'consecutive_losses_avg': round(stats['avg_consecutive_losses'] or 0, 2),
+                'histograms': {
+                    field: histograms[field].get(stats['config_id'])
+                    for field in HISTOGRAM_FIELDS
+                }
             }
+            if resamples:
+                strategies_stats[config.strategy_key]['confidence_intervals'] = intervals.get(stats['config_id'])
+            if config.variance_report:
+                strategies_stats[config.strategy_key]['variance_reduction'] = config.variance_report
+            if config.control_variate:
+                strategies_stats[config.strategy_key]['control_variate'] = config.control_variate
         
         return JsonResponse({
             'success': True,
             'batch_id': batch_id,
             'batch_name': batch.name,
             'total_simulations': batch.total_simulations,
-            'strategies': strategies_stats
+            'histogram_edges': histogram_edges,
+            'strategies': strategies_stats,
+            'common_random_numbers': batch.common_random_numbers,
+            'sampling': batch.sampling,
+            'control_variate': batch.control_variate,
+            'paired': _batch_paired_statistics(results, configs) if batch.common_random_numbers else None
         })
         
     except SimulationBatch.DoesNotExist:
@@ -631,3 +1862,233 @@ def get_batch_statistics(request, batch_id):
             'success': False,
             'error': str(e)
         }, status=500)
+
+
+# Métriques comparées entre stratégies
+COMPARISON_FIELDS = ['final_performance_pct', 'max_drawdown_pct']
+
+
+def compare_batch_strategies(request, batch_id):
+    """
+    Comparaison statistique 2 à 2 de stratégies d'un batch
+    
+    GET /money-management/batch/<batch_id>/compare/?strategies=k1,k2&resamples=1000
+    
+    GET params:
+        - strategies: clés séparées par des virgules (défaut: toutes les stratégies du batch)
+        - resamples: rééchantillonnages bootstrap (0 pour désactiver, max 20000)
+    
+    Batch en nombres aléatoires communs : tests appariés par run (t apparié,
+    Wilcoxon, bootstrap apparié). Sinon : Welch, Mann-Whitney et bootstrap
+    indépendant. Les différences sont toujours a - b.
+    """
+    try:
+        resamples = min(max(int(request.GET.get('resamples', 1000)), 0), MAX_BOOTSTRAP_RESAMPLES)
+    except ValueError:
+        return JsonResponse({'success': False, 'error': 'Paramètre "resamples" invalide'}, status=400)
+    
+    try:
+        batch = SimulationBatch.objects.get(batch_id=batch_id)
+    except SimulationBatch.DoesNotExist:
+        return JsonResponse({
+            'success': False,
+            'error': 'Batch not found'
+        }, status=404)
+    
+    configs = SimulationConfig.objects.filter(batch_id=batch_id)
+    requested = [key for key in request.GET.get('strategies', '').split(',') if key]
+    if requested:
+        configs = configs.filter(strategy_key__in=requested)
+    configs = configs.in_bulk()
+    
+    if len(configs) < 2:
+        return JsonResponse({
+            'success': False,
+            'error': 'Au moins deux stratégies du batch sont nécessaires'
+        }, status=400)
+    
+    keys = sorted(config.strategy_key for config in configs.values())
+    cache_key = batch_cache_key('compare', batch_id, resamples, hashlib.md5(','.join(keys).encode()).hexdigest())
+    payload = cache.get(cache_key)
+    
+    if payload is None:
+        # Colonnes de toutes les stratégies en une seule requête
+        results = SimulationResult.objects.filter(batch_id=batch_id, config_id__in=configs)
+        columns_by_config = read_columns(results, COMPARISON_FIELDS)
+        columns = {
+            configs[config_id].strategy_key: columns_by_config[config_id]
+            for config_id in sorted(columns_by_config, key=lambda config_id: configs[config_id].strategy_key)
+        }
+        payload = {
+            'success': True,
+            'batch_id': batch_id,
+            'paired': batch.common_random_numbers,
+            'strategies': {config.strategy_key: config.strategy_name for config in configs.values()},
+            'resamples': resamples,
+            'comparisons': compare_columns(
+                columns, COMPARISON_FIELDS, resamples=resamples,
+                paired=batch.common_random_numbers, rng=random.Random(batch_id)
+            )
+        }
+        cache.set(cache_key, payload, ANALYTICS_CACHE_TIMEOUT)
+    
+    return JsonResponse(payload)
+
+
+# Critères de tri et de filtre autorisés pour la recherche de résultats
+QUERY_SORT_FIELDS = ['final_performance_pct', 'max_drawdown_pct', 'success_rate']
+QUERY_RANGE_FILTERS = {
+    'perf': 'final_performance_pct',
+    'dd': 'max_drawdown_pct',
+    'success_rate': 'success_rate',
+}
+QUERY_MAX_LIMIT = 500
+
+
+def _encode_cursor(value, pk):
+    """Curseur opaque : (valeur de tri, id) de la dernière ligne renvoyée"""
+    return base64.urlsafe_b64encode(json.dumps([value, pk]).encode()).decode()
+
+
+def _decode_cursor(cursor):
+    value, pk = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    return float(value), int(pk)
+
+
+def query_results(request):
+    """
+    Recherche de simulations avec filtres, tri et pagination par curseur (keyset)
+    
+    GET /money-management/results/query/?max_dd=-20&sort=-final_performance_pct&limit=50
+    
+    GET params:
+        - batch_id, strategy_key, config_id: filtres d'égalité (optionnels)
+        - min_perf / max_perf, min_dd / max_dd, min_success_rate / max_success_rate:
+          bornes (incluses) sur les métriques
+        - sort: final_performance_pct, max_drawdown_pct ou success_rate, préfixé par '-'
+          pour un tri décroissant (défaut: -final_performance_pct)
+        - limit: nombre de lignes (défaut 50, max 500)
+        - cursor: valeur 'next_cursor' de la page précédente
+    
+    La page suivante est obtenue par comparaison (valeur, id) avec la dernière
+    ligne vue : le coût ne dépend pas de la profondeur de pagination.
+    """
+    sort = request.GET.get('sort', '-final_performance_pct')
+    descending = sort.startswith('-')
+    sort_field = sort.lstrip('-')
+    if sort_field not in QUERY_SORT_FIELDS:
+        return JsonResponse({
+            'success': False,
+            'error': f'Tri "{sort}" non supporté ({", ".join(QUERY_SORT_FIELDS)})'
+        }, status=400)
+    
+    try:
+        limit = min(max(int(request.GET.get('limit', 50)), 1), QUERY_MAX_LIMIT)
+        
+        filters = {}
+        for name, field in QUERY_RANGE_FILTERS.items():
+            if request.GET.get(f'min_{name}') is not None:
+                filters[f'{field}__gte'] = float(request.GET[f'min_{name}'])
+            if request.GET.get(f'max_{name}') is not None:
+                filters[f'{field}__lte'] = float(request.GET[f'max_{name}'])
+        
+        if request.GET.get('config_id'):
+            filters['config_id'] = int(request.GET['config_id'])
+        
+        cursor = _decode_cursor(request.GET['cursor']) if request.GET.get('cursor') else None
+    except (ValueError, TypeError, json.JSONDecodeError, binascii.Error):
+        return JsonResponse({'success': False, 'error': 'Paramètre invalide'}, status=400)
+    
+    if request.GET.get('batch_id'):
+        filters['batch_id'] = request.GET['batch_id']
+    if request.GET.get('strategy_key'):
+        filters['config__strategy_key'] = request.GET['strategy_key']
+    
+    results = SimulationResult.objects.filter(**filters)
+    
+    # Keyset : lignes strictement après (valeur, id) dans l'ordre de tri
+    if cursor is not None:
+        value, pk = cursor
+        if descending:
+            results = results.filter(Q(**{f'{sort_field}__lt': value}) | Q(**{sort_field: value, 'id__lt': pk}))
+        else:
+            results = results.filter(Q(**{f'{sort_field}__gt': value}) | Q(**{sort_field: value, 'id__gt': pk}))
+    
+    ordering = [f'-{sort_field}', '-id'] if descending else [sort_field, 'id']
+    rows = list(
+        results.order_by(*ordering).values(
+            'id', 'batch_id', 'config_id', *SimulationResult.DISPLAY_DECIMALS,
+            'max_consecutive_wins', 'max_consecutive_losses', 'total_wins', 'total_losses',
+            'is_saturated',
+            strategy_key=F('config__strategy_key'),
+            strategy_name=F('config__strategy_name')
+        )[:limit + 1]
+    )
+    
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = _encode_cursor(rows[-1][sort_field], rows[-1]['id'])
+    
+    return JsonResponse({
+        'success': True,
+        'count': len(rows),
+        'sort': sort,
+        'results': [SimulationResult.display_row(row) for row in rows],
+        'next_cursor': next_cursor
+    })
+
+
+# Colonnes exportées pour chaque simulation d'un batch
+RESULT_EXPORT_FIELDS = [
+    'id', 'strategy_key', 'strategy_name', 'parameters', 'num_trades', 'initial_capital',
+    'final_capital', 'final_performance_pct', 'max_capital', 'max_drawdown_pct',
+    'max_performance_pct', 'avg_risk_pct', 'avg_risk_amount', 'avg_profit_loss',
+    'max_consecutive_wins', 'max_consecutive_losses', 'success_rate', 'total_wins',
+    'total_losses', 'created_at'
+]
+
+# Colonnes issues de la configuration partagée (SimulationConfig)
+CONFIG_EXPORT_FIELDS = ['strategy_key', 'strategy_name', 'parameters', 'num_trades', 'initial_capital']
+
+
+def export_batch(request, batch_id):
+    """
+    Exporte en streaming les résultats d'un batch
+    
+    GET /money-management/batch/<batch_id>/export/?format=csv&equity_curves=1
+    
+    GET params:
+        - format: 'csv' (défaut) ou 'ndjson'
+        - equity_curves: '1' pour inclure les equity curves (si sauvegardées)
+        - strategy_key: limiter l'export à une stratégie
+    
+    Les lignes sont lues par paquets avec iterator() : un batch de
+    plusieurs millions de lignes n'est jamais chargé en mémoire.
+    """
+    export_format = request.GET.get('format', 'csv')
+    if export_format not in EXPORT_FORMATS:
+        return JsonResponse({'success': False, 'error': f'Format "{export_format}" non supporté'}, status=400)
+    
+    if not SimulationBatch.objects.filter(batch_id=batch_id).exists():
+        return JsonResponse({
+            'success': False,
+            'error': 'Batch not found'
+        }, status=404)
+    
+    fields = list(RESULT_EXPORT_FIELDS)
+    if request.GET.get('equity_curves') in ('1', 'true'):
+        fields.append('equity_curve')
+    
+    results = SimulationResult.objects.filter(batch_id=batch_id)
+    if request.GET.get('strategy_key'):
+        results = results.filter(config__strategy_key=request.GET['strategy_key'])
+    
+    # Plus petits paquets quand les equity curves (volumineuses) sont incluses
+    chunk_size = 200 if 'equity_curve' in fields else 2000
+    rows = results.order_by('id').values(
+        *(field for field in fields if field not in CONFIG_EXPORT_FIELDS),
+        **{field: F(f'config__{field}') for field in CONFIG_EXPORT_FIELDS}
+    ).iterator(chunk_size=chunk_size)
+    
+    return streaming_export(rows, fields, export_format, f'batch_{batch_id[:8]}')